@@ -0,0 +1,292 @@
+"""
+基准测试公共部分：合成算例、计时与结果输出
+
+合成算例由 (订单数, 规划时域, 产线数, 随机种子) 唯一确定，同一参数在任何机器上
+生成完全相同的订单与染色体，便于不同提交之间对比。
+"""
+import os
+import sys
+import json
+import math
+import time
+import random
+import platform
+import statistics
+import subprocess
+from datetime import datetime
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.append(SRC_DIR)
+
+from config import Config
+from logger import configure_logging
+from models.order import Order
+from models.chromosome import Chromosome
+
+
+RESULT_FORMAT_VERSION = 1
+
+# 扫描预设：每个预设给出基准点与各参数轴的取值，默认逐轴扫描（其余参数取基准点）
+PRESETS = {
+    'smoke': {
+        'base': (36, 30, 3),
+        'orders': [36],
+        'horizon': [30],
+        'lines': [3],
+    },
+    'default': {
+        'base': (36, 60, 3),
+        'orders': [36, 360, 1000],
+        'horizon': [30, 120, 600],
+        'lines': [3, 10, 50],
+    },
+    'full': {
+        'base': (36, 60, 3),
+        'orders': [36, 360, 1000, 3000, 10000],
+        'horizon': [30, 60, 120, 300, 600],
+        'lines': [3, 10, 25, 50],
+    },
+}
+
+
+def make_config(num_lines, horizon, population=None, generations=None, ls_iterations=None):
+    """
+    构建基准配置（日志静默，人工成本表覆盖整个时域）
+
+    Args:
+        num_lines: 产线数量
+        horizon: 规划时域（slot 数量）
+        population / generations / ls_iterations: GA 种群规模、代数与局部搜索迭代次数（可选）
+
+    Returns:
+        Config: 配置对象
+    """
+    config = Config()
+    config.NUM_LINES = num_lines
+    config.QUIET = True
+    labor_costs_per_day = [100, 100, 115, 135, 150, 140]
+    num_days = math.ceil(horizon / config.SLOTS_PER_DAY) + 10
+    config.LABOR_COSTS = labor_costs_per_day * num_days
+    if population is not None:
+        config.POPULATION_SIZE = population
+        config.ELITE_SIZE = min(config.ELITE_SIZE, population)
+    if generations is not None:
+        config.MAX_GENERATIONS = generations
+    if ls_iterations is not None:
+        config.MAX_LS_ITERATIONS = ls_iterations
+    return config
+
+
+def make_orders(num_orders, horizon, seed=0):
+    """
+    生成合成订单
+
+    到达时间分布在时域前半段，交期在到达后 1 天到整个时域之间，使订单既有
+    可行窗口又存在产能竞争。
+
+    Args:
+        num_orders: 订单数量
+        horizon: 规划时域（slot 数量）
+        seed: 随机种子
+
+    Returns:
+        list: 订单列表 (List[Order])
+    """
+    rng = random.Random(seed)
+    orders = []
+    for order_id in range(1, num_orders + 1):
+        release_slot = rng.randint(1, max(1, horizon // 2))
+        due_slot = release_slot + rng.randint(6, max(6, horizon))
+        orders.append(Order(
+            order_id,
+            rng.randint(1, 3),
+            rng.randint(50, 500),
+            due_slot,
+            float(rng.randint(40, 80)),
+            release_slot=release_slot,
+        ))
+    return orders
+
+
+def make_chromosome(num_orders, horizon, num_lines, num_products=3, rng=None):
+    """生成随机染色体（gene1 随机产品/空闲，gene2 随机订单排列）"""
+    rng = rng or random.Random(0)
+    gene1 = [rng.randint(0, num_products) for _ in range(num_lines * horizon)]
+    gene2 = list(range(num_orders))
+    rng.shuffle(gene2)
+    return Chromosome(gene1=gene1, gene2=gene2)
+
+
+class Problem:
+    """
+    一个扫描点的合成算例
+
+    Attributes:
+        num_orders, horizon, num_lines: 扫描参数
+        config: 配置对象
+        orders: 订单列表
+        chromosome: 随机染色体
+        seed: 随机种子
+        islands / migration_interval: 岛模型基准的岛数量与迁移周期（代）
+    """
+
+    def __init__(self, num_orders, horizon, num_lines, seed=0, population=None,
+                 generations=None, ls_iterations=None, islands=3, migration_interval=5):
+        self.num_orders = num_orders
+        self.horizon = horizon
+        self.num_lines = num_lines
+        self.seed = seed
+        self.islands = islands
+        self.migration_interval = migration_interval
+        self.config = make_config(num_lines, horizon, population, generations, ls_iterations)
+        self.orders = make_orders(num_orders, horizon, seed)
+        self.chromosome = make_chromosome(num_orders, horizon, num_lines, rng=random.Random(seed))
+
+    def fresh_orders(self):
+        """重新生成一份未开始生产的订单（会修改订单状态的基准每次重复前使用）"""
+        return make_orders(self.num_orders, self.horizon, self.seed)
+
+    def params(self):
+        return {'orders': self.num_orders, 'horizon': self.horizon, 'lines': self.num_lines}
+
+
+def sweep_points(preset, orders=None, horizons=None, lines=None, grid=False):
+    """
+    生成扫描点 (订单数, 时域, 产线数)
+
+    Args:
+        preset: 预设名（见 PRESETS）
+        orders / horizons / lines: 覆盖预设中对应轴的取值（可选）
+        grid: True 时取各轴的笛卡尔积，否则逐轴扫描（其余参数取基准点）
+
+    Returns:
+        list: 去重后的扫描点，保持生成顺序
+    """
+    spec = PRESETS[preset]
+    axes = (orders or spec['orders'], horizons or spec['horizon'], lines or spec['lines'])
+    if grid:
+        points = [(o, h, l) for o in axes[0] for h in axes[1] for l in axes[2]]
+    else:
+        base = spec['base']
+        points = [base]
+        for axis, values in enumerate(axes):
+            for value in values:
+                point = list(base)
+                point[axis] = value
+                points.append(tuple(point))
+    return list(dict.fromkeys(points))
+
+
+def time_micro(func, repeat=5, min_time=0.05, seed=0):
+    """
+    微基准计时：自动确定每轮调用次数使单轮耗时不少于 min_time，取 repeat 轮
+
+    Args:
+        func: 无参可调用对象
+        repeat: 轮数
+        min_time: 单轮最短耗时（秒）
+        seed: 每轮开始前重置的随机种子（算子内部使用 random）
+
+    Returns:
+        dict: number、repeat 与单次调用耗时的 best / median / mean（秒）
+    """
+    number = 1
+    while True:
+        random.seed(seed)
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or number >= 1 << 20:
+            break
+        number *= 10 if elapsed < min_time / 10 else 2
+    samples = []
+    for _ in range(repeat):
+        random.seed(seed)
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - start) / number)
+    return _summarize(samples, number)
+
+
+def time_macro(prepare, repeat=3, seed=0):
+    """
+    宏基准计时：每轮先调用 prepare() 完成准备（不计时），再计时其返回的可调用对象
+
+    Args:
+        prepare: 无参可调用对象，返回本轮要计时的无参可调用对象
+        repeat: 轮数
+        seed: 每轮准备前重置的随机种子
+
+    Returns:
+        dict: 同 time_micro（number 恒为 1）
+    """
+    samples = []
+    for _ in range(repeat):
+        random.seed(seed)
+        run = prepare()
+        start = time.perf_counter()
+        run()
+        samples.append(time.perf_counter() - start)
+    return _summarize(samples, 1)
+
+
+def _summarize(samples, number):
+    return {
+        'number': number,
+        'repeat': len(samples),
+        'best_s': min(samples),
+        'median_s': statistics.median(samples),
+        'mean_s': statistics.fmean(samples),
+    }
+
+
+def quiet_logging():
+    """基准运行期间只输出警告及以上"""
+    configure_logging(quiet=True)
+
+
+def environment_info():
+    """记录运行环境（解释器、平台、CPU 数与当前提交），便于跨机器对比"""
+    commit = None
+    try:
+        proc = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=SRC_DIR, capture_output=True, text=True
+        )
+        if proc.returncode == 0:
+            commit = proc.stdout.strip()
+    except OSError:
+        pass
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'commit': commit,
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+    }
+
+
+def write_results(results, path, args=None):
+    """
+    写出 JSON 结果
+
+    Args:
+        results: 结果行列表
+        path: 输出路径，"-" 表示标准输出
+        args: 运行参数（可选，记录到 meta 中）
+    """
+    payload = {
+        'version': RESULT_FORMAT_VERSION,
+        'meta': dict(environment_info(), args=args or {}),
+        'results': results,
+    }
+    text = json.dumps(payload, ensure_ascii=False, indent=2)
+    if path == "-":
+        print(text)
+        return
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text + "\n")
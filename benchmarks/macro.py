@@ -0,0 +1,72 @@
+"""
+宏基准：一代 GA、一个岛模型迁移周期、一次局部搜索与一天滚动调度
+
+每个基准函数接收一个 Problem，返回 prepare()：每轮计时前调用一次完成准备
+（构建引擎、初始化种群等，不计时），其返回值为本轮要计时的无参可调用对象。
+"""
+import copy
+
+from ga.engine import GAEngine
+from ga.island_engine import IslandGAEngine
+from ga.fitness import evaluate_chromosome
+from local_search.ils_vns import LocalSearch
+from scheduler.order_manager import OrderManager
+from scheduler.rolling_scheduler import RollingScheduler
+
+
+def bench_ga_generation(problem):
+    """单种群 GA 的一代（选择、交叉变异、评估、精英保留），不含种群初始化"""
+    def prepare():
+        config = copy.copy(problem.config)
+        config.MAX_GENERATIONS = 1
+        engine = GAEngine(config, problem.orders, planning_horizon=problem.horizon)
+        engine.initialize_population()
+        return engine.evolve
+    return prepare
+
+
+def bench_island_epoch(problem):
+    """岛模型的一个迁移周期：各岛进化 migration_interval 代后执行一次精英迁移"""
+    def prepare():
+        config = copy.copy(problem.config)
+        config.ENABLE_ISLAND_GA = True
+        config.NUM_ISLANDS = problem.islands
+        config.ISLAND_MIGRATION_INTERVAL = problem.migration_interval
+        config.MAX_GENERATIONS = problem.migration_interval
+        engine = IslandGAEngine(config, problem.orders, planning_horizon=problem.horizon)
+        engine.initialize_islands()
+        return engine.evolve
+    return prepare
+
+
+def bench_local_search(problem):
+    """从随机染色体出发的一次局部搜索（迭代上限为 MAX_LS_ITERATIONS）"""
+    def prepare():
+        initial = problem.chromosome.copy()
+        initial.fitness = evaluate_chromosome(initial, problem.orders, problem.config)
+        local_search = LocalSearch(problem.config)
+        return lambda: local_search.optimize(initial, problem.orders)
+    return prepare
+
+
+def bench_rolling_day(problem):
+    """
+    滚动调度的第一天（订单池、GA + 局部搜索、计划合并与当天执行）
+
+    滚动调度器使用自身的规划窗口（SLOTS_PER_DAY * 10），时域参数只影响订单的到达与交期分布。
+    """
+    def prepare():
+        order_manager = OrderManager()
+        for order in problem.fresh_orders():
+            order_manager.add_order(order)
+        scheduler = RollingScheduler(problem.config, order_manager)
+        return lambda: scheduler.run_daily_schedule(current_day=0)
+    return prepare
+
+
+MACRO_BENCHMARKS = {
+    'ga_generation': bench_ga_generation,
+    'island_epoch': bench_island_epoch,
+    'local_search': bench_local_search,
+    'rolling_day': bench_rolling_day,
+}
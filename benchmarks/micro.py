@@ -0,0 +1,97 @@
+"""
+微基准：单次解码、适应度评估、遗传算子、染色体复制与方案指标计算
+
+每个基准函数接收一个 Problem，完成准备工作后返回要反复计时的无参可调用对象。
+"""
+import random
+
+from models.chromosome import Chromosome
+from ga.decoder import Decoder
+from ga.fitness import evaluate_chromosome
+from ga.operators import GeneticOperators
+
+
+def _population(problem):
+    """与染色体共享基因、适应度随机的种群（选择算子只读取适应度）"""
+    rng = random.Random(problem.seed)
+    population = []
+    for _ in range(problem.config.POPULATION_SIZE):
+        individual = Chromosome(gene1=problem.chromosome.gene1, gene2=problem.chromosome.gene2)
+        individual.fitness = rng.uniform(-1e5, 1e6)
+        population.append(individual)
+    return population
+
+
+def _parents(problem):
+    rng = random.Random(problem.seed + 1)
+    other = Chromosome(gene1=problem.chromosome.gene1[:], gene2=problem.chromosome.gene2[:])
+    rng.shuffle(other.gene1)
+    rng.shuffle(other.gene2)
+    return problem.chromosome, other
+
+
+def bench_decode(problem):
+    decoder = Decoder(problem.config)
+    return lambda: decoder.decode(problem.chromosome, problem.orders)
+
+
+def bench_evaluate_chromosome(problem):
+    return lambda: evaluate_chromosome(problem.chromosome, problem.orders, problem.config)
+
+
+def bench_tournament_selection(problem):
+    population = _population(problem)
+    return lambda: GeneticOperators.tournament_selection(population, tournament_size=3)
+
+
+def bench_roulette_selection(problem):
+    population = _population(problem)
+    return lambda: GeneticOperators.roulette_selection(population)
+
+
+def bench_crossover_gene1(problem):
+    parent1, parent2 = _parents(problem)
+    return lambda: GeneticOperators.crossover_gene1(parent1, parent2)
+
+
+def bench_crossover_gene2_ox(problem):
+    parent1, parent2 = _parents(problem)
+    return lambda: GeneticOperators.crossover_gene2_ox(parent1, parent2)
+
+
+def bench_mutate_gene1(problem):
+    # 变异原地修改基因，在副本上进行，不影响其他基准使用的染色体
+    chromosome = problem.chromosome.copy()
+    rate = problem.config.MUTATION_RATE
+    num_products = problem.config.NUM_PRODUCTS
+    return lambda: GeneticOperators.mutate_gene1(chromosome, rate, num_products)
+
+
+def bench_mutate_gene2(problem):
+    chromosome = problem.chromosome.copy()
+    # 变异率取 1，使每次调用都执行一次交换
+    return lambda: GeneticOperators.mutate_gene2(chromosome, 1.0)
+
+
+def bench_chromosome_copy(problem):
+    return problem.chromosome.copy
+
+
+def bench_calculate_metrics(problem):
+    schedule = Decoder(problem.config).decode(problem.chromosome, problem.orders)
+    config = problem.config
+    return lambda: schedule.calculate_metrics(problem.orders, config.LABOR_COSTS, config.PENALTY_RATE)
+
+
+MICRO_BENCHMARKS = {
+    'decode': bench_decode,
+    'evaluate_chromosome': bench_evaluate_chromosome,
+    'tournament_selection': bench_tournament_selection,
+    'roulette_selection': bench_roulette_selection,
+    'crossover_gene1': bench_crossover_gene1,
+    'crossover_gene2_ox': bench_crossover_gene2_ox,
+    'mutate_gene1': bench_mutate_gene1,
+    'mutate_gene2': bench_mutate_gene2,
+    'chromosome_copy': bench_chromosome_copy,
+    'calculate_metrics': bench_calculate_metrics,
+}
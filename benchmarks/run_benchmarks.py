@@ -0,0 +1,130 @@
+"""
+基准测试入口
+
+在合成算例上运行微基准（解码、适应度评估、遗传算子、染色体复制、方案指标）与
+宏基准（一代 GA、一个岛模型迁移周期、一次局部搜索、一天滚动调度），按订单数、
+规划时域与产线数扫描，结果输出为 JSON。
+
+用法：
+    python benchmarks/run_benchmarks.py --preset smoke
+    python benchmarks/run_benchmarks.py --suite micro --orders 36,1000,10000 --output results/bench.json
+    python benchmarks/run_benchmarks.py --suite macro --preset full --grid --population 20
+
+同一参数、同一随机种子生成的算例完全相同；比较两次提交时请在同一台机器上使用相同参数运行。
+"""
+import os
+import sys
+import time
+import argparse
+import traceback
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from common import PRESETS, Problem, sweep_points, time_micro, time_macro, quiet_logging, write_results
+from micro import MICRO_BENCHMARKS
+from macro import MACRO_BENCHMARKS
+
+
+def _int_list(text):
+    return [int(value) for value in text.split(",") if value.strip()]
+
+
+def _name_list(text):
+    return [value.strip() for value in text.split(",") if value.strip()]
+
+
+def run_point(problem, suites, names, args):
+    """
+    在一个扫描点上运行所选基准
+
+    Returns:
+        list: 结果行
+    """
+    rows = []
+    for suite in suites:
+        table = MICRO_BENCHMARKS if suite == 'micro' else MACRO_BENCHMARKS
+        for name, bench in table.items():
+            if names and name not in names:
+                continue
+            row = dict(suite=suite, name=name, **problem.params())
+            try:
+                if suite == 'micro':
+                    row.update(time_micro(bench(problem), repeat=args.repeat,
+                                          min_time=args.min_time, seed=args.seed))
+                else:
+                    row.update(time_macro(bench(problem), repeat=args.macro_repeat, seed=args.seed))
+                row['error'] = None
+            except Exception as exc:  # 单个基准失败不影响其余扫描点
+                row['error'] = f"{type(exc).__name__}: {exc}"
+                if args.verbose:
+                    traceback.print_exc()
+            rows.append(row)
+            if not args.quiet:
+                if row['error'] is None:
+                    print(f"{suite:<6} {name:<22} {problem.num_orders:>6} {problem.horizon:>6} "
+                          f"{problem.num_lines:>6} {row['best_s'] * 1e3:>12.3f} {row['median_s'] * 1e3:>12.3f}",
+                          file=sys.stderr)
+                else:
+                    print(f"{suite:<6} {name:<22} {problem.num_orders:>6} {problem.horizon:>6} "
+                          f"{problem.num_lines:>6} FAILED {row['error']}", file=sys.stderr)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro and macro benchmarks with scaling sweeps")
+    parser.add_argument("--suite", choices=["micro", "macro", "all"], default="all",
+                        help="Benchmark suite to run")
+    parser.add_argument("--bench", type=_name_list, default=None,
+                        help="Comma list of benchmark names (default: all in the suite): "
+                             + ", ".join(list(MICRO_BENCHMARKS) + list(MACRO_BENCHMARKS)))
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="default",
+                        help="Sweep preset (see common.PRESETS)")
+    parser.add_argument("--orders", type=_int_list, default=None, help="Order counts, e.g. 36,1000,10000")
+    parser.add_argument("--horizon", type=_int_list, default=None, help="Planning horizons in slots, e.g. 30,600")
+    parser.add_argument("--lines", type=_int_list, default=None, help="Line counts, e.g. 3,50")
+    parser.add_argument("--grid", action="store_true",
+                        help="Full cartesian product of the axes instead of one-axis-at-a-time sweeps")
+    parser.add_argument("--population", type=int, default=20, help="GA population size for macro benchmarks")
+    parser.add_argument("--generations", type=int, default=10,
+                        help="GA generations for the rolling-day benchmark")
+    parser.add_argument("--ls_iterations", type=int, default=20, help="Local search iterations")
+    parser.add_argument("--islands", type=int, default=3, help="Islands for the island-epoch benchmark")
+    parser.add_argument("--migration_interval", type=int, default=5,
+                        help="Generations per island migration epoch")
+    parser.add_argument("--repeat", type=int, default=5, help="Micro benchmark rounds")
+    parser.add_argument("--min_time", type=float, default=0.05, help="Minimum seconds per micro round")
+    parser.add_argument("--macro_repeat", type=int, default=3, help="Macro benchmark rounds")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for problems and operators")
+    parser.add_argument("--output", type=str, default="-", help="JSON output path ('-' for stdout)")
+    parser.add_argument("--quiet", action="store_true", help="No progress lines on stderr")
+    parser.add_argument("--verbose", action="store_true", help="Print tracebacks of failed benchmarks")
+    args = parser.parse_args()
+
+    quiet_logging()
+    suites = ["micro", "macro"] if args.suite == "all" else [args.suite]
+    unknown = [name for name in args.bench or [] if name not in MICRO_BENCHMARKS and name not in MACRO_BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(unknown)}")
+    points = sweep_points(args.preset, args.orders, args.horizon, args.lines, grid=args.grid)
+
+    if not args.quiet:
+        print(f"{'suite':<6} {'benchmark':<22} {'orders':>6} {'horizon':>6} {'lines':>6} "
+              f"{'best(ms)':>12} {'median(ms)':>12}", file=sys.stderr)
+    start = time.perf_counter()
+    results = []
+    for num_orders, horizon, num_lines in points:
+        problem = Problem(
+            num_orders, horizon, num_lines, seed=args.seed, population=args.population,
+            generations=args.generations, ls_iterations=args.ls_iterations,
+            islands=args.islands, migration_interval=args.migration_interval,
+        )
+        results.extend(run_point(problem, suites, args.bench, args))
+
+    write_results(results, args.output, args=vars(args))
+    if not args.quiet:
+        print(f"\n{len(results)} results in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+    return 1 if any(row['error'] for row in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,14 +1,11 @@
 import os
 import sys
 import argparse
-import random
 import pandas as pd
 import matplotlib.pyplot as plt
 from matplotlib import font_manager as fm
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
-from config import Config
-from scheduler.order_manager import OrderManager
-from scheduler.rolling_scheduler import RollingScheduler
+from service import run_batch
 
 def _select_cn_font():
     candidates = [
@@ -30,57 +27,40 @@ if _cn_font:
     plt.rcParams["font.sans-serif"] = [_cn_font]
     plt.rcParams["axes.unicode_minus"] = False
 
-def build_config_ga():
-    cfg = Config()
-    cfg.LABOR_COSTS = [1000, 1000, 1000, 2000, 2000, 2000]
-    cfg.POPULATION_SIZE = 30
-    cfg.MAX_GENERATIONS = 50
-    cfg.CROSSOVER_RATE = 0.8
-    cfg.MUTATION_RATE = 0.1
-    cfg.ELITE_SIZE = 3
-    cfg.ENABLE_ISLAND_GA = False
-    cfg.NUM_ISLANDS = 1
-    cfg.ENABLE_RISK_GUIDED_LS = False
-    cfg.MAX_LS_ITERATIONS = 0
-    cfg.ENABLE_STOPLOSS = False
-    return cfg
-
-def build_config_ga_ils():
-    cfg = build_config_ga()
-    cfg.ENABLE_RISK_GUIDED_LS = False
-    cfg.MAX_LS_ITERATIONS = 20
-    return cfg
+def build_overrides_ga():
+    return {
+        "LABOR_COSTS": [1000, 1000, 1000, 2000, 2000, 2000],
+        "POPULATION_SIZE": 30,
+        "MAX_GENERATIONS": 50,
+        "CROSSOVER_RATE": 0.8,
+        "MUTATION_RATE": 0.1,
+        "ELITE_SIZE": 3,
+        "ENABLE_ISLAND_GA": False,
+        "NUM_ISLANDS": 1,
+        "ENABLE_RISK_GUIDED_LS": False,
+        "MAX_LS_ITERATIONS": 0,
+        "ENABLE_STOPLOSS": False,
+    }
 
-def build_config_island_ga():
-    cfg = build_config_ga()
-    cfg.ENABLE_ISLAND_GA = True
-    cfg.NUM_ISLANDS = 3
-    cfg.ENABLE_RISK_GUIDED_LS = False
-    cfg.MAX_LS_ITERATIONS = 0
-    return cfg
+def build_overrides_ga_ils():
+    ov = build_overrides_ga()
+    ov["ENABLE_RISK_GUIDED_LS"] = False
+    ov["MAX_LS_ITERATIONS"] = 20
+    return ov
 
-def build_config_island_ga_ils():
-    cfg = build_config_island_ga()
-    cfg.ENABLE_RISK_GUIDED_LS = True
-    cfg.RISK_LS_MAX_ITER = 20
-    return cfg
+def build_overrides_island_ga():
+    ov = build_overrides_ga()
+    ov["ENABLE_ISLAND_GA"] = True
+    ov["NUM_ISLANDS"] = 3
+    ov["ENABLE_RISK_GUIDED_LS"] = False
+    ov["MAX_LS_ITERATIONS"] = 0
+    return ov
 
-def run_once(cfg, csv_path, days):
-    om = OrderManager()
-    om.load_orders_from_csv(csv_path)
-    sched = RollingScheduler(cfg, om)
-    for d in range(days):
-        sched.run_daily_schedule(current_day=d)
-    stats = sched.get_cumulative_statistics()
-    return {
-        "total_revenue": stats.get("total_revenue", 0.0),
-        "total_cost": stats.get("total_cost", 0.0),
-        "total_penalty": stats.get("total_penalty", 0.0),
-        "total_profit": stats.get("total_profit", 0.0),
-        "total_orders": stats.get("total_orders", 0),
-        "completed_orders": stats.get("completed_orders", 0),
-        "on_time_rate": stats.get("on_time_rate", 0.0),
-    }
+def build_overrides_island_ga_ils():
+    ov = build_overrides_island_ga()
+    ov["ENABLE_RISK_GUIDED_LS"] = True
+    ov["RISK_LS_MAX_ITER"] = 20
+    return ov
 
 def format_currency(x):
     return f"¥{x:,.2f}"
@@ -122,17 +102,20 @@ def main():
     ap.add_argument("--days", type=int, default=5)
     ap.add_argument("--out", type=str, default=os.path.join("biao", "out"))
     ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--workers", type=int, default=None)
     args = ap.parse_args()
-    random.seed(args.seed)
     os.makedirs(args.out, exist_ok=True)
-    cfg_ga = build_config_ga()
-    cfg_ga_ils = build_config_ga_ils()
-    cfg_island_ga = build_config_island_ga()
-    cfg_island_ga_ils = build_config_island_ga_ils()
-    m_ga = run_once(cfg_ga, args.csv, args.days)
-    m_ga_ils = run_once(cfg_ga_ils, args.csv, args.days)
-    m_island_ga = run_once(cfg_island_ga, args.csv, args.days)
-    m_island_ga_ils = run_once(cfg_island_ga_ils, args.csv, args.days)
+    overrides = [
+        build_overrides_ga(),
+        build_overrides_ga_ils(),
+        build_overrides_island_ga(),
+        build_overrides_island_ga_ils(),
+    ]
+    rows = run_batch([(args.csv, ov, args.days, args.seed) for ov in overrides], max_workers=args.workers)
+    for row in rows:
+        if row["error"]:
+            raise RuntimeError(row["error"])
+    m_ga, m_ga_ils, m_island_ga, m_island_ga_ils = rows
     df = build_table_df(m_ga, m_ga_ils, m_island_ga, m_island_ga_ils)
     csv_path = os.path.join(args.out, "tri_table_results.csv")
     png_path = os.path.join(args.out, "tri_table.png")
@@ -9,12 +9,16 @@ import os
 from pathlib import Path
 import pandas as pd
 import json
+import time
 
 # 设置路径
 ROOT = Path(__file__).resolve().parent
 sys.path.append(str(ROOT / 'src'))
 
-from src.service import load_default_config, load_orders, run_schedule, run_full_cycle
+from src.service import (
+    load_default_config, load_orders, run_schedule,
+    submit_cycle, poll as poll_job, cancel as cancel_job, result as job_result, JobCancelled,
+)
 from src.visualization.gantt import GanttChart
 from src.visualization.metrics import MetricsVisualizer
 
@@ -44,6 +48,42 @@ if 'output_dir' not in st.session_state:
     os.makedirs(st.session_state.output_dir, exist_ok=True)
 if 'current_csv_path' not in st.session_state:
     st.session_state.current_csv_path = None
+if 'cycle_job' not in st.session_state:
+    st.session_state.cycle_job = None  # 后台运行中的完整周期任务 (job_id, num_days)
+
+JOB_POLL_INTERVAL = 0.5  # 后台任务进度的刷新间隔（秒）
+
+
+def _show_cycle_result(scheduler, simulation_result, num_days):
+    """保存完整周期的运行结果，并生成最终的甘特图与指标图表"""
+    st.session_state.scheduler = scheduler
+    st.session_state.simulation_result = simulation_result
+    st.session_state.num_days = num_days
+    st.session_state.current_day = 0  # 默认显示第1天
+    
+    # 生成最终的可视化（使用最后一天的数据）
+    final_schedule = scheduler.get_current_schedule()
+    orders = st.session_state.orders.get_all_orders()
+    
+    if final_schedule:
+        # 生成甘特图
+        gantt = GanttChart()
+        gantt.plot_schedule(
+            final_schedule,
+            orders,
+            num_lines=3,
+            max_slots=st.session_state.config.SLOTS_PER_DAY * num_days,
+            output_path=f"{st.session_state.output_dir}/gantt_chart.png"
+        )
+        
+        # 生成指标图表
+        metrics_viz = MetricsVisualizer()
+        metrics_viz.generate_report(
+            simulation_result.cumulative_stats,
+            orders,
+            st.session_state.output_dir,
+            final_schedule
+        )
 
 # 标题
 st.title("🏭 智能制造生产调度系统")
@@ -249,62 +289,67 @@ with tab3:
                 step=1,
                 help="设置要模拟的生产天数"
             )
+            collect_metrics = st.checkbox(
+                "采集性能指标",
+                value=False,
+                help="记录评估次数、局部搜索接受率及每天各阶段耗时（不使用结果缓存）"
+            )
+            
+            cycle_job = st.session_state.cycle_job
+            if st.button("▶️ 开始模拟（运行完整周期）", type="primary", disabled=cycle_job is not None):
+                try:
+                    base_day_costs = st.session_state.config.LABOR_COSTS[:6] if len(st.session_state.config.LABOR_COSTS) >= 6 else [1000, 1000, 1000, 2000, 2000, 2000]
+                    overrides = {
+                        "POPULATION_SIZE": st.session_state.config.POPULATION_SIZE,
+                        "MAX_GENERATIONS": st.session_state.config.MAX_GENERATIONS,
+                        "CROSSOVER_RATE": st.session_state.config.CROSSOVER_RATE,
+                        "MUTATION_RATE": st.session_state.config.MUTATION_RATE,
+                        "ELITE_SIZE": st.session_state.config.ELITE_SIZE,
+                        "LABOR_COSTS": base_day_costs * num_days,
+                        "ENABLE_STOPLOSS": getattr(st.session_state.config, "ENABLE_STOPLOSS", False),
+                    }
+                    csv_path = st.session_state.current_csv_path or str(ROOT / 'data' / 'temp_orders.csv')
+                    # 在后台运行完整周期，页面轮询进度，运行期间界面保持可交互
+                    job_id = submit_cycle(
+                        num_days=num_days,
+                        csv_path=csv_path,
+                        config_overrides=overrides,
+                        cache_dir=os.path.join(st.session_state.output_dir, 'result_cache'),
+                        collect_metrics=collect_metrics,
+                    )
+                    st.session_state.cycle_job = (job_id, num_days)
+                    st.rerun()
+                except Exception as e:
+                    st.error(f"❌ 调度失败: {str(e)}")
             
-            if st.button("▶️ 开始模拟（运行完整周期）", type="primary"):
-                with st.spinner(f"🔄 正在运行{num_days}天的完整调度周期..."):
-                    try:
-                        base_day_costs = st.session_state.config.LABOR_COSTS[:6] if len(st.session_state.config.LABOR_COSTS) >= 6 else [1000, 1000, 1000, 2000, 2000, 2000]
-                        overrides = {
-                            "POPULATION_SIZE": st.session_state.config.POPULATION_SIZE,
-                            "MAX_GENERATIONS": st.session_state.config.MAX_GENERATIONS,
-                            "CROSSOVER_RATE": st.session_state.config.CROSSOVER_RATE,
-                            "MUTATION_RATE": st.session_state.config.MUTATION_RATE,
-                            "ELITE_SIZE": st.session_state.config.ELITE_SIZE,
-                            "LABOR_COSTS": base_day_costs * num_days,
-                            "ENABLE_STOPLOSS": getattr(st.session_state.config, "ENABLE_STOPLOSS", False),
-                        }
-                        csv_path = st.session_state.current_csv_path or str(ROOT / 'data' / 'temp_orders.csv')
-                        # 一次性运行完整周期（新接口）
-                        scheduler, simulation_result = run_full_cycle(
-                            num_days=num_days,
-                            csv_path=csv_path,
-                            config_overrides=overrides,
-                        )
-                        
-                        # 保存结果
-                        st.session_state.scheduler = scheduler
-                        st.session_state.simulation_result = simulation_result
-                        st.session_state.num_days = num_days
-                        st.session_state.current_day = 0  # 默认显示第1天
-                        
-                        # 生成最终的可视化（使用最后一天的数据）
-                        final_schedule = scheduler.get_current_schedule()
-                        orders = st.session_state.orders.get_all_orders()
-                        
-                        if final_schedule:
-                            # 生成甘特图
-                            gantt = GanttChart()
-                            gantt.plot_schedule(
-                                final_schedule,
-                                orders,
-                                num_lines=3,
-                                max_slots=st.session_state.config.SLOTS_PER_DAY * num_days,
-                                output_path=f"{st.session_state.output_dir}/gantt_chart.png"
-                            )
-                            
-                            # 生成指标图表
-                            metrics_viz = MetricsVisualizer()
-                            metrics_viz.generate_report(
-                                simulation_result.cumulative_stats,
-                                orders,
-                                st.session_state.output_dir,
-                                final_schedule
-                            )
-                        
-                        st.success(f"✅ 完整{num_days}天调度周期运行完成！现在可以在【结果分析】标签页按天浏览结果。")
-                        st.rerun()
-                    except Exception as e:
-                        st.error(f"❌ 调度失败: {str(e)}")
+            if cycle_job is not None:
+                job_id, job_days = cycle_job
+                try:
+                    info = poll_job(job_id)
+                except KeyError:
+                    st.session_state.cycle_job = None
+                    st.rerun()
+                
+                if info['status'] in ('pending', 'running', 'cancelling'):
+                    progress_text = f"🔄 正在运行{job_days}天的完整调度周期：已完成 {info['completed_days']}/{job_days} 天"
+                    if info['current_day'] is not None and info['generation']:
+                        progress_text += f"，第{info['current_day']}天 GA 第 {info['generation']} 代"
+                    st.progress(info['completed_days'] / job_days, text=progress_text)
+                    if st.button("⏹️ 取消运行", disabled=info['status'] == 'cancelling'):
+                        cancel_job(job_id)
+                    time.sleep(JOB_POLL_INTERVAL)
+                    st.rerun()
+                
+                st.session_state.cycle_job = None
+                try:
+                    scheduler, simulation_result = job_result(job_id)
+                    _show_cycle_result(scheduler, simulation_result, job_days)
+                    st.success(f"✅ 完整{job_days}天调度周期运行完成！现在可以在【结果分析】标签页按天浏览结果。")
+                    st.rerun()
+                except JobCancelled:
+                    st.info("ℹ️ 调度已取消")
+                except Exception as e:
+                    st.error(f"❌ 调度失败: {str(e)}")
         
         with col2:
             st.subheader("运行状态")
@@ -467,6 +512,44 @@ with tab4:
                 st.metric("累计总利润", f"¥{cumulative_stats['total_profit']:,.0f}")
             
             st.markdown("---")
+            
+            # 性能指标（运行时勾选“采集性能指标”才有）
+            run_metrics = cumulative_stats.get('metrics')
+            if run_metrics:
+                st.subheader("⏱️ 性能指标")
+                derived = run_metrics.get('derived', {})
+                col_m1, col_m2, col_m3 = st.columns(3)
+                with col_m1:
+                    st.metric("适应度评估次数", f"{run_metrics['counters'].get('evaluations', 0):,}")
+                with col_m2:
+                    evals_per_sec = derived.get('evaluations_per_sec')
+                    st.metric("评估速度", f"{evals_per_sec:,.0f} 次/秒" if evals_per_sec else "-")
+                with col_m3:
+                    accept_rate = derived.get('ls_accept_rate')
+                    st.metric("局部搜索接受率", f"{accept_rate:.1%}" if accept_rate is not None else "-")
+                
+                timer_rows = [
+                    {"环节": name, "总耗时(秒)": round(t['total_s'], 3), "次数": t['count'], "平均(毫秒)": round(t['mean_ms'], 3)}
+                    for name, t in sorted(run_metrics['timers'].items(), key=lambda item: -item[1]['total_s'])
+                ]
+                st.dataframe(pd.DataFrame(timer_rows), use_container_width=True, hide_index=True)
+                
+                phase_rows = [
+                    dict({"天数": f"第{d['day']}天"}, **{k: round(v, 3) for k, v in d['phases'].items()})
+                    for d in run_metrics.get('days', [])
+                ]
+                if phase_rows:
+                    st.caption("每天各阶段耗时（秒）")
+                    st.dataframe(pd.DataFrame(phase_rows).fillna(0.0), use_container_width=True, hide_index=True)
+                
+                st.download_button(
+                    "下载指标 JSON",
+                    json.dumps(run_metrics, ensure_ascii=False, indent=2),
+                    file_name="metrics.json",
+                    mime="application/json",
+                )
+                
+                st.markdown("---")
         # 甘特图
         st.subheader("📈 生产甘特图")
         gantt_path = Path(st.session_state.output_dir) / "gantt_chart.png"
@@ -0,0 +1,81 @@
+"""
+模块导入耗时基准
+
+在全新的解释器中以 python -X importtime 导入各模块，统计累计导入耗时，
+并检查优化核心（models / ga / local_search / scheduler / service）导入后
+是否引入了 matplotlib、pandas、NumPy 等重量级依赖。
+"""
+import os
+import sys
+import argparse
+import subprocess
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+CORE_MODULES = ["models", "ga", "local_search", "scheduler", "service", "daemon"]
+OPTIONAL_MODULES = ["visualization", "main"]
+HEAVY_DEPENDENCIES = ["matplotlib", "pandas", "numpy"]
+
+
+def import_time_us(module, repeat):
+    """
+    测量模块的累计导入耗时（微秒，取多次最小值）及导入后已加载的重量级依赖
+
+    Returns:
+        tuple: (cumulative_us, heavy_modules)
+    """
+    code = (
+        f"import {module}, sys; "
+        f"print(','.join(m for m in {HEAVY_DEPENDENCIES!r} if m in sys.modules))"
+    )
+    best = None
+    heavy = []
+    for _ in range(repeat):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            cwd=SRC_DIR, capture_output=True, text=True
+        )
+        if proc.returncode != 0:
+            raise RuntimeError(f"import {module} failed:\n{proc.stderr.strip().splitlines()[-1]}")
+        cumulative = None
+        for line in proc.stderr.splitlines():
+            # 格式: import time: self [us] | cumulative | imported package
+            if not line.startswith("import time:") or "|" not in line:
+                continue
+            parts = [part.strip() for part in line[len("import time:"):].split("|")]
+            if parts[2] == module:
+                cumulative = int(parts[1])
+        if cumulative is not None:
+            best = cumulative if best is None else min(best, cumulative)
+        heavy = [name for name in proc.stdout.strip().split(",") if name]
+    return best, heavy
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark module import time with -X importtime")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per module (best is reported)")
+    parser.add_argument("--modules", nargs="*", default=None, help="Modules to measure")
+    parser.add_argument("--check", action="store_true",
+                        help="Exit non-zero if a core module imports a heavy dependency")
+    args = parser.parse_args()
+
+    modules = args.modules or CORE_MODULES + OPTIONAL_MODULES
+    failures = []
+    print(f"{'module':>14} {'cumulative ms':>14}  heavy deps")
+    for module in modules:
+        try:
+            cumulative, heavy = import_time_us(module, args.repeat)
+        except RuntimeError as e:
+            print(f"{module:>14} {'error':>14}  {e}")
+            continue
+        print(f"{module:>14} {cumulative / 1000:>14.1f}  {', '.join(heavy) or '-'}")
+        if module in CORE_MODULES and heavy:
+            failures.append(module)
+
+    if args.check and failures:
+        print(f"\ncore modules importing heavy dependencies: {', '.join(failures)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
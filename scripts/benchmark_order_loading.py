@@ -0,0 +1,66 @@
+"""
+订单加载启动耗时基准
+
+生成指定规模的合成订单 CSV，对比逐行参考实现 load_orders_from_csv
+与流式分块实现 load_orders_streaming 的加载耗时。
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from scheduler.order_manager import OrderManager
+
+
+def write_synthetic_csv(path, num_orders, seed=0):
+    rng = random.Random(seed)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write("order_id,product,quantity,release_slot,due_slot,unit_price\n")
+        for order_id in range(1, num_orders + 1):
+            release_slot = rng.randint(1, 600)
+            due_slot = release_slot + rng.randint(12, 30)
+            f.write(
+                f"{order_id},{rng.randint(1, 3)},{rng.randint(80, 300)},"
+                f"{release_slot},{due_slot},{rng.randint(45, 70)}\n"
+            )
+
+
+def time_loader(load, path):
+    om = OrderManager()
+    t0 = time.perf_counter()
+    count = load(om, path)
+    # 首次查询包含索引排序，计入启动耗时
+    om.get_eligible_orders(1)
+    return count, time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark order CSV loading")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000],
+                        help="Order counts to benchmark")
+    parser.add_argument("--chunksize", type=int, default=50000,
+                        help="Rows per chunk for the streaming loader")
+    parser.add_argument("--skip_reference", action="store_true",
+                        help="Only time the streaming loader")
+    args = parser.parse_args()
+
+    loaders = [("streaming", lambda om, p: om.load_orders_streaming(p, chunksize=args.chunksize))]
+    if not args.skip_reference:
+        loaders.insert(0, ("reference", lambda om, p: om.load_orders_from_csv(p)))
+
+    print(f"{'orders':>10} {'loader':>10} {'loaded':>10} {'seconds':>10} {'orders/s':>12}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for size in args.sizes:
+            path = os.path.join(tmp_dir, f"orders_{size}.csv")
+            write_synthetic_csv(path, size)
+            for name, load in loaders:
+                count, elapsed = time_loader(load, path)
+                print(f"{size:>10} {name:>10} {count:>10} {elapsed:>10.3f} {count / elapsed:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
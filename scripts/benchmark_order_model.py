@@ -0,0 +1,87 @@
+"""
+订单模型内存与属性访问基准
+
+对比基于实例 __dict__ 的旧版订单类与基于 __slots__ 的 Order：
+单个订单内存、热点辅助方法调用耗时、进度快照与复制耗时。
+"""
+import os
+import sys
+import copy
+import timeit
+import argparse
+import tracemalloc
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from models.order import Order
+
+
+class DictOrder:
+    """旧版订单类（实例 __dict__ 存储字段），仅作基准对照"""
+
+    def __init__(self, order_id, product, quantity, due_slot, unit_price, release_slot=1):
+        self.order_id = order_id
+        self.product = product
+        self.quantity = quantity
+        self.remaining = quantity
+        self.release_slot = release_slot
+        self.due_slot = due_slot
+        self.unit_price = unit_price
+        self.penalized = False
+        self.completed_slot = None
+
+    def get_completed_quantity(self):
+        return self.quantity - self.remaining
+
+    def calculate_penalty(self, penalty_rate=0.1):
+        if self.remaining > 0:
+            return self.quantity * self.unit_price * penalty_rate
+        return 0.0
+
+    def progress(self):
+        return (self.remaining, self.penalized, self.completed_slot)
+
+
+def bytes_per_order(cls, num_orders):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    orders = [cls(i, 1 + i % 3, 100 + i % 200, 13 + i % 600, 55.0, release_slot=1 + i % 600)
+              for i in range(num_orders)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # 扣除列表本身的指针开销
+    return (after - before - sys.getsizeof(orders)) / num_orders
+
+
+def time_helpers(cls, num_orders, repeat):
+    orders = [cls(i, 1, 100, 13, 55.0) for i in range(num_orders)]
+    results = {}
+    results['calculate_penalty'] = min(timeit.repeat(
+        lambda: [o.calculate_penalty(0.1) for o in orders], number=1, repeat=repeat))
+    results['get_completed_quantity'] = min(timeit.repeat(
+        lambda: [o.get_completed_quantity() for o in orders], number=1, repeat=repeat))
+    results['progress_snapshot'] = min(timeit.repeat(
+        lambda: [o.progress() for o in orders], number=1, repeat=repeat))
+    results['copy'] = min(timeit.repeat(
+        lambda: [copy.copy(o) for o in orders], number=1, repeat=repeat))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Order model")
+    parser.add_argument("--num_orders", type=int, default=100000, help="Number of orders")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repetitions (best is reported)")
+    args = parser.parse_args()
+
+    print(f"{'model':>10} {'bytes/order':>12}")
+    for name, cls in (("dict", DictOrder), ("slots", Order)):
+        print(f"{name:>10} {bytes_per_order(cls, args.num_orders):>12.1f}")
+
+    print(f"\n{'model':>10} {'operation':>24} {'ns/order':>10}")
+    for name, cls in (("dict", DictOrder), ("slots", Order)):
+        for op, seconds in time_helpers(cls, args.num_orders, args.repeat).items():
+            print(f"{name:>10} {op:>24} {seconds / args.num_orders * 1e9:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+断点续跑往返检查
+
+先完整运行多天滚动调度并按天保存断点，再从中间某天的断点恢复运行到最后一天，
+检查恢复后的累计利润与各天方案和完整运行一致。同时检查 Schedule / ArraySchedule
+经 copy、deepcopy 与 pickle 往返后分配方案不变（模拟结果的关键帧以 ArraySchedule 保存）。
+
+用法：
+    python scripts/check_checkpoint_resume.py
+    python scripts/check_checkpoint_resume.py --days 6 --resume_from_day 3
+"""
+import os
+import sys
+import copy
+import pickle
+import argparse
+import tempfile
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.append(SRC_DIR)
+
+from models.schedule import Schedule
+from service import run_full_cycle
+
+
+def check_schedule_copies():
+    """检查字典方案与数组方案的复制与序列化往返，返回错误信息列表"""
+    from models.array_schedule import ArraySchedule
+
+    errors = []
+    schedule = Schedule()
+    schedule.add_allocation(1, 0, 1, 5)
+    schedule.add_allocation(2, 1, 2, 3)
+    array_schedule = ArraySchedule.from_schedule(schedule)
+    array_schedule.add_allocation(3, 0, 4, 2)
+    for original in (schedule, array_schedule):
+        expected = dict(original.allocation)
+        for name, clone in (("copy", copy.copy), ("deepcopy", copy.deepcopy),
+                            ("pickle", lambda s: pickle.loads(pickle.dumps(s)))):
+            try:
+                restored = clone(original)
+            except Exception as exc:
+                errors.append(f"{type(original).__name__} {name}: {type(exc).__name__}: {exc}")
+                continue
+            if dict(restored.allocation) != expected:
+                errors.append(f"{type(original).__name__} {name}: allocation mismatch")
+    return errors
+
+
+def check_resume(csv_path, num_days, resume_from_day, seed, generations):
+    """完整运行与断点恢复运行对比，返回错误信息列表"""
+    overrides = {'QUIET': True, 'MAX_GENERATIONS': generations}
+    errors = []
+    with tempfile.TemporaryDirectory() as checkpoint_dir:
+        _, full = run_full_cycle(
+            num_days, csv_path, config_overrides=overrides, seed=seed,
+            checkpoint_dir=checkpoint_dir
+        )
+        _, resumed = run_full_cycle(
+            num_days, csv_path, config_overrides=overrides, seed=seed,
+            checkpoint_dir=checkpoint_dir, resume_from_day=resume_from_day
+        )
+    full_profit = full.cumulative_stats['total_profit']
+    resumed_profit = resumed.cumulative_stats['total_profit']
+    print(f"total profit: full={full_profit:.2f} resumed={resumed_profit:.2f}")
+    if sorted(resumed.days) != sorted(full.days):
+        errors.append(f"days mismatch: {sorted(resumed.days)} != {sorted(full.days)}")
+        return errors
+    # 恢复点之前的天来自断点，必须与完整运行逐项一致
+    for day in range(resume_from_day):
+        full_schedule = full.days[day].schedule
+        resumed_schedule = resumed.days[day].schedule
+        if (None if full_schedule is None else dict(full_schedule.allocation)) != \
+                (None if resumed_schedule is None else dict(resumed_schedule.allocation)):
+            errors.append(f"day {day + 1}: schedule differs after resume")
+        if resumed.days[day].financial != full.days[day].financial:
+            errors.append(f"day {day + 1}: financials differ after resume")
+    return errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Checkpoint save -> resume round-trip check")
+    parser.add_argument("--csv", type=str,
+                        default=os.path.join(SRC_DIR, "..", "data", "custom6_case.csv"),
+                        help="Order CSV")
+    parser.add_argument("--days", type=int, default=4, help="Days to simulate")
+    parser.add_argument("--resume_from_day", type=int, default=2, help="Day to resume from (0-based)")
+    parser.add_argument("--seed", type=int, default=2, help="Random seed")
+    parser.add_argument("--generations", type=int, default=10, help="GA generations per day")
+    args = parser.parse_args()
+
+    errors = check_schedule_copies()
+    errors += check_resume(args.csv, args.days, args.resume_from_day, args.seed,
+                           args.generations)
+    for error in errors:
+        print(f"FAIL: {error}", file=sys.stderr)
+    if not errors:
+        print("checkpoint round-trip ok")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -21,6 +21,7 @@ from visualization.gantt import GanttChart
 from visualization.metrics import MetricsVisualizer
 from ga.engine import run_ga
 from ga.decoder import Decoder
+from profiling import RunProfiler, get_profiler
 
 
 def run_edd_baseline(orders, config):
@@ -96,7 +97,8 @@ def run_ga_only(orders, config):
     start_time = time.time()
     
     # 运行GA
-    best_chromosome = run_ga(orders, config)
+    with get_profiler(config).phase("ga"):
+        best_chromosome = run_ga(orders, config)
     
     # 解码为Schedule
     decoder = Decoder(config)
@@ -122,11 +124,14 @@ def run_ga_ils(orders, config):
     start_time = time.time()
     
     # 运行GA
-    ga_best = run_ga(orders, config)
+    profiler = get_profiler(config)
+    with profiler.phase("ga"):
+        ga_best = run_ga(orders, config)
     
     # 局部搜索改进
     from local_search.ils_vns import improve_solution
-    improved = improve_solution(ga_best, orders, config)
+    with profiler.phase("ls"):
+        improved = improve_solution(ga_best, orders, config)
     
     # 解码为Schedule
     decoder = Decoder(config)
@@ -203,22 +208,37 @@ def run_single_experiment(args):
     
     print(f"\nLoaded {len(orders)} orders from {args.data}")
     
+    # 保存结果
+    base_name = f"{args.algorithm}_{args.data}"
+    
+    # 性能剖析：结果写入输出目录下的 profile_<算法>_<数据集>/
+    profiler = None
+    if args.profile:
+        config.PROFILE = args.profile
+        config.PROFILE_TRACEMALLOC = args.profile_memory
+        profiler = config.PROFILER = RunProfiler.from_config(
+            config, output_dir=os.path.join(args.output_dir, f"profile_{base_name}")
+        )
+        profiler.begin_day(0)
+    
     # 运行算法
-    if args.algorithm == 'edd':
-        schedule, runtime = run_edd_baseline(orders, config)
-    elif args.algorithm == 'ga_only':
-        schedule, runtime = run_ga_only(orders, config)
-    elif args.algorithm == 'ga_ils':
-        schedule, runtime = run_ga_ils(orders, config)
-    else:
-        raise ValueError(f"Unknown algorithm: {args.algorithm}")
+    try:
+        if args.algorithm == 'edd':
+            schedule, runtime = run_edd_baseline(orders, config)
+        elif args.algorithm == 'ga_only':
+            schedule, runtime = run_ga_only(orders, config)
+        elif args.algorithm == 'ga_ils':
+            schedule, runtime = run_ga_ils(orders, config)
+        else:
+            raise ValueError(f"Unknown algorithm: {args.algorithm}")
+    finally:
+        if profiler is not None:
+            profiler.close()
+            print(f"Profile saved to {profiler.output_dir}")
     
     # 创建输出目录
     os.makedirs(args.output_dir, exist_ok=True)
     
-    # 保存结果
-    base_name = f"{args.algorithm}_{args.data}"
-    
     if args.save_metrics:
         metrics_path = os.path.join(args.output_dir, f"metrics_{base_name}.csv")
         save_metrics_to_csv(schedule, orders, runtime, metrics_path)
@@ -377,6 +397,15 @@ def main():
                        help='Save metrics to CSV')
     parser.add_argument('--save_charts', action='store_true', default=True,
                        help='Save charts')
+    parser.add_argument('--no_charts', dest='save_charts', action='store_false',
+                       help='Skip charts (headless run, matplotlib is never imported)')
+    
+    # 性能剖析
+    parser.add_argument('--profile', type=str, nargs='?', const='all', default=None,
+                       help='Profile phases with cProfile: all (default) or comma list of '
+                            'ga, ga_generation, ls, decode')
+    parser.add_argument('--no_profile_memory', dest='profile_memory', action='store_false',
+                       help='Skip tracemalloc peak / top allocations when profiling (faster)')
     
     args = parser.parse_args()
     
@@ -407,6 +436,8 @@ def main():
     print("  - gantt_*.png (Gantt charts)")
     print("  - profit_*.png (profit breakdown)")
     print("  - comparison_report_*.txt (comparison analysis)")
+    if args.profile:
+        print("  - profile_*/ (.prof files and profiling summaries)")
 
 
 if __name__ == "__main__":
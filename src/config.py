@@ -62,6 +62,51 @@ class Config:
     # 策略开关
     ENABLE_STOPLOSS = False
 
+    # 日内事件驱动重排（默认关闭：8点之后到达的订单等待次日调度）
+    ENABLE_INTRADAY_REPAIR = False
+    INTRADAY_REPAIR_BUDGET_MS = 50.0  # 单次重排的时延预算（毫秒）
+    INTRADAY_REPAIR_LS_ITER = 20  # 贪心插入后的短局部搜索迭代次数，0 表示不做
+    
+    # 校验当前方案的增量指标（默认关闭）：每次合并计划与日内重排后全量重算并比对，不一致时报错
+    CHECK_INCREMENTAL_METRICS = False
+
+    # 次日预优化（默认关闭）：当天计划确定后在后台线程中提前优化次日窗口，
+    # 次日 8 点以预优化结果热启动，仅需少量代数对齐实际到达的订单
+    ENABLE_SPECULATIVE_PLANNING = False
+    SPECULATIVE_REFINE_GENERATIONS = 10  # 热启动时 8 点触发的 GA 代数
+
+    # 跳过无变化日（默认关闭）：无新订单、执行无偏差且原计划仍能按期覆盖全部订单时，
+    # 沿用已有计划，不再运行 GA + 局部搜索
+    ENABLE_SKIP_UNCHANGED_DAYS = False
+
+    # GA 进度回调（默认无）：每代结束时调用 GENERATION_CALLBACK(generation, best_fitness)，
+    # 回调抛出的异常会中止当前优化（服务层后台任务据此上报进度与取消）
+    GENERATION_CALLBACK = None
+    # 取消检查（默认无）：局部搜索每次迭代调用 CANCEL_CHECK()，抛出的异常中止当前优化
+    CANCEL_CHECK = None
+
+    # GA 随机数生成器（默认无，使用全局 random）：后台预优化等并发场景设置独立的
+    # random.Random 实例，避免与前台共用随机流导致同一种子结果不可复现
+    RNG = None
+
+    # 日志（见 logger.py）：LOG_LEVEL 为 None 时保持当前日志级别（默认 INFO）
+    LOG_LEVEL = None  # 全局级别，如 "DEBUG" / "INFO" / "WARNING"
+    LOG_MODULE_LEVELS = {}  # 分模块级别，如 {"local_search": "WARNING", "scheduler": "DEBUG"}
+    # 安静模式：只输出警告及以上，并跳过仅用于日志的统计量（如每代平均适应度）
+    QUIET = False
+
+    # 指标采集（默认关闭）：设置为 instrumentation.MetricsRegistry 实例后，GA、局部搜索、
+    # 解码与滚动调度记录评估次数、各环节耗时与每天各阶段耗时（见 instrumentation.py）
+    METRICS = None
+
+    # 性能剖析（默认关闭，见 profiling.py）：PROFILE 为 "all" 或阶段列表（ga / ga_generation / ls / decode）
+    # 时按天对所选阶段运行 cProfile，并记录内存峰值与主要分配位置，结果写入 PROFILE_DIR
+    PROFILE = None
+    PROFILE_DIR = "profile"
+    PROFILE_TRACEMALLOC = True  # tracemalloc 会明显拖慢运行，只看耗时可关闭
+    PROFILE_TOP_N = 20  # 摘要中列出的热点函数 / 分配位置数量
+    PROFILER = None  # 运行期间由服务层按 PROFILE 创建的 profiling.RunProfiler，运行结束后复位
+
     def __init__(self):
         """初始化配置，设置默认参数"""
         # 设置默认产能参数
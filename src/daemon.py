@@ -0,0 +1,461 @@
+"""
+常驻调度服务模块
+
+以守护进程方式常驻内存：订单、配置、滚动调度器以及已预热的批量运行进程池
+在多次请求之间保持不变。客户端通过本机 HTTP（默认只监听 127.0.0.1）提交订单、
+触发每日调度、获取生产计划，请求延迟只包含优化本身的耗时，不再重复承担
+Python 启动、绘图库导入、CSV 解析与进程池启动的开销。
+
+接口（请求与响应均为 JSON）：
+    GET  /status                      当前天数、订单数量、累计统计
+    GET  /plan?day=N                  第 N 天（0-based）的生产计划；
+    GET  /plan?start_slot=A&end_slot=B  或指定时间段范围，缺省为全部
+    POST /orders     {"orders": [...]} 或 {"csv_path": "..."}   提交订单
+    POST /schedule   {"day": N}（可选，默认下一天）             触发每日调度
+    POST /batch      {"scenarios": [...]}                      在常驻进程池上批量运行
+    POST /reset      {"config_overrides": {...}, "csv_path": "..."}（均可选）
+    POST /shutdown                                              停止服务
+
+启动：python src/daemon.py --csv data/custom6_case.csv --port 8765 --workers 2
+
+服务没有鉴权，请求可以让服务读取任意 CSV 路径，因此只允许监听回环地址；
+确需对外监听时须显式指定 --allow_remote，并用 --csv_dir 限定可读取的 CSV 目录。
+"""
+import sys
+import os
+import json
+import time
+import argparse
+import threading
+import contextlib
+import ipaddress
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+from urllib.request import Request, urlopen
+
+# 添加项目根目录到路径
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from logger import get_logger, logging_scope
+from models.order import Order
+from scheduler.order_manager import OrderManager
+from scheduler.rolling_scheduler import RollingScheduler
+from service import load_default_config, load_orders, create_batch_pool, run_batch
+
+logger = get_logger(__name__)
+
+DEFAULT_PORT = 8765
+
+
+class SchedulingDaemon:
+    """
+    常驻调度服务状态
+
+    所有修改订单与调度器的操作在同一把锁内串行执行；批量运行在常驻进程池上并行，
+    不占用该锁。
+
+    Attributes:
+        config: 配置对象
+        order_manager: 订单管理器
+        scheduler: 滚动调度器
+        next_day: 下一次触发的天数（0-based）
+        allowed_csv_dirs: 请求中允许读取的 CSV 目录（None 表示不限制）
+        max_workers: 批量运行进程池的工作进程数（未创建进程池时为 0）
+    """
+
+    def __init__(self, config_overrides=None, csv_path=None, max_workers=None, quiet=True,
+                 allowed_csv_dirs=None):
+        """
+        Args:
+            config_overrides: 配置参数覆盖（基于 load_default_config）
+            csv_path: 启动时加载的订单CSV（可选，不受 allowed_csv_dirs 限制）
+            max_workers: 批量运行进程池的工作进程数，0 表示不创建进程池
+            quiet: 是否屏蔽调度过程中的控制台输出（日志只输出警告及以上）
+            allowed_csv_dirs: 请求（提交订单、重置、批量运行）中允许读取的 CSV 目录列表，
+                              None 表示不限制
+        """
+        self.quiet = quiet
+        self.allowed_csv_dirs = (
+            [os.path.realpath(d) for d in allowed_csv_dirs] if allowed_csv_dirs is not None else None
+        )
+        self._lock = threading.Lock()
+        self.pool = None
+        self.max_workers = 0  # 批量运行进程池的工作进程数（未创建进程池时为 0）
+        if max_workers != 0:
+            preload = (csv_path,) if csv_path else ()
+            # 与 create_batch_pool 的默认值一致
+            self.max_workers = max_workers or os.cpu_count() or 1
+            self.pool = create_batch_pool(self.max_workers, preload_csv_paths=preload)
+        self.reset(config_overrides, csv_path)
+
+    def _output(self):
+        # 通过日志级别静默，而不是替换整个进程的 sys.stdout
+        return logging_scope(quiet=True) if self.quiet else contextlib.nullcontext()
+
+    def check_csv_path(self, csv_path):
+        """
+        检查请求中的 CSV 路径是否位于允许的目录内
+
+        Raises:
+            ValueError: 路径不在 allowed_csv_dirs 中的任何目录下
+        """
+        if self.allowed_csv_dirs is None:
+            return
+        path = os.path.realpath(csv_path)
+        for directory in self.allowed_csv_dirs:
+            if os.path.commonpath([path, directory]) == directory:
+                return
+        raise ValueError(f"不允许读取该路径的 CSV: {csv_path}")
+
+    def reset(self, config_overrides=None, csv_path=None):
+        """
+        重置常驻状态：重新构建配置与调度器，可选地重新加载订单
+
+        Args:
+            config_overrides: 配置参数覆盖
+            csv_path: 订单CSV路径；为 None 时保留现有订单并重置其进度
+        """
+        with self._lock:
+            config = load_default_config()
+            config.QUIET = self.quiet
+            for k, v in (config_overrides or {}).items():
+                if hasattr(config, k):
+                    setattr(config, k, v)
+
+            if csv_path is not None:
+                with self._output():
+                    order_manager = load_orders(csv_path)
+            elif getattr(self, 'order_manager', None) is not None:
+                order_manager = self.order_manager
+                for order in order_manager.get_all_orders():
+                    order.reset()
+                    order.penalized = False
+                    order.completed_slot = None
+                order_manager.pending_orders = order_manager.get_all_orders()
+            else:
+                order_manager = OrderManager()
+
+            self.config = config
+            self.order_manager = order_manager
+            self.scheduler = RollingScheduler(config, order_manager)
+            self.next_day = 0
+            return self._status()
+
+    def submit_orders(self, orders=None, csv_path=None, adjust_due_slot=True):
+        """
+        提交新订单（同编号订单被替换），在下一次调度触发时生效
+
+        Args:
+            orders: 订单字典列表，字段同 CSV：order_id, product, quantity, due_slot,
+                    unit_price, release_slot（可选，默认 1）
+            csv_path: 或者从 CSV 文件追加订单
+            adjust_due_slot: 是否与 CSV 加载一致地将 due_slot 调整到截止日期次日早上8点
+
+        Returns:
+            dict: {'added': 新增订单数, 'total_orders': 订单总数}
+        """
+        new_orders = []
+        for item in orders or []:
+            due_slot = int(item['due_slot'])
+            if adjust_due_slot:
+                due_slot = ((due_slot - 1) // 6 + 1) * 6 + 1
+            new_orders.append(Order(
+                int(item['order_id']),
+                int(item['product']),
+                int(item['quantity']),
+                due_slot,
+                float(item['unit_price']),
+                release_slot=int(item.get('release_slot', 1))
+            ))
+        if csv_path is not None:
+            self.check_csv_path(csv_path)
+        with self._lock:
+            # CSV 在锁内加载，与 reset 等操作串行，不会读到加载过程中被替换的状态
+            if csv_path is not None:
+                with self._output():
+                    new_orders[:0] = load_orders(csv_path).get_all_orders()
+            for order in new_orders:
+                self.order_manager.add_order(order)
+            return {'added': len(new_orders), 'total_orders': self.order_manager.get_order_count()}
+
+    def run_day(self, day=None):
+        """
+        触发一次每日调度（8点）
+
+        Args:
+            day: 天数（0-based），默认为下一天；只能按顺序推进
+
+        Returns:
+            dict: 当天财务数据、计划利润与优化耗时
+        """
+        with self._lock:
+            if day is None:
+                day = self.next_day
+            if day != self.next_day:
+                raise ValueError(f"只能按顺序触发调度：下一天为 {self.next_day}，请求为 {day}")
+            start = time.perf_counter()
+            with self._output():
+                schedule = self.scheduler.run_daily_schedule(current_day=day)
+            elapsed = time.perf_counter() - start
+            self.next_day = day + 1
+            daily_results = self.scheduler.cumulative_stats['daily_results']
+            return {
+                'day': day,
+                'financial': daily_results[day] if day < len(daily_results) else None,
+                'plan_profit': schedule.profit if schedule is not None else None,
+                'seconds': elapsed,
+            }
+
+    def get_plan(self, day=None, start_slot=None, end_slot=None):
+        """
+        获取当前生产计划
+
+        Args:
+            day: 天数（0-based），指定时返回该天 6 个时间段的计划
+            start_slot: 起始时间段（含），缺省为 1
+            end_slot: 结束时间段（含），缺省为不限
+
+        Returns:
+            dict: {'start_slot', 'end_slot', 'allocations': [{order_id, line, slot, quantity}, ...]}
+        """
+        with self._lock:
+            if day is not None:
+                start_slot = self.order_manager.time_to_slot(day, hour=8)
+                end_slot = start_slot + self.config.SLOTS_PER_DAY - 1
+            start_slot = start_slot or 1
+            schedule = self.scheduler.get_current_schedule()
+            allocations = []
+            if schedule is not None:
+                for (order_id, line, slot), qty in sorted(
+                    schedule.allocation.items(), key=lambda item: (item[0][2], item[0][1], item[0][0])
+                ):
+                    if slot < start_slot or (end_slot is not None and slot > end_slot):
+                        continue
+                    allocations.append({'order_id': order_id, 'line': line, 'slot': slot, 'quantity': qty})
+            return {'start_slot': start_slot, 'end_slot': end_slot, 'allocations': allocations}
+
+    def _status(self):
+        stats = self.scheduler.get_cumulative_statistics()
+        return {
+            'next_day': self.next_day,
+            'total_orders': self.order_manager.get_order_count(),
+            'pending_orders': self.order_manager.get_pending_count(),
+            'workers': self.max_workers if self.pool is not None else 0,
+            'cumulative_stats': {
+                k: v for k, v in stats.items()
+                if isinstance(v, (int, float, str, bool)) or v is None
+            },
+        }
+
+    def status(self):
+        """获取服务状态"""
+        with self._lock:
+            return self._status()
+
+    def run_batch(self, scenarios):
+        """
+        在常驻进程池上批量运行场景（见 service.run_batch）
+
+        Args:
+            scenarios: 场景列表
+
+        Returns:
+            list: 结果表
+        """
+        for scenario in scenarios:
+            csv_path = scenario.get('csv_path') if isinstance(scenario, dict) else scenario[0]
+            self.check_csv_path(csv_path)
+        if self.pool is None:
+            return run_batch(scenarios, max_workers=1, quiet=self.quiet)
+        return run_batch(scenarios, quiet=self.quiet, executor=self.pool)
+
+    def close(self):
+        """关闭进程池"""
+        if self.pool is not None:
+            self.pool.shutdown(wait=True, cancel_futures=True)
+            self.pool = None
+
+
+class _DaemonRequestHandler(BaseHTTPRequestHandler):
+    """将 HTTP 请求分发到 SchedulingDaemon"""
+
+    def log_message(self, format, *args):
+        # 默认的逐请求日志会淹没调度输出，这里不打印
+        pass
+
+    def _send(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False, default=str).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        if length == 0:
+            return {}
+        return json.loads(self.rfile.read(length).decode('utf-8'))
+
+    def _dispatch(self, handler):
+        try:
+            self._send(200, handler())
+        except (KeyError, ValueError, TypeError) as e:
+            self._send(400, {'error': f"{type(e).__name__}: {e}"})
+        except Exception as e:
+            self._send(500, {'error': f"{type(e).__name__}: {e}"})
+
+    def do_GET(self):
+        daemon = self.server.daemon
+        url = urlparse(self.path)
+        if url.path == '/status':
+            self._dispatch(daemon.status)
+        elif url.path == '/plan':
+            def get_plan():
+                # 查询参数在 _dispatch 内解析，非整数参数返回 400
+                query = {k: int(v[0]) for k, v in parse_qs(url.query).items()}
+                return daemon.get_plan(query.get('day'), query.get('start_slot'), query.get('end_slot'))
+            self._dispatch(get_plan)
+        else:
+            self._send(404, {'error': f"未知路径: {url.path}"})
+
+    def do_POST(self):
+        daemon = self.server.daemon
+        path = urlparse(self.path).path
+        try:
+            payload = self._read_json()
+        except ValueError as e:
+            self._send(400, {'error': f"请求体不是合法的 JSON: {e}"})
+            return
+        if path == '/orders':
+            self._dispatch(lambda: daemon.submit_orders(
+                payload.get('orders'), payload.get('csv_path'), payload.get('adjust_due_slot', True)
+            ))
+        elif path == '/schedule':
+            self._dispatch(lambda: daemon.run_day(payload.get('day')))
+        elif path == '/batch':
+            self._dispatch(lambda: daemon.run_batch(payload['scenarios']))
+        elif path == '/reset':
+            def reset():
+                csv_path = payload.get('csv_path')
+                if csv_path is not None:
+                    daemon.check_csv_path(csv_path)
+                return daemon.reset(payload.get('config_overrides'), csv_path)
+            self._dispatch(reset)
+        elif path == '/shutdown':
+            self._send(200, {'stopping': True})
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+        else:
+            self._send(404, {'error': f"未知路径: {path}"})
+
+
+def is_loopback_host(host):
+    """监听地址是否为回环地址（localhost、127.0.0.0/8、::1）"""
+    if host == 'localhost':
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def serve(daemon, host='127.0.0.1', port=DEFAULT_PORT, allow_remote=False):
+    """
+    在本机 HTTP 端口上提供服务，直到收到 /shutdown 或 Ctrl+C
+
+    Args:
+        daemon: 常驻调度服务 (SchedulingDaemon)
+        host: 监听地址，默认只监听本机
+        port: 端口号，0 表示由系统分配
+        allow_remote: 是否允许监听非回环地址（此时 daemon 必须设置 allowed_csv_dirs）
+
+    Returns:
+        ThreadingHTTPServer: 已停止的服务器对象
+
+    Raises:
+        ValueError: 非回环地址未显式允许，或允许后未限定 CSV 目录
+    """
+    if not is_loopback_host(host):
+        if not allow_remote:
+            raise ValueError(f"只允许监听回环地址，{host} 需要显式开启 allow_remote")
+        if daemon.allowed_csv_dirs is None:
+            raise ValueError("监听非回环地址时必须用 allowed_csv_dirs 限定可读取的 CSV 目录")
+    server = ThreadingHTTPServer((host, port), _DaemonRequestHandler)
+    server.daemon = daemon
+    logger.info("🛰️ 调度服务已启动: http://%s:%d", host, server.server_address[1])
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        daemon.close()
+    return server
+
+
+class DaemonClient:
+    """常驻调度服务的简易客户端（标准库 urllib 实现）"""
+
+    def __init__(self, host='127.0.0.1', port=DEFAULT_PORT, timeout=None):
+        self.base_url = f"http://{host}:{port}"
+        self.timeout = timeout
+
+    def _request(self, method, path, payload=None):
+        data = json.dumps(payload).encode('utf-8') if payload is not None else None
+        request = Request(self.base_url + path, data=data, method=method,
+                          headers={'Content-Type': 'application/json'})
+        with urlopen(request, timeout=self.timeout) as response:
+            return json.loads(response.read().decode('utf-8'))
+
+    def status(self):
+        return self._request('GET', '/status')
+
+    def submit_orders(self, orders=None, csv_path=None):
+        return self._request('POST', '/orders', {'orders': orders, 'csv_path': csv_path})
+
+    def run_day(self, day=None):
+        return self._request('POST', '/schedule', {'day': day})
+
+    def get_plan(self, day=None, start_slot=None, end_slot=None):
+        params = {'day': day, 'start_slot': start_slot, 'end_slot': end_slot}
+        query = '&'.join(f"{k}={v}" for k, v in params.items() if v is not None)
+        return self._request('GET', '/plan' + (f"?{query}" if query else ''))
+
+    def run_batch(self, scenarios):
+        return self._request('POST', '/batch', {'scenarios': scenarios})
+
+    def reset(self, config_overrides=None, csv_path=None):
+        return self._request('POST', '/reset', {'config_overrides': config_overrides, 'csv_path': csv_path})
+
+    def shutdown(self):
+        return self._request('POST', '/shutdown', {})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the resident scheduling daemon")
+    parser.add_argument("--csv", type=str, default=None, help="Orders CSV loaded at startup")
+    parser.add_argument("--host", type=str, default="127.0.0.1",
+                        help="Listen address (loopback only unless --allow_remote)")
+    parser.add_argument("--allow_remote", action="store_true",
+                        help="Allow a non-loopback --host; requires at least one --csv_dir")
+    parser.add_argument("--csv_dir", action="append", default=None,
+                        help="Directory requests may read CSV files from (repeatable)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Listen port")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Batch worker processes (0 disables the pool)")
+    parser.add_argument("--verbose", action="store_true", help="Show scheduler console output")
+    args = parser.parse_args()
+
+    if not is_loopback_host(args.host):
+        if not args.allow_remote:
+            parser.error(f"--host {args.host} is not a loopback address; pass --allow_remote to listen on it")
+        if not args.csv_dir:
+            parser.error("--allow_remote requires at least one --csv_dir")
+
+    daemon = SchedulingDaemon(csv_path=args.csv, max_workers=args.workers, quiet=not args.verbose,
+                              allowed_csv_dirs=args.csv_dir)
+    serve(daemon, args.host, args.port, allow_remote=args.allow_remote)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,9 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from instrumentation import get_metrics
+from profiling import get_profiler
+from models.order import order_columns
 from models.schedule import Schedule
 
 
@@ -36,12 +39,21 @@ class Decoder:
         
         Args:
             chromosome: 染色体对象，包含 gene1 和 gene2
-            orders: 订单列表 (List[Order])
+            orders: 订单列表 (List[Order]) 或列式订单存储 (OrderStore)
             start_slot: 当前规划窗口在全局时间轴的起点（1-based）
             
         Returns:
             Schedule: 调度方案对象，包含 y_{o,l,t} 分配结果
         """
+        metrics = get_metrics(self.config)
+        profiler = get_profiler(self.config)
+        if not (metrics.enabled or profiler.enabled):
+            return self._decode(chromosome, orders, start_slot)
+        with metrics.timer("decode"), profiler.phase("decode"):
+            return self._decode(chromosome, orders, start_slot)
+    
+    def _decode(self, chromosome, orders, start_slot):
+        """解码实现（见 decode）"""
         # 步骤1: 初始化调度方案
         schedule = Schedule()
         
@@ -51,16 +63,19 @@ class Decoder:
         )
         
         # 步骤3: 按 Gene2 中的订单优先级依次分配
-        # Gene2 存储的是订单索引（0-based），需要转换为实际订单对象
+        # Gene2 存储的是订单索引（0-based），按列读取订单字段（兼容 Order 列表与 OrderStore）
+        order_ids, products, quantities, release_slots, due_slots, _ = order_columns(orders)
+        num_orders = len(order_ids)
         for order_idx in chromosome.gene2:
             # 检查索引是否有效
-            if order_idx < 0 or order_idx >= len(orders):
+            if order_idx < 0 or order_idx >= num_orders:
                 continue
             
-            order = orders[order_idx]
-            order_id = order.order_id
-            target_product = order.product
-            remaining_demand = order.quantity
+            order_id = order_ids[order_idx]
+            target_product = products[order_idx]
+            remaining_demand = quantities[order_idx]
+            release_slot = release_slots[order_idx]
+            due_slot = due_slots[order_idx]
             
             # 3.2: 在所有满足条件的 slot 中按时间升序遍历
             # 收集所有可用的 (line, slot) 并按 slot 排序
@@ -71,7 +86,7 @@ class Decoder:
                 # 检查：产品匹配 && 有产能 && 在订单的时间窗口内 [release_slot, due_slot)
                 if (product == target_product and 
                     capacity > 0 and 
-                    order.release_slot <= slot < order.due_slot):
+                    release_slot <= slot < due_slot):
                     available_slots.append((slot, line, capacity))
             
             # 按时间升序排序
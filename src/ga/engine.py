@@ -3,16 +3,22 @@
 
 实现遗传算法的主流程控制。
 """
+import logging
 import random
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from logger import get_logger, logging_from_config
+from instrumentation import get_metrics
+from profiling import get_profiler
 from models.chromosome import Chromosome
 from ga.operators import GeneticOperators
 from ga.fitness import evaluate_chromosome
 from ga.island_engine import run_island_ga
 
+logger = get_logger(__name__)
+
 
 class GAEngine:
     """
@@ -21,7 +27,7 @@ class GAEngine:
     负责种群初始化、迭代进化、精英保留等核心流程。
     """
     
-    def __init__(self, config, orders, planning_horizon=None, start_slot=1):
+    def __init__(self, config, orders, planning_horizon=None, start_slot=1, seed_chromosomes=None):
         """
         初始化GA引擎
         
@@ -31,11 +37,15 @@ class GAEngine:
             planning_horizon: 规划时域（slot 数量），用于确定 Gene1 的长度；
                                若为空则根据订单数量估算。
             start_slot: 当前优化窗口的起始 slot（1-based），用于解码时对齐全局时间轴。
+            seed_chromosomes: 热启动种子个体列表（可选），初始化时替换部分随机个体。
         """
         self.config = config
         self.orders = orders
         self.planning_horizon = planning_horizon
         self.start_slot = start_slot
+        self.seed_chromosomes = seed_chromosomes or []
+        # 随机数生成器：默认使用全局 random，后台预优化等场景由 config.RNG 提供独立实例
+        self.rng = getattr(config, "RNG", None) or random
         self.population = []
         self.best_chromosome = None
     
@@ -64,11 +74,11 @@ class GAEngine:
         num_random = int(self.config.POPULATION_SIZE * 0.8)  # 80% 随机个体
         for _ in range(num_random):
             # 随机生成 Gene1 (0=空闲, 1/2/3=产品)
-            gene1 = [random.randint(0, self.config.NUM_PRODUCTS) for _ in range(gene1_length)]
+            gene1 = [self.rng.randint(0, self.config.NUM_PRODUCTS) for _ in range(gene1_length)]
             
             # 随机生成 Gene2 (订单排列)
             gene2 = list(range(num_orders))
-            random.shuffle(gene2)
+            self.rng.shuffle(gene2)
             
             chromosome = Chromosome(gene1=gene1, gene2=gene2)
             self.population.append(chromosome)
@@ -77,7 +87,7 @@ class GAEngine:
         num_heuristic = self.config.POPULATION_SIZE - num_random
         for _ in range(num_heuristic):
             # Gene1 随机生成
-            gene1 = [random.randint(0, self.config.NUM_PRODUCTS) for _ in range(gene1_length)]
+            gene1 = [self.rng.randint(0, self.config.NUM_PRODUCTS) for _ in range(gene1_length)]
             
             # Gene2 按截止日期排序
             order_indices = list(range(num_orders))
@@ -87,6 +97,14 @@ class GAEngine:
             chromosome = Chromosome(gene1=gene1, gene2=gene2)
             self.population.append(chromosome)
         
+        # 热启动：用种子个体替换种群头部的随机个体（编码长度不匹配的种子将被忽略）
+        seeds = [
+            seed for seed in self.seed_chromosomes
+            if len(seed.gene1) == gene1_length and sorted(seed.gene2) == list(range(num_orders))
+        ]
+        for i, seed in enumerate(seeds[:len(self.population)]):
+            self.population[i] = seed.copy()
+        
         # 计算初始种群的适应度
         for chromosome in self.population:
             chromosome.fitness = evaluate_chromosome(
@@ -110,28 +128,33 @@ class GAEngine:
         """
         best_fitness_history = []
         no_improvement_count = 0
+        metrics = get_metrics(self.config)
+        profiler = get_profiler(self.config)
         
         for generation in range(self.config.MAX_GENERATIONS):
-            # 选择父代
-            parents = self.select_parents()
-            
-            # 生成下一代
-            offspring = self.create_next_generation(parents)
-            
-            # 计算后代适应度
-            for child in offspring:
-                child.fitness = evaluate_chromosome(
-                    child, self.orders, self.config, start_slot=self.start_slot
-                )
-            
-            # 精英保留：按适应度排序，保留最优个体
-            self.population.sort(key=lambda x: x.fitness, reverse=True)
-            elite = self.population[:self.config.ELITE_SIZE]
-            
-            # 组合精英和后代，选择最优的个体进入下一代
-            combined = elite + offspring
-            combined.sort(key=lambda x: x.fitness, reverse=True)
-            self.population = combined[:self.config.POPULATION_SIZE]
+            with profiler.phase("ga_generation"):
+                with metrics.timer("ga.operators"):
+                    # 选择父代
+                    parents = self.select_parents()
+                    
+                    # 生成下一代
+                    offspring = self.create_next_generation(parents)
+                metrics.incr("ga.generations")
+                
+                # 计算后代适应度
+                for child in offspring:
+                    child.fitness = evaluate_chromosome(
+                        child, self.orders, self.config, start_slot=self.start_slot
+                    )
+                
+                # 精英保留：按适应度排序，保留最优个体
+                self.population.sort(key=lambda x: x.fitness, reverse=True)
+                elite = self.population[:self.config.ELITE_SIZE]
+                
+                # 组合精英和后代，选择最优的个体进入下一代
+                combined = elite + offspring
+                combined.sort(key=lambda x: x.fitness, reverse=True)
+                self.population = combined[:self.config.POPULATION_SIZE]
             
             # 记录当前最优解
             current_best = self.population[0]
@@ -143,15 +166,21 @@ class GAEngine:
             
             best_fitness_history.append(self.best_chromosome.fitness)
             
-            # 打印进度（每10代）
-            if (generation + 1) % 10 == 0:
-                print(f"第 {generation + 1}/{self.config.MAX_GENERATIONS} 代, "
-                      f"最优适应度: {self.best_chromosome.fitness:.2f}, "
-                      f"平均适应度: {sum(ind.fitness for ind in self.population) / len(self.population):.2f}")
+            callback = getattr(self.config, "GENERATION_CALLBACK", None)
+            if callback is not None:
+                callback(generation + 1, self.best_chromosome.fitness)
+            
+            # 打印进度（每10代）；日志未开启时不计算平均适应度
+            if (generation + 1) % 10 == 0 and logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    "第 %d/%d 代, 最优适应度: %.2f, 平均适应度: %.2f",
+                    generation + 1, self.config.MAX_GENERATIONS, self.best_chromosome.fitness,
+                    sum(ind.fitness for ind in self.population) / len(self.population)
+                )
             
             # 终止条件：连续多代无改善
             if no_improvement_count >= 20:
-                print(f"第 {generation + 1} 代提前终止，因为没有改善")
+                logger.info("第 %d 代提前终止，因为没有改善", generation + 1)
                 break
         
         self.fitness_history = best_fitness_history
@@ -171,7 +200,7 @@ class GAEngine:
         """
         parents = []
         for _ in range(self.config.POPULATION_SIZE):
-            parent = GeneticOperators.tournament_selection(self.population, tournament_size=3)
+            parent = GeneticOperators.tournament_selection(self.population, tournament_size=3, rng=self.rng)
             parents.append(parent)
         return parents
     
@@ -194,11 +223,11 @@ class GAEngine:
             parent2 = parents[i + 1]
             
             # 交叉操作
-            if random.random() < self.config.CROSSOVER_RATE:
+            if self.rng.random() < self.config.CROSSOVER_RATE:
                 # Gene1 交叉
-                child1_gene1, child2_gene1 = GeneticOperators.crossover_gene1(parent1, parent2)
+                child1_gene1, child2_gene1 = GeneticOperators.crossover_gene1(parent1, parent2, rng=self.rng)
                 # Gene2 交叉
-                child1_gene2, child2_gene2 = GeneticOperators.crossover_gene2(parent1, parent2)
+                child1_gene2, child2_gene2 = GeneticOperators.crossover_gene2(parent1, parent2, rng=self.rng)
                 
                 child1 = Chromosome(gene1=child1_gene1, gene2=child1_gene2)
                 child2 = Chromosome(gene1=child2_gene1, gene2=child2_gene2)
@@ -208,11 +237,11 @@ class GAEngine:
                 child2 = parent2.copy()
             
             # 变异操作
-            GeneticOperators.mutate_gene1(child1, self.config.MUTATION_RATE, self.config.NUM_PRODUCTS)
-            GeneticOperators.mutate_gene2(child1, self.config.MUTATION_RATE)
+            GeneticOperators.mutate_gene1(child1, self.config.MUTATION_RATE, self.config.NUM_PRODUCTS, rng=self.rng)
+            GeneticOperators.mutate_gene2(child1, self.config.MUTATION_RATE, rng=self.rng)
             
-            GeneticOperators.mutate_gene1(child2, self.config.MUTATION_RATE, self.config.NUM_PRODUCTS)
-            GeneticOperators.mutate_gene2(child2, self.config.MUTATION_RATE)
+            GeneticOperators.mutate_gene1(child2, self.config.MUTATION_RATE, self.config.NUM_PRODUCTS, rng=self.rng)
+            GeneticOperators.mutate_gene2(child2, self.config.MUTATION_RATE, rng=self.rng)
             
             offspring.append(child1)
             offspring.append(child2)
@@ -232,7 +261,7 @@ class GAEngine:
 
 
 # 便捷函数：供外部直接调用
-def run_ga(orders, config, planning_horizon=None, start_slot=1):
+def run_ga(orders, config, planning_horizon=None, start_slot=1, seed_chromosomes=None):
     """
     运行遗传算法（便捷函数）
     
@@ -244,6 +273,7 @@ def run_ga(orders, config, planning_horizon=None, start_slot=1):
         planning_horizon: 规划时域（slot 数量），控制 Gene1 长度；
                           若为 None 则由 GAEngine 自动估算。
         start_slot: 规划窗口的起始 slot（1-based），保证解码后的 slot 与全局时间线对齐。
+        seed_chromosomes: 热启动种子个体列表（可选），例如次日预优化的结果。
         
     Returns:
         Chromosome: 最优染色体
@@ -255,6 +285,12 @@ def run_ga(orders, config, planning_horizon=None, start_slot=1):
         >>> best_solution = run_ga(orders, config)
         >>> print(f"Best fitness: {best_solution.fitness}")
     """
+    with logging_from_config(config):
+        return _run_ga(orders, config, planning_horizon, start_slot, seed_chromosomes)
+
+
+def _run_ga(orders, config, planning_horizon, start_slot, seed_chromosomes):
+    """run_ga 的实现（日志级别由 run_ga 按配置设置）"""
     # 判断是否启用岛模型 GA（NUM_ISLANDS > 1 时才真正走多岛路径）
     enable_island = bool(getattr(config, "ENABLE_ISLAND_GA", False))
     num_islands = int(getattr(config, "NUM_ISLANDS", 1))
@@ -265,38 +301,41 @@ def run_ga(orders, config, planning_horizon=None, start_slot=1):
             config,
             planning_horizon=planning_horizon,
             start_slot=start_slot,
+            seed_chromosomes=seed_chromosomes,
         )
 
-    print("="*60)
-    print("启动遗传算法...")
-    print(f"种群规模: {config.POPULATION_SIZE}")
-    print(f"最大迭代次数: {config.MAX_GENERATIONS}")
-    print(f"交叉率: {config.CROSSOVER_RATE}")
-    print(f"变异率: {config.MUTATION_RATE}")
-    print(f"精英个体数: {config.ELITE_SIZE}")
-    print(f"订单数量: {len(orders)}")
-    print(f"规划窗口: 从 slot {start_slot} 开始，长度 {planning_horizon or '自动估算'}")
-    print("="*60)
+    logger.info("="*60)
+    logger.info("启动遗传算法...")
+    logger.info("种群规模: %s", config.POPULATION_SIZE)
+    logger.info("最大迭代次数: %s", config.MAX_GENERATIONS)
+    logger.info("交叉率: %s", config.CROSSOVER_RATE)
+    logger.info("变异率: %s", config.MUTATION_RATE)
+    logger.info("精英个体数: %s", config.ELITE_SIZE)
+    logger.info("订单数量: %d", len(orders))
+    logger.info("规划窗口: 从 slot %s 开始，长度 %s", start_slot, planning_horizon or '自动估算')
+    logger.info("="*60)
     
     # 创建 GA 引擎（单种群模式）
     ga_engine = GAEngine(
-        config, orders, planning_horizon=planning_horizon, start_slot=start_slot
+        config, orders, planning_horizon=planning_horizon, start_slot=start_slot,
+        seed_chromosomes=seed_chromosomes,
     )
     
     # 初始化种群
-    print("\n初始化种群...")
+    logger.info("\n初始化种群...")
     ga_engine.initialize_population()
-    print(f"初始种群已创建，共 {len(ga_engine.population)} 个个体")
-    print(f"初始最优适应度: {max(ind.fitness for ind in ga_engine.population):.2f}")
+    logger.info("初始种群已创建，共 %d 个个体", len(ga_engine.population))
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("初始最优适应度: %.2f", max(ind.fitness for ind in ga_engine.population))
     
     # 执行进化
-    print("\n开始进化...\n")
+    logger.info("\n开始进化...\n")
     best_chromosome = ga_engine.evolve()
     
     # 输出结果
-    print("\n" + "="*60)
-    print("遗传算法完成!")
-    print(f"最优适应度: {best_chromosome.fitness:.2f}")
-    print("="*60)
+    logger.info("\n" + "="*60)
+    logger.info("遗传算法完成!")
+    logger.info("最优适应度: %.2f", best_chromosome.fitness)
+    logger.info("="*60)
     
     return best_chromosome
@@ -7,6 +7,7 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from instrumentation import get_metrics
 from ga.decoder import Decoder
 
 
@@ -40,6 +41,15 @@ class FitnessEvaluator:
         Returns:
             float: 适应度值（总利润）
         """
+        metrics = get_metrics(self.config)
+        if not metrics.enabled:
+            return self._evaluate(chromosome, orders, start_slot)
+        metrics.incr("evaluations")
+        with metrics.timer("evaluate"):
+            return self._evaluate(chromosome, orders, start_slot)
+    
+    def _evaluate(self, chromosome, orders, start_slot):
+        """适应度计算实现（见 evaluate）"""
         # 步骤1: 解码染色体，获取调度方案
         schedule = self.decoder.decode(chromosome, orders, start_slot=start_slot)
         
@@ -16,15 +16,20 @@ import random
 # 将 src 目录加入路径，保持与其他 GA 模块一致的导入方式
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from logger import get_logger
+from instrumentation import get_metrics
+from profiling import get_profiler
 from models.chromosome import Chromosome
 from ga.operators import GeneticOperators
 from ga.fitness import evaluate_chromosome
 
+logger = get_logger(__name__)
+
 
 class IslandGAEngine:
     """岛模型遗传算法引擎"""
 
-    def __init__(self, config, orders, planning_horizon=None, start_slot=1):
+    def __init__(self, config, orders, planning_horizon=None, start_slot=1, seed_chromosomes=None):
         """初始化岛模型 GA 引擎
 
         Args:
@@ -32,11 +37,15 @@ class IslandGAEngine:
             orders: 订单列表
             planning_horizon: 规划时域（slot 数量），用于确定 Gene1 的长度；
             start_slot: 当前优化窗口在全局时间轴上的起始 slot（1-based）
+            seed_chromosomes: 热启动种子个体列表（可选），注入到每个岛
         """
         self.config = config
         self.orders = orders
         self.planning_horizon = planning_horizon
         self.start_slot = start_slot
+        self.seed_chromosomes = seed_chromosomes or []
+        # 随机数生成器：默认使用全局 random，后台预优化等场景由 config.RNG 提供独立实例
+        self.rng = getattr(config, "RNG", None) or random
 
         self.islands = []  # List[List[Chromosome]]
         self.best_chromosome = None
@@ -87,11 +96,11 @@ class IslandGAEngine:
             # 随机个体：Gene1/Gene2 完全随机
             for _ in range(num_random):
                 gene1 = [
-                    random.randint(0, self.config.NUM_PRODUCTS)
+                    self.rng.randint(0, self.config.NUM_PRODUCTS)
                     for _ in range(gene1_length)
                 ]
                 gene2 = list(range(num_orders))
-                random.shuffle(gene2)
+                self.rng.shuffle(gene2)
                 population.append(Chromosome(gene1=gene1, gene2=gene2))
 
             # 启发式个体：Gene2 按截止时间排序（EDD），Gene1 仍随机
@@ -100,12 +109,21 @@ class IslandGAEngine:
                 order_indices.sort(key=lambda i: self.orders[i].due_slot)
                 for _ in range(num_heuristic):
                     gene1 = [
-                        random.randint(0, self.config.NUM_PRODUCTS)
+                        self.rng.randint(0, self.config.NUM_PRODUCTS)
                         for _ in range(gene1_length)
                     ]
                     gene2 = order_indices.copy()
                     population.append(Chromosome(gene1=gene1, gene2=gene2))
 
+            # 热启动：每个岛都注入种子个体，替换头部的随机个体
+            seeds = [
+                seed for seed in self.seed_chromosomes
+                if len(seed.gene1) == gene1_length
+                and sorted(seed.gene2) == list(range(num_orders))
+            ]
+            for i, seed in enumerate(seeds[: len(population)]):
+                population[i] = seed.copy()
+
             # 计算初始适应度
             for chrom in population:
                 chrom.fitness = evaluate_chromosome(
@@ -140,7 +158,7 @@ class IslandGAEngine:
 
         for _ in range(len(population)):
             parent = GeneticOperators.tournament_selection(
-                population, tournament_size=tournament_size
+                population, tournament_size=tournament_size, rng=self.rng
             )
             parents.append(parent)
         return parents
@@ -154,12 +172,12 @@ class IslandGAEngine:
             parent2 = parents[i + 1]
 
             # 交叉
-            if random.random() < self.config.CROSSOVER_RATE:
+            if self.rng.random() < self.config.CROSSOVER_RATE:
                 child1_gene1, child2_gene1 = GeneticOperators.crossover_gene1(
-                    parent1, parent2
+                    parent1, parent2, rng=self.rng
                 )
                 child1_gene2, child2_gene2 = GeneticOperators.crossover_gene2(
-                    parent1, parent2
+                    parent1, parent2, rng=self.rng
                 )
                 child1 = Chromosome(gene1=child1_gene1, gene2=child1_gene2)
                 child2 = Chromosome(gene1=child2_gene1, gene2=child2_gene2)
@@ -169,14 +187,14 @@ class IslandGAEngine:
 
             # 变异
             GeneticOperators.mutate_gene1(
-                child1, mutation_rate, self.config.NUM_PRODUCTS
+                child1, mutation_rate, self.config.NUM_PRODUCTS, rng=self.rng
             )
-            GeneticOperators.mutate_gene2(child1, mutation_rate)
+            GeneticOperators.mutate_gene2(child1, mutation_rate, rng=self.rng)
 
             GeneticOperators.mutate_gene1(
-                child2, mutation_rate, self.config.NUM_PRODUCTS
+                child2, mutation_rate, self.config.NUM_PRODUCTS, rng=self.rng
             )
-            GeneticOperators.mutate_gene2(child2, mutation_rate)
+            GeneticOperators.mutate_gene2(child2, mutation_rate, rng=self.rng)
 
             offspring.append(child1)
             offspring.append(child2)
@@ -227,7 +245,7 @@ class IslandGAEngine:
             self.islands[dst_index] = new_pop
 
         if getattr(self.config, "DEBUG_ISLAND_GA", False):
-            print("[IslandGA] 执行一次精英迁移")
+            logger.info("[IslandGA] 执行一次精英迁移")
 
     # ---------------------- 进化主过程 ----------------------
 
@@ -239,37 +257,43 @@ class IslandGAEngine:
         num_islands = len(self.islands)
         if num_islands == 0:
             return None
+        metrics = get_metrics(self.config)
+        profiler = get_profiler(self.config)
 
         for generation in range(max_generations):
-            # 岛内独立进化
-            for island_index in range(num_islands):
-                population = self.islands[island_index]
-                if not population:
-                    continue
-
-                island_type = self._get_island_type(island_index)
-                parents = self._select_parents_for_island(population, island_type)
-                offspring = self._create_offspring_for_island(parents, island_type)
-
-                # 计算后代适应度
-                for child in offspring:
-                    child.fitness = evaluate_chromosome(
-                        child, self.orders, self.config, start_slot=self.start_slot
-                    )
-
-                # 精英保留 + 重新选择
-                population.sort(key=lambda c: c.fitness, reverse=True)
-                elite_size = getattr(self.config, "ELITE_SIZE", 5)
-                elite = population[:elite_size]
-
-                combined = elite + offspring
-                combined.sort(key=lambda c: c.fitness, reverse=True)
-                self.islands[island_index] = combined[: self.config.POPULATION_SIZE]
-
-            # 精英迁移
-            interval = int(getattr(self.config, "ISLAND_MIGRATION_INTERVAL", 20))
-            if interval > 0 and (generation + 1) % interval == 0:
-                self._migrate_elite()
+            with profiler.phase("ga_generation"):
+                # 岛内独立进化
+                for island_index in range(num_islands):
+                    population = self.islands[island_index]
+                    if not population:
+                        continue
+
+                    island_type = self._get_island_type(island_index)
+                    with metrics.timer("ga.operators"):
+                        parents = self._select_parents_for_island(population, island_type)
+                        offspring = self._create_offspring_for_island(parents, island_type)
+
+                    # 计算后代适应度
+                    for child in offspring:
+                        child.fitness = evaluate_chromosome(
+                            child, self.orders, self.config, start_slot=self.start_slot
+                        )
+
+                    # 精英保留 + 重新选择
+                    population.sort(key=lambda c: c.fitness, reverse=True)
+                    elite_size = getattr(self.config, "ELITE_SIZE", 5)
+                    elite = population[:elite_size]
+
+                    combined = elite + offspring
+                    combined.sort(key=lambda c: c.fitness, reverse=True)
+                    self.islands[island_index] = combined[: self.config.POPULATION_SIZE]
+                metrics.incr("ga.generations")
+
+                # 精英迁移
+                interval = int(getattr(self.config, "ISLAND_MIGRATION_INTERVAL", 20))
+                if interval > 0 and (generation + 1) % interval == 0:
+                    with metrics.timer("island.migration"):
+                        self._migrate_elite()
 
             # 更新全局最优解
             generation_best = None
@@ -286,19 +310,20 @@ class IslandGAEngine:
                     no_improvement_count += 1
             if self.best_chromosome is not None:
                 self.global_best_history.append(self.best_chromosome.fitness)
+                callback = getattr(self.config, "GENERATION_CALLBACK", None)
+                if callback is not None:
+                    callback(generation + 1, self.best_chromosome.fitness)
 
             if getattr(self.config, "DEBUG_ISLAND_GA", False) and (generation + 1) % 10 == 0:
-                print(
-                    f"[IslandGA] 第 {generation + 1}/{max_generations} 代, "
-                    f"全局最优适应度: {self.best_chromosome.fitness:.2f}"
+                logger.info(
+                    "[IslandGA] 第 %d/%d 代, 全局最优适应度: %.2f",
+                    generation + 1, max_generations, self.best_chromosome.fitness
                 )
 
             # 提前终止条件：连续多代无改善（与单种群 GA 对齐，使用 20 代）
             if no_improvement_count >= 20:
                 if getattr(self.config, "DEBUG_ISLAND_GA", False):
-                    print(
-                        f"[IslandGA] 第 {generation + 1} 代提前终止 (连续20代无改善)"
-                    )
+                    logger.info("[IslandGA] 第 %d 代提前终止 (连续20代无改善)", generation + 1)
                 break
 
         return self.best_chromosome
@@ -307,7 +332,7 @@ class IslandGAEngine:
         return getattr(self, "global_best_history", [])
 
 
-def run_island_ga(orders, config, planning_horizon=None, start_slot=1):
+def run_island_ga(orders, config, planning_horizon=None, start_slot=1, seed_chromosomes=None):
     """便捷函数：运行岛模型并行遗传算法
 
     Args:
@@ -315,44 +340,47 @@ def run_island_ga(orders, config, planning_horizon=None, start_slot=1):
         config: 配置对象
         planning_horizon: 规划时域（slot 数量）
         start_slot: 当前规划窗口的起始 slot（1-based）
+        seed_chromosomes: 热启动种子个体列表（可选）
 
     Returns:
         Chromosome: 全局最优染色体
     """
-    print("=" * 60)
-    print("启动岛模型并行遗传算法...")
-    print(f"岛数量: {getattr(config, 'NUM_ISLANDS', 1)}")
-    print(f"种群规模: {config.POPULATION_SIZE}")
-    print(f"最大迭代次数: {config.MAX_GENERATIONS}")
-    print(f"交叉率: {config.CROSSOVER_RATE}")
-    print(f"变异率: {config.MUTATION_RATE}")
-    print(f"精英个体数: {config.ELITE_SIZE}")
-    print(f"订单数量: {len(orders)}")
-    print(f"规划窗口: 从 slot {start_slot} 开始，长度 {planning_horizon or '自动估算'}")
-    print("=" * 60)
+    logger.info("=" * 60)
+    logger.info("启动岛模型并行遗传算法...")
+    logger.info("岛数量: %s", getattr(config, 'NUM_ISLANDS', 1))
+    logger.info("种群规模: %s", config.POPULATION_SIZE)
+    logger.info("最大迭代次数: %s", config.MAX_GENERATIONS)
+    logger.info("交叉率: %s", config.CROSSOVER_RATE)
+    logger.info("变异率: %s", config.MUTATION_RATE)
+    logger.info("精英个体数: %s", config.ELITE_SIZE)
+    logger.info("订单数量: %d", len(orders))
+    logger.info("规划窗口: 从 slot %s 开始，长度 %s", start_slot, planning_horizon or '自动估算')
+    logger.info("=" * 60)
 
     engine = IslandGAEngine(
-        config, orders, planning_horizon=planning_horizon, start_slot=start_slot
+        config,
+        orders,
+        planning_horizon=planning_horizon,
+        start_slot=start_slot,
+        seed_chromosomes=seed_chromosomes,
     )
 
-    print("\n初始化各岛种群...")
+    logger.info("\n初始化各岛种群...")
     engine.initialize_islands()
 
     # 打印初始全局最优
     if engine.best_chromosome is not None:
-        print(
-            f"初始全局最优适应度: {engine.best_chromosome.fitness:.2f}"
-        )
+        logger.info("初始全局最优适应度: %.2f", engine.best_chromosome.fitness)
 
-    print("\n开始多岛并行进化...\n")
+    logger.info("\n开始多岛并行进化...\n")
     best_chromosome = engine.evolve()
 
-    print("\n" + "=" * 60)
-    print("岛模型遗传算法完成!")
+    logger.info("\n" + "=" * 60)
+    logger.info("岛模型遗传算法完成!")
     if best_chromosome is not None:
-        print(f"最优适应度: {best_chromosome.fitness:.2f}")
+        logger.info("最优适应度: %.2f", best_chromosome.fitness)
     else:
-        print("警告: 未获得有效解")
-    print("=" * 60)
+        logger.warning("警告: 未获得有效解")
+    logger.info("=" * 60)
 
     return best_chromosome
@@ -16,10 +16,11 @@ class GeneticOperators:
     遗传操作算子类
     
     提供选择、交叉、变异等遗传算法基本操作。
+    各算子的 rng 参数为随机数生成器（random.Random 实例），默认使用全局 random 模块。
     """
     
     @staticmethod
-    def tournament_selection(population, tournament_size=3):
+    def tournament_selection(population, tournament_size=3, rng=random):
         """
         锦标赛选择
         
@@ -37,13 +38,13 @@ class GeneticOperators:
         
         # 随机选取 tournament_size 个个体
         tournament_size = min(tournament_size, len(population))
-        tournament = random.sample(population, tournament_size)
+        tournament = rng.sample(population, tournament_size)
         
         # 返回适应度最高的个体
         return max(tournament, key=lambda x: x.fitness)
     
     @staticmethod
-    def roulette_selection(population):
+    def roulette_selection(population, rng=random):
         """
         轮盘赌选择（适应度比例选择）
         
@@ -70,10 +71,10 @@ class GeneticOperators:
         
         if total_fitness <= 0:
             # 如果总适应度为0，随机选择
-            return random.choice(population)
+            return rng.choice(population)
         
         # 轮盘赌选择
-        pick = random.uniform(0, total_fitness)
+        pick = rng.uniform(0, total_fitness)
         current = 0
         for i, ind in enumerate(population):
             current += adjusted_fitness[i]
@@ -84,7 +85,7 @@ class GeneticOperators:
         return population[-1]
     
     @staticmethod
-    def crossover_gene1(parent1, parent2):
+    def crossover_gene1(parent1, parent2, rng=random):
         """
         Gene1的交叉操作（单点交叉）
         
@@ -105,7 +106,7 @@ class GeneticOperators:
             return parent1.gene1[:], parent2.gene1[:]
         
         # 随机选择交叉点
-        crossover_point = random.randint(1, length - 1)
+        crossover_point = rng.randint(1, length - 1)
         
         # 生成子代
         child1_gene1 = parent1.gene1[:crossover_point] + parent2.gene1[crossover_point:]
@@ -114,7 +115,7 @@ class GeneticOperators:
         return child1_gene1, child2_gene1
     
     @staticmethod
-    def crossover_gene2_ox(parent1, parent2):
+    def crossover_gene2_ox(parent1, parent2, rng=random):
         """
         Gene2的OX（顺序交叉）操作
         
@@ -135,8 +136,8 @@ class GeneticOperators:
             return parent1.gene2[:], parent2.gene2[:]
         
         # 随机选择两个交叉点
-        point1 = random.randint(0, length - 1)
-        point2 = random.randint(0, length - 1)
+        point1 = rng.randint(0, length - 1)
+        point2 = rng.randint(0, length - 1)
         if point1 > point2:
             point1, point2 = point2, point1
         
@@ -164,7 +165,7 @@ class GeneticOperators:
         return child1, child2
     
     @staticmethod
-    def crossover_gene2(parent1, parent2):
+    def crossover_gene2(parent1, parent2, rng=random):
         """
         Gene2的交叉操作（默认使用OX交叉）
         
@@ -175,10 +176,10 @@ class GeneticOperators:
         Returns:
             tuple: (子代1_gene2, 子代2_gene2)
         """
-        return GeneticOperators.crossover_gene2_ox(parent1, parent2)
+        return GeneticOperators.crossover_gene2_ox(parent1, parent2, rng=rng)
     
     @staticmethod
-    def mutate_gene1(chromosome, mutation_rate, num_products=3):
+    def mutate_gene1(chromosome, mutation_rate, num_products=3, rng=random):
         """
         Gene1的变异操作
         
@@ -190,12 +191,12 @@ class GeneticOperators:
             num_products: 产品种类数，默认3
         """
         for i in range(len(chromosome.gene1)):
-            if random.random() < mutation_rate:
+            if rng.random() < mutation_rate:
                 # 随机选择一个新的产品类型 (0=空闲, 1/2/3=产品)
-                chromosome.gene1[i] = random.randint(0, num_products)
+                chromosome.gene1[i] = rng.randint(0, num_products)
     
     @staticmethod
-    def mutate_gene2(chromosome, mutation_rate):
+    def mutate_gene2(chromosome, mutation_rate, rng=random):
         """
         Gene2的变异操作（swap 交换变异）
         
@@ -208,10 +209,10 @@ class GeneticOperators:
         if len(chromosome.gene2) < 2:
             return
         
-        if random.random() < mutation_rate:
+        if rng.random() < mutation_rate:
             # 随机选择两个不同的位置
-            idx1 = random.randint(0, len(chromosome.gene2) - 1)
-            idx2 = random.randint(0, len(chromosome.gene2) - 1)
+            idx1 = rng.randint(0, len(chromosome.gene2) - 1)
+            idx2 = rng.randint(0, len(chromosome.gene2) - 1)
             
             # 交换
             chromosome.gene2[idx1], chromosome.gene2[idx2] = chromosome.gene2[idx2], chromosome.gene2[idx1]
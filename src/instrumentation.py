@@ -0,0 +1,214 @@
+"""
+优化过程指标采集模块
+
+MetricsRegistry 记录一次运行中的计数（适应度评估次数、局部搜索接受/拒绝次数等）、
+耗时（解码、遗传算子、迁移等）以及每天各阶段的耗时，可导出为 JSON 供调参分析。
+
+注册表通过配置对象传递（config.METRICS）；未设置时各模块拿到的是空实现
+NULL_METRICS，所有调用均为空操作，热点路径上只多一次属性判断。
+"""
+import json
+import time
+import threading
+from collections import defaultdict
+
+
+class _Timer:
+    """计时上下文：退出时将耗时累加到注册表"""
+
+    __slots__ = ('_registry', '_name', '_phase', '_start')
+
+    def __init__(self, registry, name, phase):
+        self._registry = registry
+        self._name = name
+        self._phase = phase
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter() - self._start
+        self._registry.add_time(self._name, elapsed)
+        if self._phase:
+            self._registry.record_phase(self._name, elapsed)
+        return False
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class MetricsRegistry:
+    """
+    指标注册表
+
+    计数与耗时按名称累加（如 "evaluations"、"ls.accepted"、"decode"），
+    阶段耗时另外按天记录（begin_day 之后的 phase 计时归入当天）。
+    所有更新在锁内完成，后台预优化线程写入时也不会丢失计数。
+    """
+
+    enabled = True
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def __getstate__(self):
+        # 锁不可序列化（调度器快照、结果缓存会连同配置一起 pickle）
+        state = dict(self.__dict__)
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def reset(self):
+        """清空全部指标"""
+        with self._lock:
+            self.counters = defaultdict(int)
+            self.timers = defaultdict(float)
+            self.timer_counts = defaultdict(int)
+            self.days = []
+            self._current_day = None
+
+    def incr(self, name, value=1):
+        """计数器累加"""
+        with self._lock:
+            self.counters[name] += value
+
+    def add_time(self, name, seconds):
+        """耗时累加（秒）"""
+        with self._lock:
+            self.timers[name] += seconds
+            self.timer_counts[name] += 1
+
+    def timer(self, name):
+        """
+        计时上下文管理器
+
+        Example:
+            >>> with metrics.timer("decode"):
+            ...     schedule = decoder.decode(chromosome, orders)
+        """
+        return _Timer(self, name, False)
+
+    def phase(self, name):
+        """阶段计时：同时累加总耗时并记入当天的阶段耗时"""
+        return _Timer(self, f"phase.{name}", True)
+
+    def begin_day(self, day):
+        """
+        开始记录新一天的阶段耗时
+
+        Args:
+            day: 天数索引（0-based）
+        """
+        with self._lock:
+            self._current_day = {'day': day + 1, 'phases': {}}
+            self.days.append(self._current_day)
+
+    def record_phase(self, name, seconds):
+        with self._lock:
+            if self._current_day is not None:
+                phases = self._current_day['phases']
+                key = name[len("phase."):] if name.startswith("phase.") else name
+                phases[key] = phases.get(key, 0.0) + seconds
+
+    def snapshot(self):
+        """
+        导出当前指标（可直接 JSON 序列化）
+
+        Returns:
+            dict: counters、timers（total_s / count / mean_ms）、derived（派生指标）、days
+        """
+        with self._lock:
+            counters = dict(self.counters)
+            timers = {
+                name: {
+                    'total_s': total,
+                    'count': self.timer_counts[name],
+                    'mean_ms': total / self.timer_counts[name] * 1000.0 if self.timer_counts[name] else 0.0,
+                }
+                for name, total in self.timers.items()
+            }
+            days = [{'day': d['day'], 'phases': dict(d['phases'])} for d in self.days]
+
+        derived = {}
+        evaluations = counters.get('evaluations', 0)
+        evaluate_time = timers.get('evaluate', {}).get('total_s', 0.0)
+        if evaluations and evaluate_time > 0:
+            derived['evaluations_per_sec'] = evaluations / evaluate_time
+        # 退火接受的劣解也计为接受
+        accepted = counters.get('ls.accepted', 0) + counters.get('ls.accepted_worse', 0)
+        rejected = counters.get('ls.rejected', 0)
+        if accepted + rejected:
+            derived['ls_accept_rate'] = accepted / (accepted + rejected)
+        return {'counters': counters, 'timers': timers, 'derived': derived, 'days': days}
+
+    def to_json(self, path=None):
+        """
+        导出为 JSON
+
+        Args:
+            path: 输出文件路径（可选），为 None 时只返回字符串
+
+        Returns:
+            str: JSON 文本
+        """
+        text = json.dumps(self.snapshot(), ensure_ascii=False, indent=2)
+        if path is not None:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(text)
+        return text
+
+
+class _NullMetrics:
+    """未启用指标采集时的空实现"""
+
+    enabled = False
+
+    def incr(self, name, value=1):
+        pass
+
+    def add_time(self, name, seconds):
+        pass
+
+    def timer(self, name):
+        return _NULL_TIMER
+
+    def phase(self, name):
+        return _NULL_TIMER
+
+    def begin_day(self, day):
+        pass
+
+    def record_phase(self, name, seconds):
+        pass
+
+
+NULL_METRICS = _NullMetrics()
+
+
+def get_metrics(config):
+    """
+    获取配置对象上的指标注册表
+
+    Args:
+        config: 配置对象
+
+    Returns:
+        MetricsRegistry: config.METRICS，未设置时返回空实现 NULL_METRICS
+    """
+    metrics = getattr(config, "METRICS", None)
+    return metrics if metrics is not None else NULL_METRICS
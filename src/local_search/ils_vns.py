@@ -8,10 +8,14 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from logger import get_logger, logging_from_config
+from instrumentation import get_metrics
 from models.chromosome import Chromosome
 from ga.fitness import evaluate_chromosome, FitnessEvaluator
 from ga.decoder import Decoder
 
+logger = get_logger(__name__)
+
 
 class LocalSearch:
     """
@@ -62,11 +66,16 @@ class LocalSearch:
 
         max_iter = self.config.MAX_LS_ITERATIONS
         no_improvement_count = 0
+        metrics = get_metrics(self.config)
+        metrics.incr("ls.runs")
 
-        print(f"\n启动局部搜索 (ILS/VNS)...")
-        print(f"初始适应度: {current_best.fitness:.2f}")
+        logger.info("\n启动局部搜索 (ILS/VNS)...")
+        logger.info("初始适应度: %.2f", current_best.fitness)
+        cancel_check = getattr(self.config, "CANCEL_CHECK", None)
 
         for iteration in range(max_iter):
+            if cancel_check is not None:
+                cancel_check()
             # 随机选择邻域操作
             neighborhood_type = random.choice(["N1", "N2"])
 
@@ -82,23 +91,26 @@ class LocalSearch:
             )
 
             # 判断是否接受新解（贪心策略）
+            metrics.incr("ls.iterations")
             if self.accept_solution(current_best.fitness, new_solution.fitness):
+                metrics.incr("ls.accepted")
                 current_best = new_solution
                 no_improvement_count = 0
-                print(
-                    f"  第 {iteration + 1} 次迭代: 改善! 新适应度: {current_best.fitness:.2f} "
-                    f"(使用 {neighborhood_type})"
+                logger.debug(
+                    "  第 %d 次迭代: 改善! 新适应度: %.2f (使用 %s)",
+                    iteration + 1, current_best.fitness, neighborhood_type
                 )
             else:
+                metrics.incr("ls.rejected")
                 no_improvement_count += 1
 
             # 早停：连续多次无改善（保持与旧实现一致）
             if no_improvement_count >= 10:
-                print(f"  第 {iteration + 1} 次迭代提前终止 (连续10次无改善)")
+                logger.info("  第 %d 次迭代提前终止 (连续10次无改善)", iteration + 1)
                 break
 
-        print(f"局部搜索完成。最终适应度: {current_best.fitness:.2f}")
-        print(f"改善程度: {current_best.fitness - initial_solution.fitness:.2f}\n")
+        logger.info("局部搜索完成。最终适应度: %.2f", current_best.fitness)
+        logger.info("改善程度: %.2f\n", current_best.fitness - initial_solution.fitness)
 
         return current_best
 
@@ -123,14 +135,19 @@ class LocalSearch:
         decay = float(getattr(self.config, "ANNEALING_DECAY_RATE", 0.95))
         p_min = float(getattr(self.config, "ANNEALING_MIN_ACCEPT_PROB", 0.01))
 
-        print(f"\n启动局部搜索 (ILS/VNS)...")
-        print("使用风险驱动局部搜索 + 受控退火接受策略")
-        print(f"初始适应度: {current_best.fitness:.2f}")
+        logger.info("\n启动局部搜索 (ILS/VNS)...")
+        logger.info("使用风险驱动局部搜索 + 受控退火接受策略")
+        logger.info("初始适应度: %.2f", current_best.fitness)
 
         evaluator = FitnessEvaluator(self.config)
         no_improvement_count = 0
+        metrics = get_metrics(self.config)
+        metrics.incr("ls.runs")
+        cancel_check = getattr(self.config, "CANCEL_CHECK", None)
 
         for iteration in range(max_iter):
+            if cancel_check is not None:
+                cancel_check()
             # 基于当前解构建调度方案与风险分数
             fitness_value, schedule = evaluator.evaluate_with_details(
                 current_best, orders, start_slot=start_slot
@@ -165,22 +182,25 @@ class LocalSearch:
                 p_min,
             )
 
+            metrics.incr("ls.iterations")
             if accepted:
                 delta = new_solution.fitness - current_best.fitness
+                metrics.incr("ls.accepted" if delta >= 0 else "ls.accepted_worse")
                 current_best = new_solution
                 no_improvement_count = 0
                 if delta >= 0:
-                    print(
-                        f"  第 {iteration + 1} 次迭代: 改善! 新适应度: {current_best.fitness:.2f} "
-                        f"(使用 {neighborhood_type})"
+                    logger.debug(
+                        "  第 %d 次迭代: 改善! 新适应度: %.2f (使用 %s)",
+                        iteration + 1, current_best.fitness, neighborhood_type
                     )
                 else:
                     if getattr(self.config, "DEBUG_RISK_LS", False):
-                        print(
-                            f"  第 {iteration + 1} 次迭代: 接受略差解 Δ={delta:.2f}, "
-                            f"当前退火接受概率≈{p_used:.3f} (使用 {neighborhood_type})"
+                        logger.info(
+                            "  第 %d 次迭代: 接受略差解 Δ=%.2f, 当前退火接受概率≈%.3f (使用 %s)",
+                            iteration + 1, delta, p_used, neighborhood_type
                         )
             else:
+                metrics.incr("ls.rejected")
                 no_improvement_count += 1
 
             # 调整退火概率
@@ -194,20 +214,19 @@ class LocalSearch:
                 )
                 top_k = sorted_risks[:5]
                 if top_k:
-                    print("  [RiskLS] 高风险订单Top列表 (order_id, risk):")
+                    logger.info("  [RiskLS] 高风险订单Top列表 (order_id, risk):")
                     for order_id, risk in top_k:
-                        print(f"    - {order_id}: {risk:.3f}")
+                        logger.info("    - %s: %.3f", order_id, risk)
 
             # 早停：连续多次未接受新解
             if no_improvement_count >= no_improvement_limit:
-                print(
-                    f"  第 {iteration + 1} 次迭代提前终止 "
-                    f"(连续{no_improvement_count}次未接受新解)"
+                logger.info(
+                    "  第 %d 次迭代提前终止 (连续%d次未接受新解)", iteration + 1, no_improvement_count
                 )
                 break
 
-        print(f"局部搜索完成。最终适应度: {current_best.fitness:.2f}")
-        print(f"改善程度: {current_best.fitness - initial_solution.fitness:.2f}\n")
+        logger.info("局部搜索完成。最终适应度: %.2f", current_best.fitness)
+        logger.info("改善程度: %.2f\n", current_best.fitness - initial_solution.fitness)
 
         return current_best
 
@@ -487,6 +506,6 @@ def improve_solution(chromosome, orders, config, start_slot=1):
         >>> improved_solution = improve_solution(ga_best, orders, config)
         >>> print(f"Improvement: {improved_solution.fitness - ga_best.fitness:.2f}")
     """
-    local_search = LocalSearch(config)
-    improved = local_search.optimize(chromosome, orders, start_slot=start_slot)
-    return improved
+    with logging_from_config(config):
+        local_search = LocalSearch(config)
+        return local_search.optimize(chromosome, orders, start_slot=start_slot)
@@ -0,0 +1,148 @@
+"""
+日志模块
+
+调度核心统一通过 get_logger 获取日志记录器，替代直接 print：
+消息采用 %-格式的惰性格式化（级别未开启时不做字符串格式化），
+支持按模块设置级别（如只看调度器汇总、屏蔽局部搜索逐步改进）。
+进程入口可用 configure_logging 设置一次；按配置运行的 GA 与滚动调度使用
+logging_from_config 作用域，运行结束后恢复原有级别。
+默认输出到标准输出、只打印消息本身，与原有控制台输出一致。
+"""
+import contextlib
+import logging
+import sys
+import threading
+
+ROOT_LOGGER_NAME = "scheduling"
+
+
+class _StdoutHandler(logging.StreamHandler):
+    """每次输出时使用当前的 sys.stdout（兼容 contextlib.redirect_stdout）"""
+
+    @property
+    def stream(self):
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+_root = logging.getLogger(ROOT_LOGGER_NAME)
+if not _root.handlers:
+    _handler = _StdoutHandler()
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    _root.addHandler(_handler)
+    _root.setLevel(logging.INFO)
+    _root.propagate = False
+
+
+def get_logger(name):
+    """
+    获取模块日志记录器
+
+    Args:
+        name: 模块名（通常传 __name__），如 "ga.engine"
+
+    Returns:
+        logging.Logger: 名为 "scheduling.<模块名>" 的日志记录器
+    """
+    if name.startswith("src."):
+        name = name[len("src."):]
+    return logging.getLogger(f"{ROOT_LOGGER_NAME}.{name}")
+
+
+def _to_level(level):
+    return logging.getLevelName(level.upper()) if isinstance(level, str) else level
+
+
+def configure_logging(level=None, module_levels=None, quiet=False):
+    """
+    设置日志级别
+
+    Args:
+        level: 全局级别（名称或数值），None 表示不修改
+        module_levels: 分模块级别 {模块名前缀: 级别}，如 {"local_search": "WARNING"}
+        quiet: 安静模式，全局级别设为 WARNING（优先于 level）
+    """
+    if quiet:
+        level = logging.WARNING
+    if level is not None:
+        _root.setLevel(_to_level(level))
+    for name, module_level in (module_levels or {}).items():
+        get_logger(name).setLevel(_to_level(module_level))
+
+
+_scope_lock = threading.Lock()
+_active_scopes = []  # 生效中的作用域设置，按进入顺序
+_base_levels = {}  # 第一个作用域进入前各日志记录器的级别 {名称: 级别}
+
+
+def _scope_settings(level, module_levels, quiet):
+    if quiet:
+        level = logging.WARNING
+    levels = {}
+    if level is not None:
+        levels[ROOT_LOGGER_NAME] = _to_level(level)
+    for name, module_level in (module_levels or {}).items():
+        levels[get_logger(name).name] = _to_level(module_level)
+    return levels
+
+
+def _apply_scope(levels):
+    for name, level in levels.items():
+        logger = logging.getLogger(name)
+        _base_levels.setdefault(name, logger.level)
+        logger.setLevel(level)
+
+
+@contextlib.contextmanager
+def logging_scope(level=None, module_levels=None, quiet=False):
+    """
+    在作用域内设置日志级别，退出时恢复
+
+    参数同 configure_logging。作用域可以嵌套，也可以在多个线程中交叉进入、退出：
+    退出时先恢复进入任何作用域之前的级别，再按进入顺序重新应用其余仍生效的作用域，
+    因此不会把某次运行的级别遗留给之后的运行。日志级别是进程全局的，
+    多个作用域同时生效期间以最后进入的为准。
+    """
+    levels = _scope_settings(level, module_levels, quiet)
+    if not levels:
+        yield
+        return
+    with _scope_lock:
+        _active_scopes.append(levels)
+        _apply_scope(levels)
+    try:
+        yield
+    finally:
+        with _scope_lock:
+            _active_scopes.remove(levels)
+            for name, base_level in _base_levels.items():
+                logging.getLogger(name).setLevel(base_level)
+            if _active_scopes:
+                for active in _active_scopes:
+                    _apply_scope(active)
+            else:
+                _base_levels.clear()
+
+
+def logging_from_config(config):
+    """
+    按配置对象（LOG_LEVEL / LOG_MODULE_LEVELS / QUIET）设置日志级别的作用域
+
+    用法：
+        with logging_from_config(config):
+            run_ga(orders, config)
+
+    Args:
+        config: 配置对象
+
+    Returns:
+        上下文管理器，退出时恢复之前的级别
+    """
+    return logging_scope(
+        getattr(config, "LOG_LEVEL", None),
+        getattr(config, "LOG_MODULE_LEVELS", None),
+        bool(getattr(config, "QUIET", False)),
+    )
@@ -4,8 +4,16 @@
 包含订单、染色体、调度方案等核心数据结构。
 """
 
-from .order import Order
+from .order import Order, OrderSpec
 from .chromosome import Chromosome
-from .schedule import Schedule
+from .schedule import Schedule, SchedulePatch
 
-__all__ = ['Order', 'Chromosome', 'Schedule']
+__all__ = ['Order', 'OrderSpec', 'Chromosome', 'Schedule', 'SchedulePatch', 'ArraySchedule']
+
+
+def __getattr__(name):
+    # ArraySchedule 依赖 NumPy，首次访问时才导入，避免拖慢 import models
+    if name == 'ArraySchedule':
+        from .array_schedule import ArraySchedule
+        return ArraySchedule
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
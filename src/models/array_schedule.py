@@ -0,0 +1,330 @@
+"""
+数组存储的调度方案
+
+以并行数组 (order_id, line, slot, quantity) 保存分配方案，收入、成本、罚款、
+产线利用率与完成率等指标均以 NumPy 向量化计算，适用于长时域、大规模方案的
+评估与报表。allocation / order_completion 以只读字典视图的形式保留原接口。
+"""
+from types import MappingProxyType
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from .order import order_columns
+from .schedule import Schedule, ScheduleIndex
+
+
+class ArraySchedule(Schedule):
+    """
+    数组存储的调度方案类
+
+    add_allocation 先追加到缓冲区，首次读取时再合并为数组。与 Schedule 相同，
+    同一单元重复添加时 allocation 视图取最后一次的数量，完成量按累加计算。
+
+    Attributes:
+        revenue: 总收入
+        cost: 总成本
+        penalty: 总罚款
+        profit: 总利润
+    """
+
+    def __init__(self, order_ids=(), lines=(), slots=(), quantities=()):
+        """
+        初始化数组调度方案
+
+        Args:
+            order_ids, lines, slots, quantities: 等长的分配数组（可选），数量为 0 的项被忽略
+        """
+        self._buffer = ([], [], [], [])
+        self._arrays = None
+        self._allocation_view = None
+        self._completion_view = None
+        self._index = None
+        self.revenue = 0.0
+        self.cost = 0.0
+        self.penalty = 0.0
+        self.profit = 0.0
+        if len(order_ids):
+            quantities = np.asarray(quantities, dtype=np.int64)
+            keep = quantities > 0
+            self._arrays = (
+                np.asarray(order_ids, dtype=np.int64)[keep],
+                np.asarray(lines, dtype=np.int64)[keep],
+                np.asarray(slots, dtype=np.int64)[keep],
+                quantities[keep],
+            )
+
+    @classmethod
+    def from_schedule(cls, schedule):
+        """
+        由字典存储的 Schedule 构建（复制指标）
+
+        Args:
+            schedule: 调度方案 (Schedule)
+
+        Returns:
+            ArraySchedule: 数组调度方案
+        """
+        keys = list(schedule.allocation.keys())
+        array_schedule = cls(
+            [k[0] for k in keys], [k[1] for k in keys], [k[2] for k in keys],
+            list(schedule.allocation.values())
+        )
+        array_schedule.revenue = schedule.revenue
+        array_schedule.cost = schedule.cost
+        array_schedule.penalty = schedule.penalty
+        array_schedule.profit = schedule.profit
+        return array_schedule
+
+    def to_schedule(self):
+        """
+        转换为字典存储的 Schedule（可被调度器原地修改）
+
+        Returns:
+            Schedule: 调度方案
+        """
+        schedule = Schedule()
+        schedule.allocation = dict(self.allocation)
+        schedule.order_completion = dict(self.order_completion)
+        schedule.revenue = self.revenue
+        schedule.cost = self.cost
+        schedule.penalty = self.penalty
+        schedule.profit = self.profit
+        return schedule
+
+    def to_arrays(self):
+        """
+        获取分配方案的并行数组
+
+        Returns:
+            tuple: (order_ids, lines, slots, quantities)，均为 int64 数组
+        """
+        if self._buffer[0]:
+            new = tuple(np.asarray(column, dtype=np.int64) for column in self._buffer)
+            if self._arrays is not None:
+                new = tuple(np.concatenate(pair) for pair in zip(self._arrays, new))
+            self._arrays = new
+            self._buffer = ([], [], [], [])
+        if self._arrays is None:
+            empty = np.zeros(0, dtype=np.int64)
+            self._arrays = (empty, empty, empty, empty)
+        return self._arrays
+
+    def add_allocation(self, order_id, line, slot, quantity):
+        """
+        添加订单分配
+
+        Args:
+            order_id: 订单编号
+            line: 生产线编号 (1-based)
+            slot: 时间段编号 (1-based)
+            quantity: 分配数量
+        """
+        if quantity > 0:
+            for column, value in zip(self._buffer, (order_id, line, slot, quantity)):
+                column.append(value)
+            self._allocation_view = None
+            self._completion_view = None
+            self._index = None
+
+    def apply(self, patch, orders=None, labor_costs=None, penalty_rate=0.1):
+        """数组方案不支持原地修改，需先 to_schedule() 转换为字典方案"""
+        raise TypeError("ArraySchedule 不支持 apply，请先调用 to_schedule()")
+
+    @property
+    def allocation(self):
+        """分配方案的只读字典视图 {(order_id, line, slot): quantity}"""
+        if self._allocation_view is None:
+            order_ids, lines, slots, quantities = self.to_arrays()
+            self._allocation_view = MappingProxyType(dict(zip(
+                zip(order_ids.tolist(), lines.tolist(), slots.tolist()), quantities.tolist()
+            )))
+        return self._allocation_view
+
+    def __getstate__(self):
+        # 只读视图与索引为缓存，不参与序列化
+        state = dict(self.__dict__)
+        state.update(_allocation_view=None, _completion_view=None, _index=None)
+        return state
+
+    def __setstate__(self, state):
+        # allocation 为只读视图：直接恢复数组与缓冲区，缓存在首次读取时重建
+        self.__dict__.update(state)
+        self.__dict__.update(_allocation_view=None, _completion_view=None, _index=None)
+
+    def get_index(self):
+        """
+        获取二级索引（首次查询或新增分配后重建）
+
+        Returns:
+            ScheduleIndex: 二级索引
+        """
+        if self._index is None:
+            self._index = ScheduleIndex(self.allocation)
+        return self._index
+
+    @property
+    def order_completion(self):
+        """订单完成量的只读字典视图 {order_id: completed_quantity}"""
+        if self._completion_view is None:
+            order_ids, _, _, quantities = self.to_arrays()
+            unique_ids, inverse = np.unique(order_ids, return_inverse=True)
+            totals = np.bincount(inverse, weights=quantities, minlength=len(unique_ids))
+            self._completion_view = MappingProxyType(
+                dict(zip(unique_ids.tolist(), totals.astype(np.int64).tolist()))
+            )
+        return self._completion_view
+
+    def _completed_per_order(self, order_ids):
+        """
+        按给定订单顺序统计完成量（不在 order_ids 中的分配被忽略）
+
+        Args:
+            order_ids: 订单编号数组
+
+        Returns:
+            np.ndarray: 与 order_ids 对齐的完成量
+        """
+        alloc_ids, _, _, quantities = self.to_arrays()
+        completed = np.zeros(len(order_ids), dtype=np.float64)
+        if len(order_ids) == 0 or len(alloc_ids) == 0:
+            return completed
+        sorter = np.argsort(order_ids, kind='stable')
+        pos = np.searchsorted(order_ids, alloc_ids, sorter=sorter)
+        pos = np.minimum(pos, len(order_ids) - 1)
+        matched = order_ids[sorter[pos]] == alloc_ids
+        np.add.at(completed, sorter[pos[matched]], quantities[matched])
+        return completed
+
+    def get_working_cells(self):
+        """
+        获取所有工作中的 (line, slot) 单元
+
+        Returns:
+            np.ndarray: 形如 (n, 2) 的去重单元数组，按 (line, slot) 排序
+        """
+        _, lines, slots, _ = self.to_arrays()
+        if len(lines) == 0:
+            return np.zeros((0, 2), dtype=np.int64)
+        return np.unique(np.stack([lines, slots], axis=1), axis=0)
+
+    def calculate_metrics(self, orders, labor_costs, penalty_rate=0.1):
+        """
+        计算调度方案的各项指标（向量化实现，口径与 Schedule 一致）
+
+        Args:
+            orders: 订单列表 (List[Order]) 或列式订单存储 (OrderStore)
+            labor_costs: 人工成本列表 (Dict[int, float] 或 List[float])
+            penalty_rate: 罚款比例，默认0.1 (10%)
+        """
+        order_ids, _, quantities, _, _, unit_prices = order_columns(orders)
+        order_ids = np.asarray(order_ids, dtype=np.int64)
+        quantities = np.asarray(quantities, dtype=np.float64)
+        unit_prices = np.asarray(unit_prices, dtype=np.float64)
+
+        completed = self._completed_per_order(order_ids)
+        self.revenue = float(np.dot(completed, unit_prices))
+        unfinished = completed < quantities
+        self.penalty = float(np.sum(quantities[unfinished] * unit_prices[unfinished] * penalty_rate))
+
+        slots = self.get_working_cells()[:, 1]
+        if isinstance(labor_costs, dict):
+            unique_slots, counts = np.unique(slots, return_counts=True)
+            slot_costs = np.array([labor_costs.get(s, 0) for s in unique_slots.tolist()], dtype=np.float64)
+            self.cost = float(np.dot(slot_costs, counts))
+        elif labor_costs and len(slots):
+            cost_table = np.asarray(labor_costs, dtype=np.float64)
+            self.cost = float(np.sum(cost_table[(slots - 1) % len(cost_table)]))
+        else:
+            self.cost = 0.0
+
+        self.profit = self.revenue - self.cost - self.penalty
+
+    def get_line_schedule(self, line) -> Dict[int, List[Tuple[int, int]]]:
+        """
+        获取指定生产线的调度安排
+
+        Args:
+            line: 生产线编号 (1-based)
+
+        Returns:
+            dict: {slot: [(order_id, quantity), ...]}
+        """
+        order_ids, lines, slots, quantities = self.to_arrays()
+        mask = lines == line
+        line_schedule = {}
+        for order_id, slot, qty in zip(order_ids[mask].tolist(), slots[mask].tolist(),
+                                       quantities[mask].tolist()):
+            line_schedule.setdefault(slot, []).append((order_id, qty))
+        return line_schedule
+
+    def get_slot_product(self, line, slot, orders) -> int:
+        """
+        获取指定 (line, slot) 的产品类型
+
+        Args:
+            line: 生产线编号
+            slot: 时间段编号
+            orders: 订单列表
+
+        Returns:
+            int: 产品类型 (0=空闲, 1/2/3=产品编号)
+        """
+        order_ids, lines, slots, _ = self.to_arrays()
+        candidates = order_ids[(lines == line) & (slots == slot)].tolist()
+        if candidates:
+            product_of = {order.order_id: order.product for order in orders}
+            for order_id in candidates:
+                if order_id in product_of:
+                    return product_of[order_id]
+        return 0  # 空闲
+
+    def get_line_utilization(self, num_lines, start_slot, end_slot) -> Dict[int, float]:
+        """
+        统计各生产线在 [start_slot, end_slot] 内的利用率
+
+        Args:
+            num_lines: 生产线数量
+            start_slot: 起始时间段（含）
+            end_slot: 结束时间段（含）
+
+        Returns:
+            dict: {line: 工作单元数 / 时间段数}
+        """
+        cells = self.get_working_cells()
+        in_range = cells[(cells[:, 1] >= start_slot) & (cells[:, 1] <= end_slot)]
+        counts = np.bincount(in_range[:, 0], minlength=num_lines + 1)
+        num_slots = max(end_slot - start_slot + 1, 1)
+        return {line: float(counts[line]) / num_slots for line in range(1, num_lines + 1)}
+
+    def get_statistics(self, orders) -> Dict:
+        """
+        获取调度方案的统计信息（向量化实现）
+
+        Args:
+            orders: 订单列表
+
+        Returns:
+            dict: 包含各种统计指标的字典
+        """
+        order_ids, _, quantities, _, _, _ = order_columns(orders)
+        order_ids = np.asarray(order_ids, dtype=np.int64)
+        quantities = np.asarray(quantities, dtype=np.float64)
+        total_orders = len(order_ids)
+
+        completed = self._completed_per_order(order_ids)
+        completed_orders = int(np.count_nonzero(completed >= quantities))
+        positive = quantities > 0
+        total_completion_rate = float(np.sum(completed[positive] / quantities[positive]))
+
+        return {
+            'total_orders': total_orders,
+            'completed_orders': completed_orders,
+            'on_time_rate': completed_orders / total_orders if total_orders > 0 else 0,
+            'avg_completion_rate': total_completion_rate / total_orders if total_orders > 0 else 0,
+            'total_working_slots': len(self.get_working_cells()),
+            'revenue': self.revenue,
+            'cost': self.cost,
+            'penalty': self.penalty,
+            'profit': self.profit
+        }
@@ -3,12 +3,20 @@
 
 定义订单的数据结构和相关操作。
 """
+from collections import namedtuple
+
+
+# 订单的不可变定义部分（创建后不再变化）
+OrderSpec = namedtuple('OrderSpec', ['order_id', 'product', 'quantity', 'release_slot', 'due_slot', 'unit_price'])
 
 
 class Order:
     """
     订单类
     
+    使用 __slots__ 存储字段：无实例 __dict__，单个订单内存更小、属性访问更快。
+    字段分为不可变的定义部分（spec）与可变的进度部分（progress）。
+    
     Attributes:
         order_id: 订单编号
         product: 产品类型 (1, 2, 3)
@@ -18,8 +26,15 @@ class Order:
         due_slot: 截止时间（以slot为单位），表示截止日期当天早上8点，订单必须在此之前完成
                   订单的生产时间窗口为 [release_slot, due_slot)
         unit_price: 单位售价
+        penalized: 是否已被罚款
+        completed_slot: 完成时的时段
     """
     
+    __slots__ = (
+        'order_id', 'product', 'quantity', 'release_slot', 'due_slot', 'unit_price',
+        'remaining', 'penalized', 'completed_slot',
+    )
+    
     def __init__(self, order_id, product, quantity, due_slot, unit_price, release_slot=1):
         """
         初始化订单
@@ -42,6 +57,62 @@ class Order:
         self.penalized = False  # 是否已被罚款
         self.completed_slot = None  # 完成时的时段（用于判断是否按期）
     
+    @classmethod
+    def from_spec(cls, spec, progress=None):
+        """
+        由订单定义（及可选的进度状态）创建订单
+        
+        Args:
+            spec: 订单定义 (OrderSpec)
+            progress: progress() 导出的进度三元组，默认为未开始生产
+            
+        Returns:
+            Order: 订单对象
+        """
+        order = cls(spec.order_id, spec.product, spec.quantity, spec.due_slot,
+                    spec.unit_price, release_slot=spec.release_slot)
+        if progress is not None:
+            order.restore_progress(progress)
+        return order
+    
+    @property
+    def spec(self):
+        """订单的不可变定义部分 (OrderSpec)"""
+        return OrderSpec(self.order_id, self.product, self.quantity,
+                         self.release_slot, self.due_slot, self.unit_price)
+    
+    def progress(self):
+        """
+        导出可变进度状态（用于快照；滚动快照与假设分析只需复制这一部分）
+        
+        Returns:
+            tuple: (remaining, penalized, completed_slot)
+        """
+        return (self.remaining, self.penalized, self.completed_slot)
+    
+    def restore_progress(self, progress):
+        """
+        恢复 progress() 导出的进度状态
+        
+        Args:
+            progress: progress() 导出的三元组
+        """
+        self.remaining, self.penalized, self.completed_slot = progress
+    
+    def __copy__(self):
+        # 逐字段复制（定义部分均为不可变值，浅复制即完全独立）
+        order = Order.__new__(Order)
+        order.order_id = self.order_id
+        order.product = self.product
+        order.quantity = self.quantity
+        order.release_slot = self.release_slot
+        order.due_slot = self.due_slot
+        order.unit_price = self.unit_price
+        order.remaining = self.remaining
+        order.penalized = self.penalized
+        order.completed_slot = self.completed_slot
+        return order
+    
     def update_remaining(self, completed):
         """
         更新剩余数量
@@ -98,10 +169,37 @@ class Order:
     
     def reset(self):
         """
-        重置订单状态（将剩余数量恢复为初始需求量）
+        重置订单状态（将剩余数量恢复为初始需求量，数量不大于 0 时为 0）
         """
-        self.remaining = self.quantity
+        self.remaining = max(0, self.quantity)
     
     def __repr__(self):
         """订单的字符串表示"""
         return f"Order(id={self.order_id}, product={self.product}, qty={self.quantity}, release={self.release_slot}, due={self.due_slot})"
+
+
+def order_columns(orders):
+    """
+    以列的形式获取订单的静态字段
+    
+    兼容两类输入：Order 列表，或提供 columns() 方法的列式订单存储（OrderStore）。
+    解码与适应度计算据此按列访问订单，不依赖具体的订单对象。
+    
+    Args:
+        orders: 订单列表 (List[Order]) 或 OrderStore
+        
+    Returns:
+        tuple: (order_ids, products, quantities, release_slots, due_slots, unit_prices)，
+               每项为与订单顺序一致的列表
+    """
+    columns = getattr(orders, 'columns', None)
+    if columns is not None:
+        return columns()
+    return (
+        [order.order_id for order in orders],
+        [order.product for order in orders],
+        [order.quantity for order in orders],
+        [order.release_slot for order in orders],
+        [order.due_slot for order in orders],
+        [order.unit_price for order in orders],
+    )
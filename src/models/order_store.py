@@ -0,0 +1,250 @@
+"""
+列式订单存储
+
+以 NumPy 数组按列保存订单，适用于超大订单簿：内存紧凑、可持久化为 .npy
+文件并以内存映射方式近乎瞬时地加载，同时为现有调用方提供与 Order 兼容的视图。
+"""
+import json
+import os
+
+import numpy as np
+
+from .order import Order
+
+
+STORE_VERSION = 1
+
+# 列名 -> 数据类型；completed_slot 以 -1 表示尚未完成
+STORE_COLUMNS = {
+    'order_id': np.int64,
+    'product': np.int64,
+    'quantity': np.int64,
+    'remaining': np.int64,
+    'release_slot': np.int64,
+    'due_slot': np.int64,
+    'unit_price': np.float64,
+    'penalized': np.bool_,
+    'completed_slot': np.int64,
+}
+
+
+class OrderStore:
+    """
+    列式订单存储类
+
+    Attributes:
+        order_id, product, quantity, remaining, release_slot, due_slot,
+        unit_price, penalized, completed_slot: 各列的 NumPy 数组，长度均为订单数
+    """
+
+    def __init__(self, columns):
+        """
+        初始化列式订单存储
+
+        Args:
+            columns: {列名: 数组}；至少包含订单静态字段，缺省的进度列
+                     （remaining / penalized / completed_slot）按未开始生产初始化
+        """
+        num_orders = len(columns['order_id'])
+        defaults = {
+            'remaining': lambda: np.array(columns['quantity'], dtype=np.int64),
+            'release_slot': lambda: np.ones(num_orders, dtype=np.int64),
+            'penalized': lambda: np.zeros(num_orders, dtype=np.bool_),
+            'completed_slot': lambda: np.full(num_orders, -1, dtype=np.int64),
+        }
+        for name, dtype in STORE_COLUMNS.items():
+            if name in columns:
+                values = columns[name]
+                # 内存映射数组保持原样，避免加载时复制
+                if not isinstance(values, np.ndarray) or values.dtype != dtype:
+                    values = np.asarray(values, dtype=dtype)
+            else:
+                values = defaults[name]()
+            setattr(self, name, values)
+        self._index = None
+        self._columns = None
+
+    @classmethod
+    def from_orders(cls, orders):
+        """
+        由 Order 列表构建列式存储（包含当前进度状态）
+
+        Args:
+            orders: 订单列表 (List[Order])
+
+        Returns:
+            OrderStore: 列式订单存储
+        """
+        return cls({
+            'order_id': [o.order_id for o in orders],
+            'product': [o.product for o in orders],
+            'quantity': [o.quantity for o in orders],
+            'remaining': [o.remaining for o in orders],
+            'release_slot': [o.release_slot for o in orders],
+            'due_slot': [o.due_slot for o in orders],
+            'unit_price': [o.unit_price for o in orders],
+            'penalized': [o.penalized for o in orders],
+            'completed_slot': [-1 if o.completed_slot is None else o.completed_slot for o in orders],
+        })
+
+    def save(self, directory):
+        """
+        持久化为目录：每列一个 .npy 文件（可内存映射）加 meta.json
+
+        Args:
+            directory: 输出目录
+        """
+        os.makedirs(directory, exist_ok=True)
+        for name in STORE_COLUMNS:
+            np.save(os.path.join(directory, f"{name}.npy"), getattr(self, name))
+        with open(os.path.join(directory, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump({'version': STORE_VERSION, 'num_orders': len(self)}, f)
+
+    @classmethod
+    def load(cls, directory, mmap_mode='c'):
+        """
+        从目录加载列式存储
+
+        Args:
+            directory: save 写出的目录
+            mmap_mode: 内存映射模式，默认 'c'（写时复制：加载近乎瞬时，
+                       调度过程中的修改不会写回磁盘）；None 表示完整读入内存
+
+        Returns:
+            OrderStore: 列式订单存储
+
+        Raises:
+            ValueError: 存储版本不兼容
+        """
+        with open(os.path.join(directory, 'meta.json'), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get('version') != STORE_VERSION:
+            raise ValueError(f"不支持的订单存储版本: {meta.get('version')}（当前版本 {STORE_VERSION}）")
+        columns = {
+            name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mmap_mode)
+            for name in STORE_COLUMNS
+        }
+        return cls(columns)
+
+    def __len__(self):
+        return len(self.order_id)
+
+    def __getitem__(self, index):
+        """获取第 index 个订单的 Order 兼容视图"""
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return OrderView(self, index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield OrderView(self, index)
+
+    def index_of(self, order_id):
+        """
+        按订单编号查找下标
+
+        Args:
+            order_id: 订单编号
+
+        Returns:
+            int: 下标，不存在时返回 None
+        """
+        if self._index is None:
+            self._index = {oid: i for i, oid in enumerate(self.order_id.tolist())}
+        return self._index.get(order_id)
+
+    def columns(self):
+        """
+        静态字段的列表形式（供解码与适应度计算直接使用，结果会被缓存）
+
+        Returns:
+            tuple: (order_ids, products, quantities, release_slots, due_slots, unit_prices)
+        """
+        if self._columns is None:
+            self._columns = (
+                self.order_id.tolist(),
+                self.product.tolist(),
+                self.quantity.tolist(),
+                self.release_slot.tolist(),
+                self.due_slot.tolist(),
+                self.unit_price.tolist(),
+            )
+        return self._columns
+
+    def to_orders(self):
+        """
+        物化为独立的 Order 对象列表
+
+        Returns:
+            list: 订单列表 (List[Order])
+        """
+        return [view.to_order() for view in self]
+
+    def __repr__(self):
+        return f"OrderStore(num_orders={len(self)})"
+
+
+def _column_property(name, writable=False):
+    """生成读取（可选写入）OrderStore 某列第 _index 个元素的属性"""
+    def getter(self):
+        return getattr(self._store, name)[self._index].item()
+
+    def setter(self, value):
+        getattr(self._store, name)[self._index] = value
+
+    return property(getter, setter if writable else None)
+
+
+class OrderView(Order):
+    """
+    OrderStore 中单个订单的视图
+
+    与 Order 接口兼容（继承其全部方法），字段读写直接作用于存储的数组。
+    订单编号、产品、数量、时间窗口与单价为只读字段。
+    """
+
+    __slots__ = ('_store', '_index')
+
+    order_id = _column_property('order_id')
+    product = _column_property('product')
+    quantity = _column_property('quantity')
+    release_slot = _column_property('release_slot')
+    due_slot = _column_property('due_slot')
+    unit_price = _column_property('unit_price')
+    remaining = _column_property('remaining', writable=True)
+    penalized = _column_property('penalized', writable=True)
+
+    def __init__(self, store, index):
+        """
+        初始化订单视图
+
+        Args:
+            store: 列式订单存储 (OrderStore)
+            index: 订单在存储中的下标
+        """
+        self._store = store
+        self._index = index
+
+    @property
+    def completed_slot(self):
+        value = self._store.completed_slot[self._index].item()
+        return None if value < 0 else value
+
+    @completed_slot.setter
+    def completed_slot(self, value):
+        self._store.completed_slot[self._index] = -1 if value is None else value
+
+    def to_order(self):
+        """
+        物化为独立的 Order 对象（复制当前进度状态）
+
+        Returns:
+            Order: 订单对象
+        """
+        return Order.from_spec(self.spec, self.progress())
+
+    def __copy__(self):
+        # 复制视图时返回独立订单，避免副本的修改写回存储
+        return self.to_order()
@@ -0,0 +1,276 @@
+"""
+调度方案与模拟结果的紧凑序列化
+
+分配方案与订单进度以 NumPy 数组保存为 .npz，元数据（指标、财务数据、累计统计）
+保存为 JSON，均带有格式版本号。模拟结果按天写入独立文件，可在模拟过程中流式落盘，
+GUI 与离线分析可直接重新加载，无需重新运行优化。
+
+模拟结果目录结构：
+    meta.json          版本、天数、已写入的天、累计统计
+    day_001.npz        第 1 天：当天调度方案 + 订单进度 + 当天元数据
+    ...
+"""
+import json
+import os
+
+import numpy as np
+
+from .schedule import Schedule
+from .array_schedule import ArraySchedule
+from .simulation_result import SimulationResult, DayResult
+
+
+RESULT_FORMAT_VERSION = 1
+
+_ALLOCATION_COLUMNS = ('order_id', 'line', 'slot', 'quantity')
+_ORDER_PREFIX = 'order__'
+
+
+def _json_default(value):
+    """JSON 序列化兜底：NumPy 标量转为 Python 标量"""
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"无法序列化为 JSON 的类型: {type(value).__name__}")
+
+
+def _encode_meta(meta):
+    return np.array(json.dumps(meta, ensure_ascii=False, default=_json_default))
+
+
+def _decode_meta(data, kind):
+    meta = json.loads(data['meta'].item())
+    if meta.get('version') != RESULT_FORMAT_VERSION:
+        raise ValueError(f"不支持的结果文件版本: {meta.get('version')}（当前版本 {RESULT_FORMAT_VERSION}）")
+    if meta.get('kind') != kind:
+        raise ValueError(f"文件类型不匹配: 期望 {kind}，实际 {meta.get('kind')}")
+    return meta
+
+
+def _schedule_arrays(schedule):
+    """调度方案 -> {列名: int64 数组}"""
+    if isinstance(schedule, ArraySchedule):
+        columns = schedule.to_arrays()
+    else:
+        keys = list(schedule.allocation.keys())
+        columns = (
+            [k[0] for k in keys], [k[1] for k in keys], [k[2] for k in keys],
+            list(schedule.allocation.values()),
+        )
+    return {
+        f"alloc__{name}": np.asarray(column, dtype=np.int64)
+        for name, column in zip(_ALLOCATION_COLUMNS, columns)
+    }
+
+
+def _schedule_metrics(schedule):
+    return {
+        'revenue': schedule.revenue,
+        'cost': schedule.cost,
+        'penalty': schedule.penalty,
+        'profit': schedule.profit,
+    }
+
+
+def _restore_schedule(data, metrics, as_array):
+    columns = [data[f"alloc__{name}"] for name in _ALLOCATION_COLUMNS]
+    if as_array:
+        schedule = ArraySchedule(*columns)
+    else:
+        schedule = Schedule()
+        for order_id, line, slot, qty in zip(*(column.tolist() for column in columns)):
+            schedule.add_allocation(order_id, line, slot, qty)
+    schedule.revenue = metrics['revenue']
+    schedule.cost = metrics['cost']
+    schedule.penalty = metrics['penalty']
+    schedule.profit = metrics['profit']
+    return schedule
+
+
+def save_schedule(schedule, path):
+    """
+    保存调度方案为单个 .npz 文件（分配方案为数组，指标为内嵌 JSON）
+
+    Args:
+        schedule: 调度方案 (Schedule 或 ArraySchedule)
+        path: 输出文件路径（.npz）
+    """
+    meta = {'version': RESULT_FORMAT_VERSION, 'kind': 'schedule', 'metrics': _schedule_metrics(schedule)}
+    with open(path, 'wb') as f:
+        np.savez(f, meta=_encode_meta(meta), **_schedule_arrays(schedule))
+
+
+def load_schedule(path, as_array=False):
+    """
+    加载 save_schedule 保存的调度方案
+
+    Args:
+        path: .npz 文件路径
+        as_array: 是否返回数组存储的 ArraySchedule（默认返回可修改的 Schedule）
+
+    Returns:
+        Schedule: 调度方案
+
+    Raises:
+        ValueError: 文件版本或类型不匹配
+    """
+    with np.load(path, allow_pickle=False) as data:
+        meta = _decode_meta(data, 'schedule')
+        return _restore_schedule(data, meta['metrics'], as_array)
+
+
+def day_result_path(directory, day_index):
+    """获取第 day_index 天（0-based）的结果文件路径"""
+    return os.path.join(directory, f"day_{day_index + 1:03d}.npz")
+
+
+class SimulationResultWriter:
+    """
+    模拟结果流式写入器
+
+    每天结束时调用 write_day 写入当天文件，并同步更新 meta.json，
+    因此模拟中途退出时已写入的天仍可加载；目录中已有的结果会被续写。
+    """
+
+    def __init__(self, directory, num_days):
+        """
+        Args:
+            directory: 输出目录
+            num_days: 模拟天数
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.num_days = num_days
+        self.written_days = []
+        self.cumulative_stats = None
+        # 断点续跑时在已有结果目录上继续写入
+        meta_path = os.path.join(directory, 'meta.json')
+        if os.path.exists(meta_path):
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            if meta.get('version') == RESULT_FORMAT_VERSION:
+                self.written_days = list(meta.get('days', []))
+
+    def write_day(self, day_result):
+        """
+        写入单日结果
+
+        Args:
+            day_result: 单日结果 (DayResult)
+        """
+        arrays = {}
+        meta = {
+            'version': RESULT_FORMAT_VERSION,
+            'kind': 'day_result',
+            'day_index': day_result.day_index,
+            'financial': day_result.financial,
+            'slots': day_result.slots,
+            'schedule_metrics': None,
+        }
+        # 增量记录的天每次访问 schedule / orders 都会重建，各只读取一次
+        schedule = day_result.schedule
+        if schedule is not None:
+            arrays.update(_schedule_arrays(schedule))
+            meta['schedule_metrics'] = _schedule_metrics(schedule)
+
+        orders = list(day_result.orders.values())
+        meta['order_fields'] = list(orders[0].keys()) if orders else []
+        for field in meta['order_fields']:
+            arrays[_ORDER_PREFIX + field] = np.asarray([order[field] for order in orders])
+
+        with open(day_result_path(self.directory, day_result.day_index), 'wb') as f:
+            np.savez(f, meta=_encode_meta(meta), **arrays)
+        if day_result.day_index not in self.written_days:
+            self.written_days.append(day_result.day_index)
+        self._write_meta()
+
+    def close(self, cumulative_stats=None):
+        """
+        写入累计统计，完成结果目录
+
+        Args:
+            cumulative_stats: 累计统计数据（可选）
+        """
+        self.cumulative_stats = cumulative_stats
+        self._write_meta()
+
+    def _write_meta(self):
+        meta = {
+            'version': RESULT_FORMAT_VERSION,
+            'kind': 'simulation_result',
+            'num_days': self.num_days,
+            'days': sorted(self.written_days),
+            'cumulative_stats': self.cumulative_stats,
+        }
+        path = os.path.join(self.directory, 'meta.json')
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False, default=_json_default)
+        os.replace(tmp_path, path)
+
+
+def save_simulation_result(simulation_result, directory):
+    """
+    一次性保存完整模拟结果
+
+    Args:
+        simulation_result: 模拟结果 (SimulationResult)
+        directory: 输出目录
+    """
+    writer = SimulationResultWriter(directory, simulation_result.num_days)
+    for day_index in sorted(simulation_result.days):
+        writer.write_day(simulation_result.days[day_index])
+    writer.close(simulation_result.cumulative_stats)
+
+
+def load_day_result(directory, day_index, as_array=False):
+    """
+    加载单日结果
+
+    Args:
+        directory: 结果目录
+        day_index: 天数索引（0-based）
+        as_array: 当天调度方案是否以 ArraySchedule 返回
+
+    Returns:
+        DayResult: 单日结果
+    """
+    with np.load(day_result_path(directory, day_index), allow_pickle=False) as data:
+        meta = _decode_meta(data, 'day_result')
+        day_result = DayResult(meta['day_index'])
+        day_result.financial = meta['financial']
+        day_result.slots = meta['slots']
+        if meta['schedule_metrics'] is not None:
+            day_result.schedule = _restore_schedule(data, meta['schedule_metrics'], as_array)
+        fields = meta['order_fields']
+        if fields:
+            columns = [data[_ORDER_PREFIX + field].tolist() for field in fields]
+            order_id_column = columns[fields.index('order_id')]
+            for order_id, values in zip(order_id_column, zip(*columns)):
+                day_result.add_order_progress(order_id, dict(zip(fields, values)))
+    return day_result
+
+
+def load_simulation_result(directory, as_array=False):
+    """
+    加载模拟结果目录（包括未写完的流式结果中已落盘的天）
+
+    Args:
+        directory: 结果目录
+        as_array: 各天调度方案是否以 ArraySchedule 返回
+
+    Returns:
+        SimulationResult: 模拟结果
+
+    Raises:
+        ValueError: 文件版本或类型不匹配
+    """
+    with open(os.path.join(directory, 'meta.json'), 'r', encoding='utf-8') as f:
+        meta = json.load(f)
+    if meta.get('version') != RESULT_FORMAT_VERSION:
+        raise ValueError(f"不支持的结果文件版本: {meta.get('version')}（当前版本 {RESULT_FORMAT_VERSION}）")
+    simulation_result = SimulationResult(meta['num_days'])
+    for day_index in meta['days']:
+        simulation_result.add_day_result(day_index, load_day_result(directory, day_index, as_array))
+    if meta['cumulative_stats'] is not None:
+        simulation_result.set_cumulative_stats(meta['cumulative_stats'])
+    return simulation_result
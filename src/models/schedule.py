@@ -6,6 +6,137 @@
 from collections import defaultdict
 from typing import Dict, List, Tuple
 
+from .order import order_columns
+
+
+def _labor_cost(labor_costs, slot):
+    """
+    查询单个 (line, slot) 工作时的人工成本
+    
+    Args:
+        labor_costs: dict（key 为 slot 编号）或 list（0-based，按长度循环取值）
+        slot: 时间段编号 (1-based)
+    """
+    if isinstance(labor_costs, dict):
+        return labor_costs.get(slot, 0)
+    if labor_costs:
+        return labor_costs[(slot - 1) % len(labor_costs)]
+    return 0
+
+
+class SchedulePatch:
+    """
+    调度方案补丁：两个方案在 [start_slot, end_slot] 范围内的差异
+    
+    Attributes:
+        start_slot: 范围起点（含）
+        end_slot: 范围终点（含），None 表示不设上界
+        added: 新增的分配 [((order_id, line, slot), quantity), ...]
+        removed: 删除的分配 [((order_id, line, slot), old_quantity), ...]
+        changed: 数量变化的分配 [((order_id, line, slot), old_quantity, new_quantity), ...]
+    """
+    
+    __slots__ = ('start_slot', 'end_slot', 'added', 'removed', 'changed')
+    
+    def __init__(self, start_slot=1, end_slot=None, added=None, removed=None, changed=None):
+        self.start_slot = start_slot
+        self.end_slot = end_slot
+        self.added = added or []
+        self.removed = removed or []
+        self.changed = changed or []
+    
+    def __len__(self):
+        return len(self.added) + len(self.removed) + len(self.changed)
+    
+    def is_empty(self):
+        """补丁是否为空（两个方案在范围内完全一致）"""
+        return len(self) == 0
+    
+    def summary(self) -> Dict:
+        """
+        计划变动（churn）统计
+        
+        Returns:
+            dict: 新增/删除/修改的分配数，增加与减少的生产数量，涉及的订单数与 (line, slot) 单元数
+        """
+        quantity_added = sum(qty for _, qty in self.added)
+        quantity_removed = sum(qty for _, qty in self.removed)
+        for _, old_qty, new_qty in self.changed:
+            if new_qty > old_qty:
+                quantity_added += new_qty - old_qty
+            else:
+                quantity_removed += old_qty - new_qty
+        keys = [entry[0] for entry in self.added + self.removed + self.changed]
+        return {
+            'added': len(self.added),
+            'removed': len(self.removed),
+            'changed': len(self.changed),
+            'quantity_added': quantity_added,
+            'quantity_removed': quantity_removed,
+            'orders_touched': len({key[0] for key in keys}),
+            'cells_touched': len({(key[1], key[2]) for key in keys}),
+        }
+    
+    def __repr__(self):
+        return (f"SchedulePatch(slots=[{self.start_slot}, {self.end_slot}], added={len(self.added)}, "
+                f"removed={len(self.removed)}, changed={len(self.changed)})")
+
+
+# 旧快照中的 allocation 以 AllocationDict（带索引缓存的 dict 子类）保存，
+# 其序列化形式为 AllocationDict(dict)；保留该名称使这些快照可以直接还原为普通 dict
+AllocationDict = dict
+
+
+class ScheduleIndex:
+    """
+    Schedule 的二级索引（只包含数量 > 0 的分配，列表内保持分配方案的插入顺序）
+
+    Attributes:
+        by_cell: {(line, slot): [(order_id, quantity), ...]}
+        by_line: {line: {slot: [(order_id, quantity), ...]}}
+        by_slot: {slot: [(order_id, line, quantity), ...]}
+        by_order: {order_id: [(line, slot, quantity), ...]}
+    """
+
+    __slots__ = ('by_cell', 'by_line', 'by_slot', 'by_order', '_products')
+
+    def __init__(self, allocation):
+        """
+        单次遍历分配方案构建全部索引
+
+        Args:
+            allocation: {(order_id, line, slot): quantity}
+        """
+        by_cell = defaultdict(list)
+        by_line = defaultdict(lambda: defaultdict(list))
+        by_slot = defaultdict(list)
+        by_order = defaultdict(list)
+        for (order_id, line, slot), qty in allocation.items():
+            if qty > 0:
+                by_cell[(line, slot)].append((order_id, qty))
+                by_line[line][slot].append((order_id, qty))
+                by_slot[slot].append((order_id, line, qty))
+                by_order[order_id].append((line, slot, qty))
+        self.by_cell = dict(by_cell)
+        self.by_line = {line: dict(slots) for line, slots in by_line.items()}
+        self.by_slot = dict(by_slot)
+        self.by_order = dict(by_order)
+        self._products = None
+
+    def product_map(self, orders):
+        """
+        订单编号到产品的映射（对同一个 orders 对象复用）
+
+        Args:
+            orders: 订单列表
+
+        Returns:
+            dict: {order_id: product}
+        """
+        if self._products is None or self._products[0] is not orders or self._products[1] != len(orders):
+            self._products = (orders, len(orders), {order.order_id: order.product for order in orders})
+        return self._products[2]
+
 
 class Schedule:
     """
@@ -20,16 +151,64 @@ class Schedule:
         cost: 总成本
         penalty: 总罚款
         profit: 总利润
+    
+    按产线、时间段、(产线, 时间段) 与订单的查询使用惰性构建的二级索引。
+    add_allocation、apply 与对 allocation 属性的赋值会使索引失效；
+    直接修改 allocation 字典后需调用 invalidate_index()。
     """
     
     def __init__(self):
         """初始化调度方案"""
-        self.allocation = {}
+        self._allocation = {}
+        self._index = None
         self.order_completion = {}
         self.revenue = 0.0
         self.cost = 0.0
         self.penalty = 0.0
         self.profit = 0.0
+        # 已计入指标的订单编号（apply 据此将新出现的订单补计入收入与罚款）
+        self._metric_orders = set()
+    
+    @property
+    def allocation(self):
+        """订单分配方案 {(order_id, line, slot): quantity}"""
+        return self._allocation
+    
+    @allocation.setter
+    def allocation(self, allocation):
+        self._allocation = allocation if isinstance(allocation, dict) else dict(allocation)
+        self._index = None
+    
+    def __getstate__(self):
+        # 索引为缓存，不参与序列化与复制
+        state = dict(self.__dict__)
+        state['_index'] = None
+        return state
+    
+    def __setstate__(self, state):
+        # 兼容以 allocation 为键保存分配方案的旧快照
+        state = dict(state)
+        allocation = state.pop('allocation', state.pop('_allocation', None))
+        self.__dict__.update(state)
+        # 旧快照未记录指标口径：首次 apply 时视当时的全部订单为已计入
+        self.__dict__.setdefault('_metric_orders', None)
+        self.allocation = allocation if allocation is not None else {}
+    
+    def invalidate_index(self):
+        """丢弃二级索引（直接修改 allocation 字典后调用，下次查询时重建）"""
+        self._index = None
+    
+    def get_index(self):
+        """
+        获取二级索引（首次查询或分配方案修改后重建）
+        
+        Returns:
+            ScheduleIndex: 二级索引
+        """
+        index = self._index
+        if index is None:
+            index = self._index = ScheduleIndex(self._allocation)
+        return index
     
     def add_allocation(self, order_id, line, slot, quantity):
         """
@@ -43,19 +222,136 @@ class Schedule:
         """
         if quantity > 0:
             key = (order_id, line, slot)
-            self.allocation[key] = quantity
+            self._allocation[key] = quantity
+            self._index = None
             
             # 更新订单完成量统计
             if order_id not in self.order_completion:
                 self.order_completion[order_id] = 0
             self.order_completion[order_id] += quantity
     
+    def _cells_in_range(self, start_slot, end_slot):
+        """{(order_id, line, slot): quantity}，仅含 [start_slot, end_slot] 内数量 > 0 的分配"""
+        cells = {}
+        for slot, allocations in self.get_index().by_slot.items():
+            if slot >= start_slot and (end_slot is None or slot <= end_slot):
+                for order_id, line, qty in allocations:
+                    cells[(order_id, line, slot)] = qty
+        return cells
+    
+    def diff(self, other, start_slot=1, end_slot=None):
+        """
+        计算把本方案变为 other 所需的补丁（只比较 [start_slot, end_slot] 范围）
+        
+        Args:
+            other: 目标调度方案 (Schedule)
+            start_slot: 范围起点（含），通常为第一个未冻结的 slot
+            end_slot: 范围终点（含），None 表示不设上界
+            
+        Returns:
+            SchedulePatch: 补丁
+        """
+        mine = self._cells_in_range(start_slot, end_slot)
+        theirs = other._cells_in_range(start_slot, end_slot)
+        patch = SchedulePatch(start_slot, end_slot)
+        for key, qty in theirs.items():
+            old_qty = mine.get(key)
+            if old_qty is None:
+                patch.added.append((key, qty))
+            elif old_qty != qty:
+                patch.changed.append((key, old_qty, qty))
+        patch.removed = [(key, qty) for key, qty in mine.items() if key not in theirs]
+        return patch
+    
+    def apply(self, patch, orders=None, labor_costs=None, penalty_rate=0.1):
+        """
+        原地应用补丁，代价与变动的分配数成正比
+        
+        同步更新订单完成量；提供 orders 时按差量更新收入、成本、罚款与利润
+        （只重新核算涉及的订单与 (line, slot) 单元）。orders 中尚未计入指标的
+        新订单（如新到达的订单）会先按当前完成量补计收入与罚款。
+        
+        Args:
+            patch: 由本方案 diff 得到的补丁 (SchedulePatch)
+            orders: {order_id: Order} 或订单列表（可选）
+            labor_costs: 人工成本（同 calculate_metrics）
+            penalty_rate: 罚款比例，默认0.1 (10%)
+        """
+        update_metrics = orders is not None
+        if update_metrics:
+            if not isinstance(orders, dict):
+                orders = {order.order_id: order for order in orders}
+            by_cell = self.get_index().by_cell
+            if self._metric_orders is None:
+                self._metric_orders = set(orders)
+            new_ids = orders.keys() - self._metric_orders
+            if new_ids:
+                for order_id in new_ids:
+                    order = orders[order_id]
+                    completed_qty = self.order_completion.get(order_id, 0)
+                    self.revenue += completed_qty * order.unit_price
+                    if completed_qty < order.quantity:
+                        self.penalty += order.quantity * order.unit_price * penalty_rate
+                self._metric_orders |= new_ids
+        
+        cell_delta = defaultdict(int)
+        completion_delta = defaultdict(int)
+        for key, old_qty in patch.removed:
+            self._allocation.pop(key, None)
+            cell_delta[(key[1], key[2])] -= 1
+            completion_delta[key[0]] -= old_qty
+        for key, qty in patch.added:
+            self._allocation[key] = qty
+            cell_delta[(key[1], key[2])] += 1
+            completion_delta[key[0]] += qty
+        for key, old_qty, qty in patch.changed:
+            self._allocation[key] = qty
+            completion_delta[key[0]] += qty - old_qty
+        self._index = None
+        
+        for order_id, delta in completion_delta.items():
+            before = self.order_completion.get(order_id, 0)
+            after = before + delta
+            if after > 0:
+                self.order_completion[order_id] = after
+            else:
+                self.order_completion.pop(order_id, None)
+            order = orders.get(order_id) if update_metrics else None
+            if order is not None:
+                self.revenue += delta * order.unit_price
+                was_short = before < order.quantity
+                is_short = after < order.quantity
+                if was_short != is_short:
+                    order_penalty = order.quantity * order.unit_price * penalty_rate
+                    self.penalty += order_penalty if is_short else -order_penalty
+        
+        if update_metrics:
+            for (line, slot), delta in cell_delta.items():
+                before = len(by_cell.get((line, slot), ()))
+                after = before + delta
+                if (before > 0) != (after > 0):
+                    cost = _labor_cost(labor_costs, slot)
+                    self.cost += cost if after > 0 else -cost
+            self.profit = self.revenue - self.cost - self.penalty
+    
+    def retire_orders(self, order_ids):
+        """
+        将订单移出指标口径（如流式模式下被淘汰的已完成订单）
+        
+        已计入的收入与罚款保留不变；之后 apply 不再因这些订单的分配变动调整收入与罚款。
+        
+        Args:
+            order_ids: 订单编号的可迭代对象
+        """
+        if self._metric_orders is not None:
+            self._metric_orders.difference_update(order_ids)
+    
     def calculate_metrics(self, orders, labor_costs, penalty_rate=0.1):
         """
         计算调度方案的各项指标
         
         Args:
-            orders: 订单列表 (List[Order])
+            orders: 订单列表 (List[Order]) 或列式订单存储 (OrderStore)
             labor_costs: 人工成本列表 (Dict[int, float] 或 List[float])
                         key 为 slot 编号 (1-based)，value 为该时间段的单位人工成本
             penalty_rate: 罚款比例，默认0.1 (10%)
@@ -65,20 +361,23 @@ class Schedule:
         self.cost = 0.0
         self.penalty = 0.0
         
+        # 按列读取订单字段（兼容 Order 列表与 OrderStore）
+        order_ids, _, quantities, _, _, unit_prices = order_columns(orders)
+        self._metric_orders = set(order_ids)
+        
         # 计算收入：每个订单的完成量 * 单价
-        order_dict = {order.order_id: order for order in orders}
+        price_of = dict(zip(order_ids, unit_prices))
         for order_id, completed_qty in self.order_completion.items():
-            if order_id in order_dict:
-                order = order_dict[order_id]
-                self.revenue += completed_qty * order.unit_price
+            if order_id in price_of:
+                self.revenue += completed_qty * price_of[order_id]
         
         # 计算罚款：未按期完成的订单
         # 罚款规则：如果订单未完全完成，罚款 = 订单总金额 × 罚款比例
-        for order in orders:
-            completed_qty = self.order_completion.get(order.order_id, 0)
+        for order_id, quantity, unit_price in zip(order_ids, quantities, unit_prices):
+            completed_qty = self.order_completion.get(order_id, 0)
             # 如果订单未完全完成，罚款 = 订单总金额 × 罚款比例
-            if completed_qty < order.quantity:
-                self.penalty += order.quantity * order.unit_price * penalty_rate
+            if completed_qty < quantity:
+                self.penalty += quantity * unit_price * penalty_rate
         
         # 计算人工成本：统计每个 (line, slot) 是否工作
         working_slots = set()
@@ -88,17 +387,7 @@ class Schedule:
         
         # 汇总成本
         for (line, slot) in working_slots:
-            # labor_costs 可能是 dict 或 list
-            if isinstance(labor_costs, dict):
-                cost_per_slot = labor_costs.get(slot, 0)
-            else:
-                # 如果是 list，假设为 0-based 索引，并按天循环取值
-                if labor_costs:
-                    idx = (slot - 1) % len(labor_costs)
-                    cost_per_slot = labor_costs[idx]
-                else:
-                    cost_per_slot = 0
-            self.cost += cost_per_slot
+            self.cost += _labor_cost(labor_costs, slot)
         
         # 计算总利润
         self.profit = self.revenue - self.cost - self.penalty
@@ -114,11 +403,8 @@ class Schedule:
             dict: {slot: [(order_id, quantity), ...]}
                   该生产线每个时间段的订单分配
         """
-        line_schedule = defaultdict(list)
-        for (order_id, l, slot), qty in self.allocation.items():
-            if l == line and qty > 0:
-                line_schedule[slot].append((order_id, qty))
-        return dict(line_schedule)
+        slots = self.get_index().by_line.get(line, {})
+        return {slot: list(allocations) for slot, allocations in slots.items()}
     
     def get_slot_product(self, line, slot, orders) -> int:
         """
@@ -132,13 +418,61 @@ class Schedule:
         Returns:
             int: 产品类型 (0=空闲, 1/2/3=产品编号)
         """
-        order_dict = {order.order_id: order for order in orders}
-        for (order_id, l, s), qty in self.allocation.items():
-            if l == line and s == slot and qty > 0:
-                if order_id in order_dict:
-                    return order_dict[order_id].product
+        index = self.get_index()
+        allocations = index.by_cell.get((line, slot))
+        if allocations:
+            product_of = index.product_map(orders)
+            for order_id, _ in allocations:
+                if order_id in product_of:
+                    return product_of[order_id]
         return 0  # 空闲
     
+    def get_cell_allocations(self, line, slot) -> List[Tuple[int, int]]:
+        """
+        获取指定 (line, slot) 的全部分配
+        
+        Args:
+            line: 生产线编号
+            slot: 时间段编号
+            
+        Returns:
+            list: [(order_id, quantity), ...]
+        """
+        return list(self.get_index().by_cell.get((line, slot), ()))
+    
+    def get_slot_allocations(self, slot) -> List[Tuple[int, int, int]]:
+        """
+        获取指定时间段在所有产线上的分配
+        
+        Args:
+            slot: 时间段编号
+            
+        Returns:
+            list: [(order_id, line, quantity), ...]
+        """
+        return list(self.get_index().by_slot.get(slot, ()))
+    
+    def get_order_allocations(self, order_id) -> List[Tuple[int, int, int]]:
+        """
+        获取指定订单的全部分配
+        
+        Args:
+            order_id: 订单编号
+            
+        Returns:
+            list: [(line, slot, quantity), ...]
+        """
+        return list(self.get_index().by_order.get(order_id, ()))
+    
+    def get_scheduled_slots(self) -> List[int]:
+        """
+        获取有生产安排的时间段（升序）
+        
+        Returns:
+            list: 时间段编号列表
+        """
+        return sorted(self.get_index().by_slot)
+    
     def get_order_completion_status(self, order) -> Tuple[int, bool]:
         """
         获取订单的完成情况
@@ -179,18 +513,12 @@ class Schedule:
         avg_completion_rate = total_completion_rate / total_orders if total_orders > 0 else 0
         on_time_rate = completed_orders / total_orders if total_orders > 0 else 0
         
-        # 统计工作的 slot 数量
-        working_slots = set()
-        for (order_id, line, slot), qty in self.allocation.items():
-            if qty > 0:
-                working_slots.add((line, slot))
-        
         return {
             'total_orders': total_orders,
             'completed_orders': completed_orders,
             'on_time_rate': on_time_rate,
             'avg_completion_rate': avg_completion_rate,
-            'total_working_slots': len(working_slots),
+            'total_working_slots': len(self.get_index().by_cell),
             'revenue': self.revenue,
             'cost': self.cost,
             'penalty': self.penalty,
@@ -2,9 +2,14 @@
 模拟结果数据模型
 
 存储完整调度周期的所有天的结果，供GUI按天浏览。
+
+每天结束时的订单进度与调度方案以增量形式记录（写时复制）：关键帧天保存完整状态，
+其余各天只保存当天发生变化的订单与方案补丁，查询时按需重建。
 """
 from typing import Dict, List, Any
 
+from .schedule import Schedule
+
 
 class DayResult:
     """单日调度结果"""
@@ -17,15 +22,43 @@ class DayResult:
             day_index: 天数索引（0-based）
         """
         self.day_index = day_index
-        self.schedule = None  # Schedule对象
+        self._schedule = None  # Schedule对象（未使用增量快照时）
         self.slots = []  # 时间段排程列表
-        self.orders = {}  # 订单进度字典 {order_id: order_progress}
+        self._orders = {}  # 订单进度字典 {order_id: order_progress}（未使用增量快照时）
         self.financial = {
             'revenue': 0.0,
             'cost': 0.0,
             'penalty': 0.0,
             'profit': 0.0
         }
+        # 增量快照（由 SimulationResult.record_day_snapshot 设置）
+        self._owner = None
+        self._order_record = None  # ('full', {order_id: progress}) 或 ('delta', {order_id: progress 或 None})
+        self._schedule_record = None  # ('full', ArraySchedule) / ('patch', SchedulePatch, metrics) / ('none',)
+    
+    @property
+    def orders(self) -> Dict[int, Dict[str, Any]]:
+        """当天结束时的订单进度字典 {order_id: order_progress}（增量快照按需重建）"""
+        if self._order_record is not None:
+            return self._owner.get_all_orders_at_day(self.day_index)
+        return self._orders
+    
+    @orders.setter
+    def orders(self, orders):
+        self._orders = orders
+        self._order_record = None
+    
+    @property
+    def schedule(self):
+        """当天结束时的调度方案（增量快照按需重建为独立的 Schedule）"""
+        if self._schedule_record is not None:
+            return self._owner.get_schedule_at_day(self.day_index)
+        return self._schedule
+    
+    @schedule.setter
+    def schedule(self, schedule):
+        self._schedule = schedule
+        self._schedule_record = None
     
     def add_order_progress(self, order_id: int, order_data: Dict[str, Any]):
         """
@@ -35,7 +68,7 @@ class DayResult:
             order_id: 订单ID
             order_data: 订单进度数据
         """
-        self.orders[order_id] = order_data
+        self._orders[order_id] = order_data
     
     def set_financial(self, revenue: float, cost: float, penalty: float, profit: float):
         """设置财务指标"""
@@ -64,14 +97,22 @@ class SimulationResult:
     存储整个调度周期的所有天的结果，支持按天查询。
     """
     
-    def __init__(self, num_days: int):
+    KEYFRAME_INTERVAL = 7  # 每隔多少天保存一次完整关键帧
+    
+    def __init__(self, num_days: int, keyframe_interval: int | None = None):
         """
         初始化模拟结果
         
         Args:
             num_days: 模拟天数
+            keyframe_interval: 关键帧间隔（天），默认 KEYFRAME_INTERVAL
         """
         self.num_days = num_days
+        self.keyframe_interval = keyframe_interval or self.KEYFRAME_INTERVAL
+        self._last_states = None  # 最近一次记录的订单状态（用于计算增量）
+        self._owns_last_states = False  # _last_states 是否为本对象独有的副本（可原地更新）
+        self._last_schedule = None  # 最近一次记录的调度方案副本（用于计算补丁）
+        self._last_keyframe_day = None
         self.days: Dict[int, DayResult] = {}  # {day_index: DayResult}
         self.cumulative_stats = {
             'total_revenue': 0.0,
@@ -93,6 +134,110 @@ class SimulationResult:
         """
         self.days[day_index] = day_result
     
+    def record_day_snapshot(self, day_result: DayResult, order_states: Dict[int, Dict[str, Any]], schedule=None,
+                            changed_states: Dict[int, Any] | None = None):
+        """
+        以增量方式记录某天结束时的订单状态与调度方案，并加入结果
+        
+        需按天递增调用。关键帧天保存完整状态，其余天只保存与前一次记录相比发生变化的
+        订单（被移除的订单记为 None）以及调度方案的补丁，内存与实际变化量成正比。
+        
+        Args:
+            day_result: 单日结果对象（财务数据等已设置）
+            order_states: 当天结束时全部订单的进度 {order_id: order_progress}
+            schedule: 当天的调度方案（可为 None），记录的是调用时刻的副本
+            changed_states: 调用方已知的相对前一次记录的变化 {order_id: order_progress 或 None}（可选）。
+                            提供时直接作为当天的增量，不再逐个比较全部订单，order_states 只在
+                            关键帧天被复制，调用方可以在之后继续原地更新它；
+                            未提供时 order_states 在记录后不应再修改
+        """
+        day_index = day_result.day_index
+        keyframe = (self._last_states is None or self._last_keyframe_day is None
+                    or day_index - self._last_keyframe_day >= self.keyframe_interval)
+        if changed_states is not None:
+            if keyframe:
+                self._last_keyframe_day = day_index
+                day_result._order_record = ('full', dict(order_states))
+                self._last_states = dict(order_states)
+                self._owns_last_states = True
+            else:
+                delta = dict(changed_states)
+                day_result._order_record = ('delta', delta)
+                if not getattr(self, '_owns_last_states', False):
+                    # 上一次记录的状态由调用方持有（或就是关键帧记录本身），先复制再原地更新
+                    self._last_states = dict(self._last_states)
+                    self._owns_last_states = True
+                for order_id, state in delta.items():
+                    if state is None:
+                        self._last_states.pop(order_id, None)
+                    else:
+                        self._last_states[order_id] = state
+        elif keyframe:
+            self._last_keyframe_day = day_index
+            day_result._order_record = ('full', order_states)
+            self._last_states = order_states
+            self._owns_last_states = False
+        else:
+            last = self._last_states
+            delta = {
+                order_id: state for order_id, state in order_states.items()
+                if last.get(order_id) != state
+            }
+            for order_id in last:
+                if order_id not in order_states:
+                    delta[order_id] = None
+            day_result._order_record = ('delta', delta)
+            self._last_states = order_states
+            self._owns_last_states = False
+        
+        if schedule is None:
+            day_result._schedule_record = ('none',)
+        elif keyframe or self._last_schedule is None:
+            # ArraySchedule 依赖 NumPy，记录第一个关键帧时才导入
+            from .array_schedule import ArraySchedule
+            snapshot = ArraySchedule.from_schedule(schedule)
+            day_result._schedule_record = ('full', snapshot)
+            self._last_schedule = snapshot.to_schedule()
+        else:
+            patch = self._last_schedule.diff(schedule)
+            self._last_schedule.apply(patch)
+            metrics = (schedule.revenue, schedule.cost, schedule.penalty, schedule.profit)
+            day_result._schedule_record = ('patch', patch, metrics)
+        
+        day_result._owner = self
+        self.add_day_result(day_index, day_result)
+    
+    def get_schedule_at_day(self, day_index: int):
+        """
+        重建某天结束时的调度方案
+        
+        Args:
+            day_index: 天数索引（0-based）
+            
+        Returns:
+            Schedule: 独立的调度方案副本，当天没有方案时返回 None
+        """
+        day_result = self.get_day_result(day_index)
+        if day_result is None:
+            return None
+        if day_result._schedule_record is None:
+            return day_result._schedule
+        if day_result._schedule_record[0] == 'none':
+            return None
+        
+        # 回溯到最近的完整快照，再依次应用补丁
+        base = day_index
+        while self.days[base]._schedule_record[0] != 'full':
+            base -= 1
+        record = self.days[base]._schedule_record
+        schedule = record[1].to_schedule()
+        for day in range(base + 1, day_index + 1):
+            record = self.days[day]._schedule_record
+            if record[0] == 'patch':
+                schedule.apply(record[1])
+                schedule.revenue, schedule.cost, schedule.penalty, schedule.profit = record[2]
+        return schedule
+    
     def get_day_result(self, day_index: int) -> DayResult:
         """
         获取某一天的结果
@@ -120,10 +265,16 @@ class SimulationResult:
             List[Dict]: 订单在每天的进度列表
         """
         history = []
+        state = None
         for day_idx in sorted(self.days.keys()):
             day_result = self.days[day_idx]
-            if order_id in day_result.orders:
-                order_data = day_result.orders[order_id].copy()
+            record = day_result._order_record
+            if record is None:
+                state = day_result._orders.get(order_id)
+            elif record[0] == 'full' or order_id in record[1]:
+                state = record[1].get(order_id)
+            if state is not None:
+                order_data = state.copy()
                 order_data['day'] = day_idx + 1
                 history.append(order_data)
         return history
@@ -132,6 +283,8 @@ class SimulationResult:
         """
         获取某一天所有订单的状态
         
+        增量记录的天从最近的关键帧开始依次应用各天的变化重建。
+        
         Args:
             day_index: 天数索引（0-based）
             
@@ -139,9 +292,22 @@ class SimulationResult:
             Dict: {order_id: order_progress}
         """
         day_result = self.get_day_result(day_index)
-        if day_result:
-            return day_result.orders
-        return {}
+        if day_result is None:
+            return {}
+        if day_result._order_record is None:
+            return day_result._orders
+        
+        base = day_index
+        while self.days[base]._order_record[0] != 'full':
+            base -= 1
+        states = dict(self.days[base]._order_record[1])
+        for day in range(base + 1, day_index + 1):
+            for order_id, state in self.days[day]._order_record[1].items():
+                if state is None:
+                    states.pop(order_id, None)
+                else:
+                    states[order_id] = state
+        return states
     
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典格式"""
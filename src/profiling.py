@@ -0,0 +1,329 @@
+"""
+按需性能剖析模块
+
+RunProfiler 按天对选定的优化阶段运行 cProfile，并可用 tracemalloc 记录每天的内存峰值
+与主要分配位置。结果写入输出目录：
+
+    day_001_ga.prof        第 1 天 GA 阶段的 cProfile 数据（可用 snakeviz / pstats 查看）
+    day_001_summary.txt    第 1 天各阶段耗时、热点函数、内存峰值与主要分配位置
+    ...
+    profile_summary.txt    全部天的汇总
+
+可剖析的阶段：
+    ga             每天的整个 GA（初始化 + 全部代）
+    ga_generation  GA 每一代（选择、交叉变异、评估、精英保留），不含初始化
+    ls             局部搜索
+    decode         染色体解码
+
+阶段嵌套时只由外层剖析（如同时选择 ga 与 decode，GA 内部的解码计入 ga，
+只有最终方案的解码单独计入 decode）。剖析器与指标注册表一样通过配置对象传递
+（config.PROFILER）；未设置时各模块拿到的是空实现，所有调用均为空操作。
+"""
+import io
+import os
+import time
+import cProfile
+import pstats
+import tracemalloc
+
+
+PROFILE_PHASES = ('ga', 'ga_generation', 'ls', 'decode')
+DEFAULT_PROFILE_PHASES = ('ga', 'ls', 'decode')
+
+
+def parse_phases(phases):
+    """
+    解析阶段选择
+
+    Args:
+        phases: True / "all" 表示默认阶段（ga、ls、decode）；也可为逗号分隔的字符串或阶段序列
+
+    Returns:
+        tuple: 阶段名
+
+    Raises:
+        ValueError: 包含未知阶段
+    """
+    if phases is True or phases == 'all':
+        return DEFAULT_PROFILE_PHASES
+    if isinstance(phases, str):
+        phases = [p.strip() for p in phases.split(',') if p.strip()]
+    phases = tuple(phases)
+    unknown = [p for p in phases if p not in PROFILE_PHASES]
+    if unknown:
+        raise ValueError(f"未知的剖析阶段: {unknown}（可选: {', '.join(PROFILE_PHASES)}）")
+    return phases
+
+
+class _PhaseContext:
+    """阶段剖析上下文：进入时启用当天该阶段的 cProfile，退出时停用并累计耗时"""
+
+    __slots__ = ('_profiler', '_name', '_owner', '_start')
+
+    def __init__(self, profiler, name):
+        self._profiler = profiler
+        self._name = name
+
+    def __enter__(self):
+        self._owner = self._profiler._enter_phase(self._name)
+        if self._owner:
+            self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._owner:
+            self._profiler._exit_phase(self._name, time.perf_counter() - self._start)
+        return False
+
+
+class _DayContext:
+    __slots__ = ('_profiler', '_day')
+
+    def __init__(self, profiler, day):
+        self._profiler = profiler
+        self._day = day
+
+    def __enter__(self):
+        self._profiler.begin_day(self._day)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._profiler.end_day()
+        return False
+
+
+class _NullContext:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_CONTEXT = _NullContext()
+
+
+class RunProfiler:
+    """
+    按天、按阶段的性能剖析器
+
+    用法：
+        profiler = RunProfiler("results/profile", phases=("ga", "ls"))
+        config.PROFILER = profiler
+        with profiler.day(0):
+            scheduler.run_daily_schedule(0)
+        profiler.close()
+
+    cProfile 只剖析调用 begin_day 的线程（后台预优化线程不计入）。
+    """
+
+    enabled = True
+
+    def __init__(self, output_dir, phases=True, trace_memory=True, top_n=20):
+        """
+        Args:
+            output_dir: 输出目录
+            phases: 要剖析的阶段（见 parse_phases）
+            trace_memory: 是否用 tracemalloc 记录每天的内存峰值与主要分配位置（会明显拖慢运行）
+            top_n: 摘要中列出的热点函数 / 分配位置数量
+        """
+        self.output_dir = output_dir
+        self.phases = parse_phases(phases)
+        self.trace_memory = trace_memory
+        self.top_n = top_n
+        self.days = []
+        self._day = None
+        self._profiles = {}
+        self._active_phase = None
+        self._started_tracemalloc = False
+
+    @classmethod
+    def from_config(cls, config, output_dir=None):
+        """
+        按配置（PROFILE / PROFILE_DIR / PROFILE_TRACEMALLOC / PROFILE_TOP_N）创建剖析器
+
+        Args:
+            config: 配置对象
+            output_dir: 输出目录（可选），默认取 config.PROFILE_DIR
+
+        Returns:
+            RunProfiler: 剖析器
+        """
+        return cls(
+            output_dir or getattr(config, "PROFILE_DIR", "profile"),
+            phases=getattr(config, "PROFILE", True),
+            trace_memory=getattr(config, "PROFILE_TRACEMALLOC", True),
+            top_n=getattr(config, "PROFILE_TOP_N", 20),
+        )
+
+    def __reduce__(self):
+        # cProfile 对象不可序列化（调度器快照、结果缓存会连同配置一起 pickle），只保留设置
+        return (RunProfiler, (self.output_dir, self.phases, self.trace_memory, self.top_n))
+
+    def day(self, day):
+        """当天剖析上下文（begin_day / end_day）"""
+        return _DayContext(self, day)
+
+    def phase(self, name):
+        """阶段剖析上下文；阶段未被选择、不在某天内或已处于外层阶段时为空操作"""
+        if name not in self.phases or self._day is None:
+            return _NULL_CONTEXT
+        return _PhaseContext(self, name)
+
+    def begin_day(self, day):
+        """
+        开始记录新一天
+
+        Args:
+            day: 天数索引（0-based）
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        self._day = {'day': day + 1, 'phases': {}, 'memory': None, 'files': []}
+        self._profiles = {}
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracemalloc = True
+            tracemalloc.reset_peak()
+
+    def end_day(self):
+        """结束当天记录：写出 .prof 文件与当天摘要"""
+        day = self._day
+        if day is None:
+            return
+        self._day = None
+        prefix = os.path.join(self.output_dir, f"day_{day['day']:03d}")
+        for name, profile in self._profiles.items():
+            path = f"{prefix}_{name}.prof"
+            profile.dump_stats(path)
+            day['files'].append(path)
+        if self.trace_memory and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            # 排除剖析器自身的分配
+            snapshot = tracemalloc.take_snapshot().filter_traces((
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, cProfile.__file__),
+                tracemalloc.Filter(False, pstats.__file__),
+                tracemalloc.Filter(False, __file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+            ))
+            day['memory'] = {
+                'current_mb': current / 1024 / 1024,
+                'peak_mb': peak / 1024 / 1024,
+                'top_allocations': [
+                    (str(stat.traceback[0]), stat.size / 1024, stat.count)
+                    for stat in snapshot.statistics('lineno')[:self.top_n]
+                ],
+            }
+        summary_path = f"{prefix}_summary.txt"
+        with open(summary_path, 'w', encoding='utf-8') as f:
+            f.write(self._format_day(day, self._profiles))
+        day['files'].append(summary_path)
+        self._profiles = {}
+        self.days.append(day)
+
+    def close(self):
+        """
+        写出全部天的汇总，停止由本剖析器启动的 tracemalloc
+
+        Returns:
+            str: 汇总文件路径（没有记录任何一天时为 None）
+        """
+        if self._day is not None:
+            self.end_day()
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+        if not self.days:
+            return None
+        path = os.path.join(self.output_dir, 'profile_summary.txt')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self._format_overview())
+        return path
+
+    def _enter_phase(self, name):
+        # 已有外层阶段在剖析时不再嵌套启用
+        if self._active_phase is not None:
+            return False
+        profile = self._profiles.get(name)
+        if profile is None:
+            profile = self._profiles[name] = cProfile.Profile()
+        self._active_phase = name
+        profile.enable()
+        return True
+
+    def _exit_phase(self, name, seconds):
+        self._profiles[name].disable()
+        self._active_phase = None
+        if self._day is not None:
+            stats = self._day['phases'].setdefault(name, {'seconds': 0.0, 'calls': 0})
+            stats['seconds'] += seconds
+            stats['calls'] += 1
+
+    def _format_day(self, day, profiles):
+        lines = [f"第 {day['day']} 天性能剖析", "=" * 70]
+        for name, stats in day['phases'].items():
+            lines.append(f"{name:<15} {stats['seconds']:>10.3f} 秒  {stats['calls']:>6} 次")
+        memory = day['memory']
+        if memory is not None:
+            lines.append("")
+            lines.append(f"内存峰值: {memory['peak_mb']:.2f} MB（当天结束时 {memory['current_mb']:.2f} MB）")
+            lines.append("主要分配位置（当天结束时仍存活）:")
+            for location, size_kb, count in memory['top_allocations']:
+                lines.append(f"  {size_kb:>10.1f} KB  {count:>7} 块  {location}")
+        for name, profile in profiles.items():
+            lines.append("")
+            lines.append(f"[{name}] 热点函数（按累计耗时）")
+            lines.append("-" * 70)
+            stream = io.StringIO()
+            pstats.Stats(profile, stream=stream).sort_stats('cumulative').print_stats(self.top_n)
+            lines.append(stream.getvalue().strip())
+        return "\n".join(lines) + "\n"
+
+    def _format_overview(self):
+        phases = [p for p in self.phases if any(p in d['phases'] for d in self.days)]
+        header = f"{'天':<6}" + "".join(f"{p + '(秒)':>18}" for p in phases) + f"{'内存峰值(MB)':>16}"
+        lines = ["性能剖析汇总", "=" * len(header), header, "-" * len(header)]
+        for day in self.days:
+            row = f"{day['day']:<6}"
+            for p in phases:
+                row += f"{day['phases'].get(p, {}).get('seconds', 0.0):>18.3f}"
+            peak = day['memory']['peak_mb'] if day['memory'] is not None else None
+            row += f"{peak:>16.2f}" if peak is not None else f"{'-':>16}"
+            lines.append(row)
+        return "\n".join(lines) + "\n"
+
+
+class _NullProfiler:
+    """未启用剖析时的空实现"""
+
+    enabled = False
+
+    def day(self, day):
+        return _NULL_CONTEXT
+
+    def phase(self, name):
+        return _NULL_CONTEXT
+
+    def close(self):
+        return None
+
+
+NULL_PROFILER = _NullProfiler()
+
+
+def get_profiler(config):
+    """
+    获取配置对象上的剖析器
+
+    Args:
+        config: 配置对象
+
+    Returns:
+        RunProfiler: config.PROFILER，未设置时返回空实现 NULL_PROFILER
+    """
+    profiler = getattr(config, "PROFILER", None)
+    return profiler if profiler is not None else NULL_PROFILER
@@ -6,5 +6,9 @@
 
 from .order_manager import OrderManager
 from .rolling_scheduler import RollingScheduler
+from .arrival_source import ArrivalSource, CsvReplaySource, GeneratorSource, AsyncQueueSource
 
-__all__ = ['OrderManager', 'RollingScheduler']
+__all__ = [
+    'OrderManager', 'RollingScheduler',
+    'ArrivalSource', 'CsvReplaySource', 'GeneratorSource', 'AsyncQueueSource',
+]
@@ -0,0 +1,180 @@
+"""
+订单到达流模块
+
+将订单来源抽象为按 release_slot 递增的到达流：CSV 回放、Python 生成器，
+或由本地生产者写入的 asyncio 队列。OrderManager 在每次调度触发时增量拉取
+已释放的订单，而不是一次性加载包括未来订单在内的全部历史。
+"""
+import asyncio
+import heapq
+import itertools
+import threading
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class ArrivalSource:
+    """
+    订单到达流基类
+
+    子类实现 _next_order()：按 release_slot 非递减的顺序返回下一个订单，
+    流结束时返回 None。poll(until_slot) 只会消费 release_slot <= until_slot
+    的订单，第一个超出的订单被暂存，留待下一次触发。
+    """
+
+    def __init__(self):
+        self._lookahead = None
+        self._exhausted = False
+
+    def _next_order(self):
+        raise NotImplementedError
+
+    def poll(self, until_slot):
+        """
+        取出所有 release_slot <= until_slot 的新订单
+
+        Args:
+            until_slot: 当前触发时刻对应的 slot（1-based）
+
+        Returns:
+            list: 新到达的订单列表 (List[Order])
+        """
+        arrivals = []
+        while not self._exhausted:
+            if self._lookahead is None:
+                self._lookahead = self._next_order()
+                if self._lookahead is None:
+                    self._exhausted = True
+                    break
+            if self._lookahead.release_slot > until_slot:
+                break
+            arrivals.append(self._lookahead)
+            self._lookahead = None
+        return arrivals
+
+    def is_exhausted(self):
+        """到达流是否已全部消费"""
+        return self._exhausted
+
+    def close(self):
+        """释放到达流占用的资源"""
+
+
+class GeneratorSource(ArrivalSource):
+    """包装任意按 release_slot 递增产出订单的可迭代对象（如生成器）"""
+
+    def __init__(self, iterable):
+        """
+        Args:
+            iterable: 按 release_slot 非递减顺序产出 Order 的可迭代对象
+        """
+        super().__init__()
+        self._iterator = iter(iterable)
+
+    def _next_order(self):
+        return next(self._iterator, None)
+
+
+class CsvReplaySource(ArrivalSource):
+    """
+    CSV 回放到达流
+
+    assume_sorted=True 时按块流式读取，要求文件已按 release_slot 排序，内存只与块大小有关；
+    否则先整体读入按 release_slot 组织的小顶堆再回放（现有数据集多为乱序）。
+    """
+
+    def __init__(self, filepath, chunksize=50000, adjust_due_slot=True, assume_sorted=False):
+        """
+        Args:
+            filepath: CSV文件路径
+            chunksize: 每块行数
+            adjust_due_slot: 是否调整due_slot到截止日期当天早上8点（默认True）
+            assume_sorted: 文件是否已按 release_slot 排序
+        """
+        super().__init__()
+        from scheduler.order_manager import iter_order_batches
+
+        batches = iter_order_batches(filepath, chunksize, adjust_due_slot)
+        orders = itertools.chain.from_iterable(batch for batch, _ in batches)
+        if assume_sorted:
+            self._iterator = orders
+            self._heap = None
+        else:
+            self._iterator = None
+            counter = itertools.count()  # 同一 release_slot 保持文件顺序
+            self._heap = [(order.release_slot, next(counter), order) for order in orders]
+            heapq.heapify(self._heap)
+
+    def _next_order(self):
+        if self._heap is None:
+            return next(self._iterator, None)
+        if not self._heap:
+            return None
+        return heapq.heappop(self._heap)[2]
+
+
+class AsyncQueueSource(ArrivalSource):
+    """
+    asyncio 队列到达流
+
+    在后台线程中运行事件循环，生产者协程向有界队列写入订单（按 release_slot 递增），
+    写入 None 表示结束。队列已满时生产者的 put 会等待，从而对生产者形成背压。
+    """
+
+    def __init__(self, producer, maxsize=1000):
+        """
+        Args:
+            producer: 生产者协程函数 producer(queue)，例如 iterable_producer(orders)
+            maxsize: 队列容量（背压阈值）
+        """
+        super().__init__()
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="order-arrival-loop", daemon=True
+        )
+        self._thread.start()
+        self._queue = asyncio.run_coroutine_threadsafe(
+            self._create_queue(maxsize), self._loop
+        ).result()
+        self._producer_task = asyncio.run_coroutine_threadsafe(producer(self._queue), self._loop)
+
+    async def _create_queue(self, maxsize):
+        return asyncio.Queue(maxsize=maxsize)
+
+    def _next_order(self):
+        # 阻塞等待生产者产出下一个订单（或结束标记 None）
+        order = asyncio.run_coroutine_threadsafe(self._queue.get(), self._loop).result()
+        if order is None:
+            # 生产者异常退出时向调用方抛出
+            if self._producer_task.done() and self._producer_task.exception() is not None:
+                raise self._producer_task.exception()
+        return order
+
+    def close(self):
+        self._producer_task.cancel()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=1.0)
+
+
+def iterable_producer(orders, delay=0.0):
+    """
+    本地替身生产者：依次将订单写入队列，最后写入结束标记
+
+    Args:
+        orders: 按 release_slot 非递减顺序的订单可迭代对象
+        delay: 每个订单之间的模拟间隔（秒）
+
+    Returns:
+        callable: 供 AsyncQueueSource 使用的生产者协程函数
+    """
+    async def produce(queue):
+        try:
+            for order in orders:
+                await queue.put(order)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+        finally:
+            await queue.put(None)
+
+    return produce
@@ -0,0 +1,92 @@
+"""
+断点续跑模块
+
+在滚动调度每天结束后保存调度器与订单状态快照，支持从任意一天恢复继续模拟。
+"""
+import os
+import pickle
+import random
+
+CHECKPOINT_VERSION = 1
+
+
+def checkpoint_path(checkpoint_dir, day):
+    """
+    获取某一天结束后的快照文件路径
+
+    Args:
+        checkpoint_dir: 快照目录
+        day: 天数索引（0-based）
+
+    Returns:
+        str: 快照文件路径
+    """
+    return os.path.join(checkpoint_dir, f"checkpoint_day{day + 1:03d}.pkl")
+
+
+def save_checkpoint(path, scheduler, day, extra=None):
+    """
+    保存第 day 天结束后的状态快照
+
+    快照内容：调度器状态（当前方案、冻结水位、累计统计、预优化结果等）、
+    订单进度（remaining / penalized / completed_slot）以及随机数状态。
+    采用带版本号的 pickle 格式，先写临时文件再原子替换，避免中途崩溃留下损坏文件。
+
+    Args:
+        path: 快照文件路径
+        scheduler: 滚动调度器 (RollingScheduler)
+        day: 已完成的天数索引（0-based）
+        extra: 调用方附加保存的数据（可选，例如 SimulationResult）
+    """
+    # 先导出调度器状态：会等待进行中的预优化完成，保证随机数状态一致
+    scheduler_state = scheduler.get_state()
+    checkpoint = {
+        'version': CHECKPOINT_VERSION,
+        'day': day,
+        'scheduler': scheduler_state,
+        'orders': scheduler.order_manager.get_state(),
+        'rng_state': random.getstate(),
+        'extra': extra,
+    }
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(checkpoint, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+
+
+def load_checkpoint(path):
+    """
+    读取状态快照
+
+    Args:
+        path: 快照文件路径
+
+    Returns:
+        dict: 快照内容
+
+    Raises:
+        ValueError: 快照版本与当前程序不兼容
+    """
+    with open(path, 'rb') as f:
+        checkpoint = pickle.load(f)
+    version = checkpoint.get('version') if isinstance(checkpoint, dict) else None
+    if version != CHECKPOINT_VERSION:
+        raise ValueError(f"不支持的快照版本: {version}（当前版本 {CHECKPOINT_VERSION}）")
+    return checkpoint
+
+
+def restore_checkpoint(checkpoint, scheduler):
+    """
+    将快照恢复到调度器、订单管理器与随机数生成器
+
+    Args:
+        checkpoint: load_checkpoint 返回的快照
+        scheduler: 滚动调度器 (RollingScheduler)，其订单管理器需已加载同一批订单
+    """
+    scheduler.order_manager.set_state(checkpoint['orders'])
+    scheduler.set_state(checkpoint['scheduler'])
+    random.setstate(checkpoint['rng_state'])
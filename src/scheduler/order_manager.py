@@ -3,26 +3,254 @@
 
 负责订单的增删改查和订单池维护。
 """
+import bisect
 import csv
+import itertools
 from datetime import datetime
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from logger import get_logger
 from models.order import Order
 
+logger = get_logger(__name__)
+
+# 订单 CSV 列（release_slot 可缺省，缺省时为 1）
+ORDER_CSV_COLUMNS = ('order_id', 'product', 'quantity', 'release_slot', 'due_slot', 'unit_price')
+
+
+def _iter_csv_columns(filepath, chunksize):
+    """
+    分块读取订单 CSV，每块返回 {列名: float 数组}
+    
+    优先使用 pandas.read_csv 的分块读取；未安装 pandas 时退化为
+    按行分块 + numpy.loadtxt 解析。无法解析的值记为 NaN。
+    """
+    import numpy as np
+    
+    try:
+        import pandas as pd
+    except ImportError:
+        pd = None
+    
+    if pd is not None:
+        for chunk in pd.read_csv(filepath, chunksize=chunksize, encoding='utf-8'):
+            yield {
+                name: pd.to_numeric(chunk[name], errors='coerce').to_numpy(dtype=float)
+                for name in chunk.columns if name in ORDER_CSV_COLUMNS
+            }
+        return
+    
+    with open(filepath, 'r', encoding='utf-8') as f:
+        header = [name.strip() for name in f.readline().strip().split(',')]
+        usecols = [i for i, name in enumerate(header) if name in ORDER_CSV_COLUMNS]
+        while True:
+            lines = list(itertools.islice(f, chunksize))
+            if not lines:
+                break
+            try:
+                data = np.loadtxt(lines, delimiter=',', dtype=float, usecols=usecols, ndmin=2)
+            except ValueError:
+                # 存在空值或非法值时逐个记为 NaN
+                data = np.genfromtxt(lines, delimiter=',', dtype=float, usecols=usecols, ndmin=2)
+            yield {header[col]: data[:, i] for i, col in enumerate(usecols)}
+
+
+def iter_order_columns(filepath, chunksize=50000, adjust_due_slot=True):
+    """
+    流式分块读取订单 CSV，按块生成校验后的列数组
+    
+    解析、校验与 due_slot 调整均以数组运算完成；缺少必填字段或数值非法
+    （含负数量）的行会被跳过。
+    
+    Args:
+        filepath: CSV文件路径
+        chunksize: 每块行数
+        adjust_due_slot: 是否调整due_slot到截止日期当天早上8点（默认True）
+        
+    Yields:
+        tuple: (columns, num_skipped) - {列名: 数组}（整数列为 int64，单价为 float64）
+               与本块被跳过的行数
+    """
+    import numpy as np
+    
+    for columns in _iter_csv_columns(filepath, chunksize):
+        num_rows = len(next(iter(columns.values()))) if columns else 0
+        release = columns.get('release_slot')
+        if release is None:
+            release = np.ones(num_rows)
+        
+        # 数组校验：必填字段存在且可解析，数量非负
+        try:
+            required = [columns[name] for name in ('order_id', 'product', 'quantity', 'due_slot', 'unit_price')]
+        except KeyError as e:
+            raise ValueError(f"订单CSV缺少列: {e}")
+        valid = ~np.isnan(release)
+        for values in required:
+            valid &= ~np.isnan(values)
+        valid &= columns['quantity'] >= 0
+        
+        order_ids, products, quantities, due_slots, prices = (values[valid] for values in required)
+        due_slots = due_slots.astype(np.int64)
+        if adjust_due_slot:
+            # 与参考实现一致：due_slot 调整到截止日期次日早上8点的 slot
+            due_slots = ((due_slots - 1) // 6 + 1) * 6 + 1
+        
+        yield {
+            'order_id': order_ids.astype(np.int64),
+            'product': products.astype(np.int64),
+            'quantity': quantities.astype(np.int64),
+            'release_slot': release[valid].astype(np.int64),
+            'due_slot': due_slots,
+            'unit_price': prices,
+        }, int(num_rows - int(valid.sum()))
+
+
+def iter_order_batches(filepath, chunksize=50000, adjust_due_slot=True):
+    """
+    流式分块读取订单 CSV，按块生成订单列表
+    
+    与 OrderManager.load_orders_from_csv 的结果一致（后者保留为参考实现）。
+    
+    Args:
+        filepath: CSV文件路径
+        chunksize: 每块行数
+        adjust_due_slot: 是否调整due_slot到截止日期当天早上8点（默认True）
+        
+    Yields:
+        tuple: (orders, num_skipped) - 本块订单列表与被跳过的行数
+    """
+    for columns, num_skipped in iter_order_columns(filepath, chunksize, adjust_due_slot):
+        orders = [
+            Order(order_id, product, quantity, due_slot, unit_price, release_slot=release_slot)
+            for order_id, product, quantity, due_slot, unit_price, release_slot in zip(
+                columns['order_id'].tolist(),
+                columns['product'].tolist(),
+                columns['quantity'].tolist(),
+                columns['due_slot'].tolist(),
+                columns['unit_price'].tolist(),
+                columns['release_slot'].tolist(),
+            )
+        ]
+        yield orders, num_skipped
+
+
+def build_order_store(filepath, chunksize=50000, adjust_due_slot=True):
+    """
+    流式读取订单 CSV 并直接填充列式订单存储（不创建逐个 Order 对象）
+    
+    Args:
+        filepath: CSV文件路径
+        chunksize: 每块行数
+        adjust_due_slot: 是否调整due_slot到截止日期当天早上8点（默认True）
+        
+    Returns:
+        OrderStore: 列式订单存储
+    """
+    import numpy as np
+    from models.order_store import OrderStore
+    
+    chunks = [columns for columns, _ in iter_order_columns(filepath, chunksize, adjust_due_slot)]
+    if not chunks:
+        return OrderStore({name: np.empty(0) for name in ORDER_CSV_COLUMNS})
+    return OrderStore({
+        name: np.concatenate([columns[name] for columns in chunks])
+        for name in ORDER_CSV_COLUMNS
+    })
+
 
 class OrderManager:
     """
     订单管理器类
     
     管理订单池，处理订单的增删改查操作。
+    
+    除订单字典外维护三组索引，使每日调度前的订单筛选不再扫描全部历史订单：
+    - 待处理订单表 {order_id: Order}（按插入顺序）；
+    - 按 release_slot 排序的未完成订单索引 [(release_slot, order_id)]；
+    - 按 due_slot 排序的未完成订单索引 [(due_slot, order_id)]。
+    订单完成由调度器直接修改 remaining 触发，索引在查询时惰性剔除已完成订单，
+    因此查询均摊复杂度为 O(log n + k log k)。已完成订单若被重置，
+    需通过 pending_orders 赋值重建索引（service.run_schedule 即如此）。
+    数量不大于 0 的订单无需生产，加入订单池时即视为已完成，不进入待处理订单与索引。
     """
     
     def __init__(self):
         """初始化订单管理器"""
         self.orders = {}  # {order_id: Order}
-        self.pending_orders = []  # 待处理订单列表
+        self._pending = {}  # 待处理订单 {order_id: Order}
+        self._release_index = []  # [(release_slot, order_id)]，仅含未完成订单
+        self._due_index = []  # [(due_slot, order_id)]，仅含未完成订单
+        self._index_sorted = True  # 批量加载时先追加，查询前再统一排序
+        self._sequence = {}  # {order_id: 加载顺序}，查询结果按加载顺序返回
+        self._next_sequence = 0
+        self._arrival_source = None  # 订单到达流（None 表示订单已一次性加载）
+        self._evict_completed = False  # 流式模式下是否淘汰已完成订单
+        self._evicted_count = 0  # 已淘汰的订单数量
+        self._evicted_orders = []  # 最近淘汰、尚未被调度器取走的订单（见 drain_evicted_orders）
+        self._completed_on_load = set()  # 加入时即已完成（数量不大于 0）的订单ID
+        self._evicted_completed_on_load = 0  # 其中已被淘汰的数量
+    
+    @property
+    def pending_orders(self):
+        """待处理订单列表（兼容旧接口）"""
+        return list(self._pending.values())
+    
+    @pending_orders.setter
+    def pending_orders(self, orders):
+        """整体替换待处理订单列表，并重建索引（已完成的订单被忽略）"""
+        orders = [order for order in orders if not order.is_completed()]
+        self._pending = {order.order_id: order for order in orders}
+        self._release_index = [(order.release_slot, order.order_id) for order in orders]
+        self._due_index = [(order.due_slot, order.order_id) for order in orders]
+        self._index_sorted = False
+    
+    def _ensure_sorted(self):
+        """批量追加后对索引排序"""
+        if not self._index_sorted:
+            self._release_index.sort()
+            self._due_index.sort()
+            self._index_sorted = True
+    
+    def _index_remove(self, order):
+        """从两组索引中删除订单"""
+        self._ensure_sorted()
+        for index, key in ((self._release_index, order.release_slot),
+                           (self._due_index, order.due_slot)):
+            pos = bisect.bisect_left(index, (key, order.order_id))
+            if pos < len(index) and index[pos] == (key, order.order_id):
+                del index[pos]
+    
+    def _query_prefix(self, index, slot):
+        """
+        返回索引中 key <= slot 的未完成订单，并惰性剔除已完成或已移除的条目
+        
+        Args:
+            index: _release_index 或 _due_index
+            slot: 查询上界（含）
+            
+        Returns:
+            list: 订单列表
+        """
+        self._ensure_sorted()
+        end = bisect.bisect_right(index, (slot, float('inf')))
+        result = []
+        alive = []
+        for entry in index[:end]:
+            order = self._pending.get(entry[1])
+            if order is None:
+                continue
+            if order.remaining <= 0:
+                del self._pending[entry[1]]
+                continue
+            alive.append(entry)
+            result.append(order)
+        if len(alive) != end:
+            index[:end] = alive
+        # 保持与订单加载顺序一致（GA 的 Gene2 以订单池下标编码）
+        result.sort(key=lambda order: self._sequence.get(order.order_id, 0))
+        return result
     
     def add_order(self, order):
         """
@@ -31,11 +259,28 @@ class OrderManager:
         Args:
             order: 订单对象 (Order)
         """
+        old = self.orders.get(order.order_id)
+        if old is not None:
+            self._pending.pop(order.order_id, None)
+            self._index_remove(old)
+        else:
+            self._sequence[order.order_id] = self._next_sequence
+            self._next_sequence += 1
         self.orders[order.order_id] = order
-        # 如果订单未完成，加入待处理列表
+        # 数量不大于 0 的订单无需生产：视为在释放时刻已完成
+        if order.quantity <= 0:
+            order.remaining = 0
+            if order.completed_slot is None:
+                order.completed_slot = order.release_slot
+            self._completed_on_load.add(order.order_id)
+        else:
+            self._completed_on_load.discard(order.order_id)
+        # 如果订单未完成，加入待处理订单及索引
         if not order.is_completed():
-            if order not in self.pending_orders:
-                self.pending_orders.append(order)
+            self._pending[order.order_id] = order
+            self._release_index.append((order.release_slot, order.order_id))
+            self._due_index.append((order.due_slot, order.order_id))
+            self._index_sorted = False
     
     def remove_order(self, order_id):
         """
@@ -46,9 +291,10 @@ class OrderManager:
         """
         if order_id in self.orders:
             order = self.orders[order_id]
-            # 从待处理列表中移除
-            if order in self.pending_orders:
-                self.pending_orders.remove(order)
+            # 从待处理订单及索引中移除
+            if self._pending.pop(order_id, None) is not None:
+                self._index_remove(order)
+            self._completed_on_load.discard(order_id)
             # 从订单字典中移除
             del self.orders[order_id]
     
@@ -73,9 +319,20 @@ class OrderManager:
         Returns:
             list: 待处理订单列表 (List[Order])
         """
-        # 更新待处理列表，移除已完成的订单
-        self.pending_orders = [order for order in self.pending_orders if not order.is_completed()]
-        return self.pending_orders
+        # 移除已完成的订单（索引中的对应条目在下次查询时惰性剔除）
+        completed = [order_id for order_id, order in self._pending.items() if order.is_completed()]
+        for order_id in completed:
+            del self._pending[order_id]
+        return list(self._pending.values())
+    
+    def get_unfinished_orders(self):
+        """
+        获取所有未完成订单（get_pending_orders 的别名）
+        
+        Returns:
+            list: 未完成订单列表 (List[Order])
+        """
+        return self.get_pending_orders()
     
     def get_eligible_orders(self, current_start_slot):
         """
@@ -90,14 +347,21 @@ class OrderManager:
             current_start_slot: 当前调度时刻对应的slot（1-based）
             
         Returns:
-            list: 符合条件的订单列表 (List[Order])
+            list: 符合条件的订单列表 (List[Order])，按订单加载顺序
         """
-        # 构建订单池：已到达 && 未完成
-        eligible_orders = [
-            order for order in self.orders.values()
-            if order.remaining > 0 and order.release_slot <= current_start_slot
-        ]
-        return eligible_orders
+        return self._query_prefix(self._release_index, current_start_slot)
+    
+    def get_orders_due_by(self, slot):
+        """
+        获取截止时间不晚于 slot 的未完成订单（due_slot <= slot，即在 slot 时刻已超期）
+        
+        Args:
+            slot: 时刻对应的slot（1-based）
+            
+        Returns:
+            list: 订单列表 (List[Order])，按订单加载顺序
+        """
+        return self._query_prefix(self._due_index, slot)
     
     def update_order_status(self, order_id, completed_quantity):
         """
@@ -113,9 +377,9 @@ class OrderManager:
             order = self.orders[order_id]
             order.update_remaining(completed_quantity)
             
-            # 如果订单已完成，从待处理列表中移除
-            if order.is_completed() and order in self.pending_orders:
-                self.pending_orders.remove(order)
+            # 如果订单已完成，从待处理订单及索引中移除
+            if order.is_completed() and self._pending.pop(order_id, None) is not None:
+                self._index_remove(order)
     
     def load_orders_from_csv(self, filepath, adjust_due_slot=True, verbose=False):
         """
@@ -164,17 +428,137 @@ class OrderManager:
                     
                     # 如果进行了调整且verbose=True，打印转换信息
                     if verbose and adjust_due_slot and original_due_slot != adjusted_due_slot:
-                        print(f"  订单{order.order_id}: due_slot {original_due_slot} -> {adjusted_due_slot}")
+                        logger.info("  订单%s: due_slot %s -> %s", order.order_id, original_due_slot, adjusted_due_slot)
                         
             if verbose:
-                print(f"从 {filepath} 加载了 {count} 个订单")
+                logger.info("从 %s 加载了 %d 个订单", filepath, count)
         except FileNotFoundError:
-            print(f"错误: 文件 {filepath} 未找到")
+            logger.error("错误: 文件 %s 未找到", filepath)
         except Exception as e:
-            print(f"加载订单错误: {e}")
+            logger.error("加载订单错误: %s", e)
         
         return count
     
+    def load_orders_streaming(self, filepath, chunksize=50000, adjust_due_slot=True, verbose=False):
+        """
+        流式分块加载订单（大规模订单簿）
+        
+        基于 iter_order_batches 逐块解析并加入订单池，内存峰值只与块大小有关。
+        
+        Args:
+            filepath: CSV文件路径
+            chunksize: 每块行数
+            adjust_due_slot: 是否调整due_slot到截止日期当天早上8点（默认True）
+            verbose: 是否打印加载信息（默认False）
+            
+        Returns:
+            int: 加载的订单数量
+        """
+        count = 0
+        skipped = 0
+        try:
+            for orders, num_skipped in iter_order_batches(filepath, chunksize, adjust_due_slot):
+                for order in orders:
+                    self.add_order(order)
+                count += len(orders)
+                skipped += num_skipped
+            if verbose:
+                logger.info("从 %s 加载了 %d 个订单（跳过 %d 行非法数据）", filepath, count, skipped)
+        except FileNotFoundError:
+            logger.error("错误: 文件 %s 未找到", filepath)
+        except Exception as e:
+            logger.error("加载订单错误: %s", e)
+        
+        return count
+    
+    def load_order_store(self, store):
+        """
+        从列式订单存储加载订单
+        
+        订单池中保存的是 OrderStore 的订单视图，调度过程中对 remaining 等
+        进度字段的修改会直接写回存储的数组。
+        
+        Args:
+            store: 列式订单存储 (OrderStore)
+            
+        Returns:
+            int: 加载的订单数量
+        """
+        for i in range(len(store)):
+            self.add_order(store[i])
+        return len(store)
+    
+    def attach_arrival_source(self, source, evict_completed=True):
+        """
+        接入订单到达流，之后由 ingest_arrivals 在每次调度触发时增量拉取订单
+        
+        Args:
+            source: 订单到达流 (ArrivalSource)
+            evict_completed: 拉取新订单前是否淘汰已完成订单，使内存只与在途订单规模相关
+        """
+        self._arrival_source = source
+        self._evict_completed = evict_completed
+    
+    def has_arrival_source(self):
+        """是否接入了订单到达流"""
+        return self._arrival_source is not None
+    
+    def ingest_arrivals(self, until_slot):
+        """
+        从到达流拉取 release_slot <= until_slot 的新订单
+        
+        未接入到达流时为空操作。到达流只在调用时被消费（拉模式），
+        asyncio 队列来源在此之外由有界队列对生产者形成背压。
+        
+        Args:
+            until_slot: 当前触发时刻对应的slot（1-based）
+            
+        Returns:
+            int: 新加入的订单数量
+        """
+        if self._arrival_source is None:
+            return 0
+        if self._evict_completed:
+            self.evict_completed_orders()
+        arrivals = self._arrival_source.poll(until_slot)
+        for order in arrivals:
+            self.add_order(order)
+        return len(arrivals)
+    
+    def evict_completed_orders(self):
+        """
+        从订单池中淘汰已完成的订单（不再参与调度、执行与罚款计算）
+        
+        Returns:
+            int: 本次淘汰的订单数量
+        """
+        completed = [order_id for order_id, order in self.orders.items() if order.is_completed()]
+        self._evicted_completed_on_load += sum(
+            1 for order_id in completed if order_id in self._completed_on_load
+        )
+        self._evicted_orders.extend(self.orders[order_id] for order_id in completed)
+        for order_id in completed:
+            self.remove_order(order_id)
+            self._sequence.pop(order_id, None)
+        self._evicted_count += len(completed)
+        return len(completed)
+    
+    def drain_evicted_orders(self):
+        """
+        取走上次调用以来被淘汰的订单（调度器据此保留其已计入方案指标的收入与罚款）
+        
+        Returns:
+            list: 订单列表
+        """
+        evicted, self._evicted_orders = self._evicted_orders, []
+        return evicted
+    
+    def close_arrival_source(self):
+        """关闭并断开订单到达流"""
+        if self._arrival_source is not None:
+            self._arrival_source.close()
+            self._arrival_source = None
+    
     def time_to_slot(self, day, hour=8):
         """
         将日期和小时转换为 slot 索引
@@ -203,6 +587,32 @@ class OrderManager:
         total_slot = day * slots_per_day + slot_in_day
         return total_slot
     
+    def get_state(self):
+        """
+        导出订单进度状态（用于按天断点续跑）
+        
+        只保存可变的进度字段，订单定义本身由 CSV 重新加载。
+        
+        Returns:
+            dict: {order_id: (remaining, penalized, completed_slot)}
+        """
+        return {order_id: order.progress() for order_id, order in self.orders.items()}
+    
+    def set_state(self, state):
+        """
+        恢复订单进度状态，并重建待处理订单列表
+        
+        Args:
+            state: get_state 导出的状态字典
+        """
+        for order_id, progress in state.items():
+            order = self.orders.get(order_id)
+            if order is not None:
+                order.restore_progress(progress)
+        self.pending_orders = [
+            order for order in self.orders.values() if not order.is_completed()
+        ]
+    
     def get_all_orders(self):
         """
         获取所有订单
@@ -221,6 +631,24 @@ class OrderManager:
         """
         return len(self.orders)
     
+    def get_total_order_count(self):
+        """
+        获取累计订单总数（含流式模式下已淘汰的订单）
+        
+        Returns:
+            int: 订单数量
+        """
+        return len(self.orders) + self._evicted_count
+    
+    def get_completed_on_load_count(self):
+        """
+        获取加入订单池时即已完成（数量不大于 0）的订单数量（含已淘汰的订单）
+        
+        Returns:
+            int: 订单数量
+        """
+        return len(self._completed_on_load) + self._evicted_completed_on_load
+    
     def get_pending_count(self):
         """
         获取待处理订单数量
@@ -3,15 +3,33 @@
 
 实现每日8点的滚动调度逻辑。
 """
+import copy
+import logging
+import math
+import random
+import threading
+import time
 import sys
 import os
+from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from models.schedule import Schedule
+from logger import get_logger, logging_from_config
+from instrumentation import get_metrics
+from profiling import get_profiler
+from models.chromosome import Chromosome
+from models.schedule import Schedule, SchedulePatch
 from ga.engine import run_ga
 from local_search.ils_vns import improve_solution
 from ga.decoder import Decoder
 
+logger = get_logger(__name__)
+
+
+class _SpeculativeCancelled(Exception):
+    """后台预优化已被取消"""
+
 
 class RollingScheduler:
     """
@@ -32,15 +50,39 @@ class RollingScheduler:
         self.order_manager = order_manager
         self.current_schedule = None
         self.frozen_slots = []
+        self.plan_churn = []  # 每次计划合并的变动统计（见 update_schedule）
         
-        # 累计统计数据
+        # 累计统计数据（运行总计，在 execute_slot / calculate_daily_penalty 中增量更新）
         self.cumulative_stats = {
             'total_revenue': 0.0,
             'total_cost': 0.0,
             'total_penalty': 0.0,
             'total_profit': 0.0,
-            'daily_results': []  # 存储每日结果
-        }  # 已冻结的时间段
+            'completed_orders': 0,  # 已完成订单数
+            'on_time_orders': 0,  # 按期完成订单数（completed_slot < due_slot）
+            'penalized_orders': 0,  # 已被罚款订单数
+            'daily_results': [],  # 存储每日结果
+            'skipped_days': 0  # 沿用已有计划、跳过优化的天数
+        }
+        
+        # 流式模式下已淘汰订单在淘汰时已计入当前方案的收入与罚款（全量重算时补回，
+        # 使方案指标在流式与非流式模式下口径一致）
+        self._evicted_metrics = {'revenue': 0.0, 'penalty': 0.0}
+        
+        # 当天计划确定时记录的预期状态，用于次日判断原计划是否仍然有效
+        self._plan_projection = None
+        
+        # 日内事件驱动重排的耗时记录（毫秒）
+        self.repair_latencies = []
+        
+        # 次日预优化：后台线程与待对齐的任务 (target_slot, future, stop_event)
+        self._speculative_executor = None
+        self._speculative_job = None
+        self.speculative_stats = {
+            'started': 0,  # 启动的预优化次数
+            'used': 0,  # 被次日调度用于热启动的次数
+            'wait_ms': 0.0  # 8点触发时等待预优化完成的累计时长
+        }
     
     def run_daily_schedule(self, current_day):
         """
@@ -58,34 +100,43 @@ class RollingScheduler:
         Returns:
             Schedule: 生成的调度方案
         """
-        print("\n" + "="*70)
-        print(f"第 {current_day + 1} 天调度 - 早上8:00")
-        print("="*70)
+        with logging_from_config(self.config):
+            return self._run_daily_schedule(current_day)
+    
+    def _run_daily_schedule(self, current_day):
+        """run_daily_schedule 的实现（日志级别由 run_daily_schedule 按配置设置）"""
+        logger.info("\n" + "="*70)
+        logger.info("第 %d 天调度 - 早上8:00", current_day + 1)
+        logger.info("="*70)
+        metrics = get_metrics(self.config)
+        metrics.begin_day(current_day)
         
         # 步骤1: 计算当前起始slot
         current_slot = self.order_manager.time_to_slot(current_day, hour=8)
-        print(f"📅 当前起始slot: {current_slot} (第{current_day + 1}天早上8点)")
+        logger.info("📅 当前起始slot: %d (第%d天早上8点)", current_slot, current_day + 1)
         
         # 步骤2: 准备订单池（只包含已到达且未完成的订单）
-        # 根据 release_slot <= current_slot 过滤订单
-        orders = self.order_manager.get_eligible_orders(current_slot)
-        
-        # 统计所有订单和未到达订单
-        all_orders = self.order_manager.get_all_orders()
-        total_unfinished = sum(1 for o in all_orders if o.remaining > 0)
-        future_orders = [o for o in all_orders if o.remaining > 0 and o.release_slot > current_slot]
-        
-        print(f"📦 订单池统计:")
-        print(f"  - 总未完成订单: {total_unfinished} 个")
-        print(f"  - 已到达可调度: {len(orders)} 个 (release_slot <= {current_slot})")
-        print(f"  - 未来订单: {len(future_orders)} 个 (release_slot > {current_slot})")
-        
-        if orders:
+        with metrics.phase("ingest"):
+            # 接入到达流时先拉取截至当前触发时刻释放的新订单
+            self._ingest_arrivals(current_slot)
+            # 根据 release_slot <= current_slot 过滤订单
+            orders = self.order_manager.get_eligible_orders(current_slot)
+        
+        # 统计所有订单和未到达订单（基于订单索引，无需遍历全部历史订单）
+        total_unfinished = self.order_manager.get_pending_count()
+        num_future_orders = total_unfinished - len(orders)
+        
+        logger.info("📦 订单池统计:")
+        logger.info("  - 总未完成订单: %d 个", total_unfinished)
+        logger.info("  - 已到达可调度: %d 个 (release_slot <= %d)", len(orders), current_slot)
+        logger.info("  - 未来订单: %d 个 (release_slot > %d)", num_future_orders, current_slot)
+        
+        if orders and logger.isEnabledFor(logging.INFO):
             release_slots = [o.release_slot for o in orders]
-            print(f"  - 订单池release_slot范围: [{min(release_slots)}, {max(release_slots)}]")
+            logger.info("  - 订单池release_slot范围: [%d, %d]", min(release_slots), max(release_slots))
         
         if not orders:
-            print("⚠️  没有已到达的订单，跳过调度")
+            logger.warning("⚠️  没有已到达的订单，跳过调度")
             
             # 即使没有订单，也要添加当天的财务数据（全为0），确保索引对齐
             self.cumulative_stats['daily_results'].append({
@@ -100,17 +151,42 @@ class RollingScheduler:
         
         # 步骤3: 冻结已执行的 slot
         self.freeze_executed_slots(current_slot)
-        print(f"🔒 冻结时段数: {len(self.frozen_slots)}")
+        logger.info("🔒 冻结时段数: %d", len(self.frozen_slots))
         
-        # 步骤3: 运行优化算法 (GA + 局部搜索)
         planning_horizon = self.config.SLOTS_PER_DAY * 10  # 默认规划 5 天
-        optimized_schedule = self.run_optimization(orders, planning_horizon, current_slot)
+        if (getattr(self.config, "ENABLE_SKIP_UNCHANGED_DAYS", False)
+                and self.is_plan_still_valid(current_slot, orders)):
+            # 原计划仍然有效：沿用已有计划，跳过 GA + 局部搜索
+            self.cancel_speculative_planning()
+            self.cumulative_stats['skipped_days'] += 1
+            optimized_schedule = self.current_schedule
+            logger.info("⏩ 无新订单且执行无偏差，原计划仍可按期覆盖全部订单，跳过优化")
+        else:
+            # 步骤3: 运行优化算法 (GA + 局部搜索)，若有昨日的预优化结果则热启动
+            with metrics.phase("speculative_wait"):
+                seed_chromosomes = self._collect_speculative_seeds(current_slot, orders)
+            optimized_schedule = self.run_optimization(
+                orders, planning_horizon, current_slot, seed_chromosomes=seed_chromosomes
+            )
+            
+            # 步骤4: 更新当前调度方案
+            with metrics.phase("update_schedule"):
+                churn = self.update_schedule(optimized_schedule, current_slot).summary()
+            logger.info(
+                "🔁 计划变动: 新增 %d / 删除 %d / 修改 %d 个分配，涉及 %d 个订单",
+                churn['added'], churn['removed'], churn['changed'], churn['orders_touched']
+            )
+        
+        if getattr(self.config, "ENABLE_SKIP_UNCHANGED_DAYS", False):
+            self._record_plan_projection(current_day, orders)
         
-        # 步骤4: 更新当前调度方案
-        self.update_schedule(optimized_schedule)
+        # 当天计划已确定：在后台开始预优化次日窗口，与当天执行并行
+        if getattr(self.config, "ENABLE_SPECULATIVE_PLANNING", False):
+            self._start_speculative_planning(current_day, planning_horizon)
         
         # 步骤5: 执行当天的生产（更新订单状态）并统计当天实际执行的数据
-        daily_stats = self.execute_daily_production(current_day)
+        with metrics.phase("execute"):
+            daily_stats = self.execute_daily_production(current_day)
         
         # 步骤6: 累计统计数据（只累计当天实际执行的部分）
         self.cumulative_stats['daily_results'].append({
@@ -122,22 +198,117 @@ class RollingScheduler:
         })
         
         # 打印当天实际业务指标
-        orders = self.order_manager.get_all_orders()
-        total_orders = len(orders)
-        completed_orders = sum(1 for order in orders if order.is_completed())
-        
-        print("\n" + "="*70)
-        print(f"📊 第 {current_day + 1} 天实际业务指标")
-        print("="*70)
-        print(f"  收入: ¥{daily_stats['revenue']:,.2f} (当天实际生产)")
-        print(f"  成本: ¥{daily_stats['cost']:,.2f} (当天人工成本)")
-        print(f"  罚款: ¥{daily_stats['penalty']:,.2f} (当天新增罚款)")
-        print(f"  利润: ¥{daily_stats['profit']:,.2f}")
-        print(f"  截止当天累计完成: {completed_orders}/{total_orders} ({completed_orders/total_orders*100:.1f}%)")
-        print("="*70 + "\n")
+        total_orders = self.order_manager.get_total_order_count()
+        completed_orders = (self.cumulative_stats['completed_orders']
+                            + self.order_manager.get_completed_on_load_count())
+        
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("\n" + "="*70)
+            logger.info("📊 第 %d 天实际业务指标", current_day + 1)
+            logger.info("="*70)
+            logger.info(f"  收入: ¥{daily_stats['revenue']:,.2f} (当天实际生产)")
+            logger.info(f"  成本: ¥{daily_stats['cost']:,.2f} (当天人工成本)")
+            logger.info(f"  罚款: ¥{daily_stats['penalty']:,.2f} (当天新增罚款)")
+            logger.info(f"  利润: ¥{daily_stats['profit']:,.2f}")
+            completion_rate = completed_orders / total_orders * 100 if total_orders else 0.0
+            logger.info("  截止当天累计完成: %d/%d (%.1f%%)", completed_orders, total_orders, completion_rate)
+            logger.info("="*70 + "\n")
         
         return optimized_schedule
     
+    def _projected_plan_profit(self, from_slot, to_slot):
+        """估算当前计划在 [from_slot, to_slot] 内的收入减人工成本（不含罚款）"""
+        revenue = 0.0
+        working_cells = set()
+        for (order_id, line, slot), qty in self.current_schedule.allocation.items():
+            if from_slot <= slot <= to_slot and qty > 0:
+                order = self.order_manager.get_order(order_id)
+                if order:
+                    revenue += qty * order.unit_price
+                working_cells.add((line, slot))
+        cost = sum(self._slot_labor_cost(slot) for _, slot in working_cells)
+        return revenue - cost
+    
+    def _record_plan_projection(self, current_day, orders):
+        """
+        记录当天计划确定后的预期状态
+        
+        包括：当天执行结束后各订单的预期剩余量、次日起始 slot，以及计划当天的
+        预估收入减人工成本，供次日 is_plan_still_valid 与实际执行结果比对。
+        
+        Args:
+            current_day: 当前天数（0-based）
+            orders: 当天参与调度的订单列表
+        """
+        slots_per_day = self.config.SLOTS_PER_DAY
+        day_start_slot = current_day * slots_per_day + 1
+        day_end_slot = day_start_slot + slots_per_day - 1
+        
+        planned_today = {}
+        for (order_id, line, slot), qty in self.current_schedule.allocation.items():
+            if day_start_slot <= slot <= day_end_slot and qty > 0:
+                planned_today[order_id] = planned_today.get(order_id, 0) + qty
+        
+        self._plan_projection = {
+            'next_slot': day_end_slot + 1,
+            'expected_remaining': {
+                order.order_id: max(0, order.remaining - planned_today.get(order.order_id, 0))
+                for order in orders
+            },
+            'planned_day_profit': self._projected_plan_profit(day_start_slot, day_end_slot)
+        }
+    
+    def is_plan_still_valid(self, current_slot, orders):
+        """
+        判断已有计划今天是否可以直接沿用
+        
+        需同时满足：
+        1. 没有新释放的订单（订单池与昨日一致）；
+        2. 昨日实际执行量与计划一致（各订单剩余量等于预期）；
+        3. 昨日实际收入减人工成本与制定计划时的预估一致；
+        4. 原计划仍能在截止前覆盖每个订单的剩余需求。
+        
+        Args:
+            current_slot: 当前调度起始 slot
+            orders: 当前订单池 (List[Order])
+            
+        Returns:
+            bool: 是否可以跳过优化
+        """
+        projection = self._plan_projection
+        if projection is None or self.current_schedule is None:
+            return False
+        if projection['next_slot'] != current_slot:
+            return False
+        
+        expected_remaining = projection['expected_remaining']
+        for order in orders:
+            expected = expected_remaining.get(order.order_id)
+            if expected is None or expected != order.remaining:
+                return False
+        
+        planned_day_profit = projection.get('planned_day_profit')
+        daily_results = self.cumulative_stats['daily_results']
+        if planned_day_profit is None or not daily_results:
+            return False
+        realized = daily_results[-1]
+        if abs(realized['revenue'] - realized['cost'] - planned_day_profit) > 1e-6:
+            return False
+        
+        planned = {}
+        for (order_id, line, slot), qty in self.current_schedule.allocation.items():
+            if slot >= current_slot and qty > 0:
+                planned.setdefault(order_id, []).append((slot, qty))
+        for order in orders:
+            covered = sum(
+                qty for slot, qty in planned.get(order.order_id, [])
+                if slot < order.due_slot
+            )
+            if covered < order.remaining:
+                return False
+        
+        return True
+    
     def freeze_executed_slots(self, current_slot):
         """
         冻结已执行的时间段
@@ -150,7 +321,7 @@ class RollingScheduler:
         # 冻结所有小于 current_slot 的时间段
         self.frozen_slots = list(range(1, current_slot))
     
-    def run_optimization(self, orders, planning_horizon, start_slot):
+    def run_optimization(self, orders, planning_horizon, start_slot, seed_chromosomes=None):
         """
         运行优化算法
         
@@ -160,36 +331,51 @@ class RollingScheduler:
             orders: 订单列表 (List[Order])
             planning_horizon: 规划时域（slot 数量）
             start_slot: 当前规划窗口在全局时间轴上的起始 slot（1-based）
+            seed_chromosomes: 热启动种子个体（可选）；提供时 GA 仅运行
+                              SPECULATIVE_REFINE_GENERATIONS 代
             
         Returns:
             Schedule: 优化后的调度方案
         """
-        print(
-            f"\n正在为 {len(orders)} 个订单进行 {planning_horizon} 个时段的优化"
-            f"（起始slot={start_slot}）..."
+        logger.info(
+            "\n正在为 %d 个订单进行 %d 个时段的优化（起始slot=%d）...",
+            len(orders), planning_horizon, start_slot
         )
         
         # 阶段1: 运行遗传算法
-        print("\n阶段1: 遗传算法")
-        ga_best = run_ga(
-            orders,
-            self.config,
-            planning_horizon=planning_horizon,
-            start_slot=start_slot,
-        )
+        logger.info("\n阶段1: 遗传算法")
+        ga_config = self.config
+        if seed_chromosomes:
+            ga_config = copy.copy(self.config)
+            ga_config.MAX_GENERATIONS = int(
+                getattr(self.config, "SPECULATIVE_REFINE_GENERATIONS", self.config.MAX_GENERATIONS)
+            )
+            logger.info("使用预优化结果热启动，GA 代数: %d", ga_config.MAX_GENERATIONS)
+        metrics = get_metrics(self.config)
+        profiler = get_profiler(self.config)
+        with metrics.phase("ga"), profiler.phase("ga"):
+            ga_best = run_ga(
+                orders,
+                ga_config,
+                planning_horizon=planning_horizon,
+                start_slot=start_slot,
+                seed_chromosomes=seed_chromosomes,
+            )
         
         # 阶段2: 局部搜索改进
-        print("\n阶段2: 局部搜索 (ILS/VNS)")
-        improved_solution = improve_solution(
-            ga_best, orders, self.config, start_slot=start_slot
-        )
+        logger.info("\n阶段2: 局部搜索 (ILS/VNS)")
+        with metrics.phase("ls"), profiler.phase("ls"):
+            improved_solution = improve_solution(
+                ga_best, orders, self.config, start_slot=start_slot
+            )
         
         # 解码为 Schedule 对象
-        decoder = Decoder(self.config)
-        final_schedule = decoder.decode(
-            improved_solution, orders, start_slot=start_slot
-        )
-        final_schedule.calculate_metrics(orders, self.config.LABOR_COSTS, self.config.PENALTY_RATE)
+        with metrics.phase("decode_final"):
+            decoder = Decoder(self.config)
+            final_schedule = decoder.decode(
+                improved_solution, orders, start_slot=start_slot
+            )
+            final_schedule.calculate_metrics(orders, self.config.LABOR_COSTS, self.config.PENALTY_RATE)
         
         # 停工保护：预估当日利润为负则当日停工
         if getattr(self.config, "ENABLE_STOPLOSS", False):
@@ -220,6 +406,7 @@ class RollingScheduler:
                 keys_to_remove = [k for k in final_schedule.allocation.keys() if day_start <= k[2] <= day_end]
                 for k in keys_to_remove:
                     del final_schedule.allocation[k]
+                final_schedule.invalidate_index()
                 # 重建完成量
                 final_schedule.order_completion = {}
                 for (order_id, line, slot), qty in final_schedule.allocation.items():
@@ -227,42 +414,341 @@ class RollingScheduler:
                         final_schedule.order_completion[order_id] = final_schedule.order_completion.get(order_id, 0) + qty
                 # 重新计算指标
                 final_schedule.calculate_metrics(orders, self.config.LABOR_COSTS, self.config.PENALTY_RATE)
-                print("⚠️ 已触发停工保护：当天预估利润为负，已设置当日停工")
+                logger.warning("⚠️ 已触发停工保护：当天预估利润为负，已设置当日停工")
         
-        print(f"\n优化完成（算法内部指标，用于优化过程）")
-        print(f"GA适应度: ¥{final_schedule.profit:.2f}")
-        print(f"  规划期总收入: ¥{final_schedule.revenue:.2f}")
-        print(f"  规划期总成本: ¥{final_schedule.cost:.2f}")
-        print(f"  规划期总罚款: ¥{final_schedule.penalty:.2f} (未来{planning_horizon}个slot的预估)")
+        logger.info("\n优化完成（算法内部指标，用于优化过程）")
+        logger.info("GA适应度: ¥%.2f", final_schedule.profit)
+        logger.info("  规划期总收入: ¥%.2f", final_schedule.revenue)
+        logger.info("  规划期总成本: ¥%.2f", final_schedule.cost)
+        logger.info("  规划期总罚款: ¥%.2f (未来%d个slot的预估)", final_schedule.penalty, planning_horizon)
         
         return final_schedule
     
-    def update_schedule(self, new_schedule):
+    def _start_speculative_planning(self, current_day, planning_horizon):
+        """
+        在后台线程中预优化次日窗口
+        
+        订单池为当前已知的积压订单（今天 8 点已到达），剩余量按今天计划的产量
+        预估扣减（即预计今天执行结束后的状态）。订单以副本传入，后台线程不会
+        修改真实订单状态。
+        
+        Args:
+            current_day: 当前天数（0-based）
+            planning_horizon: 规划时域（slot 数量）
+        """
+        self.cancel_speculative_planning()
+        
+        slots_per_day = self.config.SLOTS_PER_DAY
+        day_start_slot = current_day * slots_per_day + 1
+        day_end_slot = day_start_slot + slots_per_day - 1
+        next_slot = self.order_manager.time_to_slot(current_day + 1, hour=8)
+        
+        planned_today = {}
+        for (order_id, line, slot), qty in self.current_schedule.allocation.items():
+            if day_start_slot <= slot <= day_end_slot and qty > 0:
+                planned_today[order_id] = planned_today.get(order_id, 0) + qty
+        
+        projected_orders = []
+        for order in self.order_manager.get_eligible_orders(day_start_slot):
+            projected = copy.copy(order)
+            projected.remaining = max(0, order.remaining - planned_today.get(order.order_id, 0))
+            if projected.remaining > 0:
+                projected_orders.append(projected)
+        
+        if not projected_orders:
+            return
+        
+        if self._speculative_executor is None:
+            self._speculative_executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="speculative-planning"
+            )
+        # 后台 GA 使用独立的随机数生成器（种子取自前台随机流），不与前台争用全局 random，
+        # 同一种子的运行结果可复现
+        rng = random.Random(random.getrandbits(64))
+        stop_event = threading.Event()
+        future = self._speculative_executor.submit(
+            self._run_speculative_ga, projected_orders, planning_horizon, next_slot, rng, stop_event
+        )
+        self._speculative_job = (next_slot, future, stop_event)
+        self.speculative_stats['started'] += 1
+        logger.info("🔮 已在后台启动次日预优化（slot %d，%d 个积压订单）", next_slot, len(projected_orders))
+    
+    def _run_speculative_ga(self, projected_orders, planning_horizon, start_slot, rng, stop_event):
+        """
+        后台线程任务：对预估订单池运行 GA，返回 (订单ID顺序, 最优染色体)
+        
+        每代结束时检查 stop_event，被取消时尽快结束并返回 None。
+        """
+        def check_stop(generation, best_fitness):
+            if stop_event.is_set():
+                raise _SpeculativeCancelled()
+        
+        # 预优化不上报进度、不计入前台指标，只响应自身的取消标志
+        spec_config = copy.copy(self.config)
+        spec_config.GENERATION_CALLBACK = check_stop
+        spec_config.METRICS = None
+        spec_config.PROFILER = None
+        spec_config.RNG = rng
+        try:
+            best = run_ga(
+                projected_orders,
+                spec_config,
+                planning_horizon=planning_horizon,
+                start_slot=start_slot,
+            )
+        except _SpeculativeCancelled:
+            return None
+        return [o.order_id for o in projected_orders], best
+    
+    def _collect_speculative_seeds(self, current_slot, orders):
+        """
+        取回预优化结果并与实际订单池对齐，作为热启动种子
+        
+        Gene1 直接沿用（规划窗口相同）；Gene2 按订单ID重新映射到实际订单列表，
+        已完成的订单被剔除，新到达的订单按截止时间追加到优先级末尾。
+        
+        Args:
+            current_slot: 当前调度起始 slot
+            orders: 实际订单池 (List[Order])
+            
+        Returns:
+            list: 种子染色体列表；无可用预优化结果时返回 None
+        """
+        job = self._speculative_job
+        self._speculative_job = None
+        if job is None:
+            return None
+        
+        target_slot, future, stop_event = job
+        if target_slot != current_slot:
+            self._stop_speculative_job(job)
+            return None
+        
+        wait_start = time.perf_counter()
+        try:
+            result = future.result()
+        except Exception as e:
+            logger.warning("⚠️  次日预优化失败，回退为完整优化: %s", e)
+            return None
+        self.speculative_stats['wait_ms'] += (time.perf_counter() - wait_start) * 1000.0
+        
+        if result is None:
+            return None
+        spec_order_ids, best = result
+        if best is None:
+            return None
+        
+        index_of = {order.order_id: idx for idx, order in enumerate(orders)}
+        gene2 = []
+        for spec_idx in best.gene2:
+            if 0 <= spec_idx < len(spec_order_ids):
+                idx = index_of.get(spec_order_ids[spec_idx])
+                if idx is not None:
+                    gene2.append(idx)
+        seen = set(gene2)
+        arrivals = sorted(
+            (idx for idx in range(len(orders)) if idx not in seen),
+            key=lambda idx: orders[idx].due_slot
+        )
+        gene2.extend(arrivals)
+        
+        self.speculative_stats['used'] += 1
+        logger.info("🔮 对齐次日预优化结果: 沿用 %d 个订单，新到达 %d 个", len(seen), len(arrivals))
+        return [Chromosome(gene1=list(best.gene1), gene2=gene2)]
+    
+    def _stop_speculative_job(self, job):
+        """置位取消标志并等待后台 GA 在当前代结束后退出"""
+        _, future, stop_event = job
+        stop_event.set()
+        future.cancel()
+        if not future.done():
+            try:
+                future.result()
+            except Exception:
+                pass
+    
+    def cancel_speculative_planning(self):
+        """
+        取消尚未被使用的预优化任务并关闭后台线程（例如模拟结束或跳过优化时）
+        
+        返回时后台 GA 已经停止，不会再占用 CPU 或继续修改任何状态。
+        """
+        if self._speculative_job is not None:
+            job = self._speculative_job
+            self._speculative_job = None
+            self._stop_speculative_job(job)
+        if self._speculative_executor is not None:
+            self._speculative_executor.shutdown(wait=True)
+            self._speculative_executor = None
+    
+    def get_state(self):
+        """
+        导出调度器状态（用于按天断点续跑）
+        
+        若存在进行中的次日预优化，会先等待其完成并保存结果，
+        以便恢复后仍能用同一结果热启动。
+        
+        Returns:
+            dict: 调度器状态
+        """
+        speculative_result = None
+        if self._speculative_job is not None:
+            target_slot, future, _ = self._speculative_job
+            try:
+                result = future.result()
+                if result is not None:
+                    spec_order_ids, best = result
+                    speculative_result = (target_slot, spec_order_ids, best)
+            except Exception:
+                speculative_result = None
+        
+        return {
+            'current_schedule': self.current_schedule,
+            'frozen_watermark': max(self.frozen_slots) if self.frozen_slots else 0,
+            'cumulative_stats': copy.deepcopy(self.cumulative_stats),
+            'repair_latencies': list(self.repair_latencies),
+            'plan_churn': list(self.plan_churn),
+            'speculative_stats': dict(self.speculative_stats),
+            'speculative_result': speculative_result,
+            'plan_projection': self._plan_projection,
+            'evicted_metrics': dict(self._evicted_metrics)
+        }
+    
+    def set_state(self, state):
+        """
+        恢复调度器状态
+        
+        Args:
+            state: get_state 导出的状态字典
+        """
+        self.cancel_speculative_planning()
+        self.current_schedule = state['current_schedule']
+        self.frozen_slots = list(range(1, state['frozen_watermark'] + 1))
+        self.cumulative_stats = copy.deepcopy(state['cumulative_stats'])
+        self.repair_latencies = list(state['repair_latencies'])
+        self.plan_churn = list(state.get('plan_churn', []))
+        self.speculative_stats = dict(state['speculative_stats'])
+        self._plan_projection = state['plan_projection']
+        self._evicted_metrics = dict(state.get('evicted_metrics', {'revenue': 0.0, 'penalty': 0.0}))
+        
+        speculative_result = state['speculative_result']
+        if speculative_result is not None:
+            target_slot, spec_order_ids, best = speculative_result
+            future = Future()
+            future.set_result((spec_order_ids, best))
+            self._speculative_job = (target_slot, future, threading.Event())
+    
+    def update_schedule(self, new_schedule, start_slot=None):
         """
         更新当前调度方案
         
-        将新的调度方案合并到全局调度中，保留已冻结 slot 的分配。
+        计算当前方案与新方案在未冻结范围内的差异补丁并原地应用：保留已冻结 slot 的分配，
+        新增/修改新方案中的分配，并删除旧方案中不再出现的未来分配。指标按补丁差量更新，
+        补丁统计记录为当天的计划变动（plan churn）。
         
         Args:
             new_schedule: 新的调度方案 (Schedule)
+            start_slot: 第一个未冻结的 slot，默认为冻结范围之后的第一个 slot
+            
+        Returns:
+            SchedulePatch: 本次合并应用的补丁
         """
+        if start_slot is None:
+            start_slot = max(self.frozen_slots) + 1 if self.frozen_slots else 1
+        
         if self.current_schedule is None:
-            # 第一次调度，直接使用新方案
+            # 第一次调度，直接使用新方案，并以全部订单为口径计算一次指标（后续按差量更新）
+            patch = Schedule().diff(new_schedule, start_slot)
             self.current_schedule = new_schedule
-        else:
-            # 合并方案：保留冻结 slot，更新未来 slot
-            for (order_id, line, slot), qty in new_schedule.allocation.items():
-                if slot not in self.frozen_slots:
-                    # 只更新未冻结的 slot
-                    self.current_schedule.allocation[(order_id, line, slot)] = qty
-            
-            # 重新计算指标
-            orders = self.order_manager.get_all_orders()
             self.current_schedule.calculate_metrics(
-                orders, 
-                self.config.LABOR_COSTS, 
+                self.order_manager.get_all_orders(),
+                self.config.LABOR_COSTS,
                 self.config.PENALTY_RATE
             )
+            self._add_evicted_metrics(self.current_schedule)
+        else:
+            # 合并方案：只在未冻结范围内比较并应用差异
+            patch = self.current_schedule.diff(new_schedule, start_slot)
+            self.current_schedule.apply(
+                patch,
+                orders=self.order_manager.orders,
+                labor_costs=self.config.LABOR_COSTS,
+                penalty_rate=self.config.PENALTY_RATE
+            )
+        
+        self._check_schedule_metrics("合并计划")
+        
+        churn = patch.summary()
+        churn['day'] = (start_slot - 1) // self.config.SLOTS_PER_DAY + 1
+        self.plan_churn.append(churn)
+        return patch
+    
+    def _check_schedule_metrics(self, context):
+        """
+        校验当前方案的增量指标与全量重算一致（CHECK_INCREMENTAL_METRICS 开启时）
+        
+        Raises:
+            RuntimeError: 增量维护的收入、成本或罚款与全量重算不一致
+        """
+        if not getattr(self.config, "CHECK_INCREMENTAL_METRICS", False):
+            return
+        schedule = self.current_schedule
+        reference = Schedule()
+        reference.allocation = schedule.allocation
+        reference.order_completion = schedule.order_completion
+        reference.calculate_metrics(
+            self.order_manager.get_all_orders(),
+            self.config.LABOR_COSTS,
+            self.config.PENALTY_RATE
+        )
+        self._add_evicted_metrics(reference)
+        for name in ('revenue', 'cost', 'penalty', 'profit'):
+            incremental = getattr(schedule, name)
+            expected = getattr(reference, name)
+            if not math.isclose(incremental, expected, rel_tol=1e-9, abs_tol=1e-6):
+                raise RuntimeError(
+                    f"{context}后方案指标 {name} 不一致: 增量 {incremental:.6f}，全量重算 {expected:.6f}"
+                )
+    
+    def _ingest_arrivals(self, until_slot):
+        """
+        拉取到达流中的新订单，并把本次淘汰的已完成订单移出当前方案的指标口径
+        
+        被淘汰订单按淘汰时的完成量记录其收入与罚款，全量重算指标时补回，
+        使增量指标与全量重算一致。
+        
+        Args:
+            until_slot: 当前触发时刻对应的slot（1-based）
+        """
+        self.order_manager.ingest_arrivals(until_slot)
+        evicted = self.order_manager.drain_evicted_orders()
+        if not evicted:
+            return
+        completion = self.current_schedule.order_completion if self.current_schedule is not None else {}
+        penalty_rate = self.config.PENALTY_RATE
+        for order in evicted:
+            completed_qty = completion.get(order.order_id, 0)
+            self._evicted_metrics['revenue'] += completed_qty * order.unit_price
+            if completed_qty < order.quantity:
+                self._evicted_metrics['penalty'] += order.quantity * order.unit_price * penalty_rate
+        if self.current_schedule is not None:
+            self.current_schedule.retire_orders(order.order_id for order in evicted)
+    
+    def _add_evicted_metrics(self, schedule):
+        """把已淘汰订单计入的收入与罚款加到按现存订单计算的方案指标上"""
+        schedule.revenue += self._evicted_metrics['revenue']
+        schedule.penalty += self._evicted_metrics['penalty']
+        schedule.profit = schedule.revenue - schedule.cost - schedule.penalty
+    
+    def get_plan_churn_report(self):
+        """
+        获取每日计划变动（plan churn）报告
+        
+        Returns:
+            list: 每次计划合并一条记录，含 day、新增/删除/修改的分配数、增减的生产数量、
+                  涉及的订单数与 (line, slot) 单元数
+        """
+        return list(self.plan_churn)
     
     def get_current_schedule(self):
         """
@@ -299,8 +785,19 @@ class RollingScheduler:
         daily_cost = 0.0
         completed_orders_today = set()
         
+        # 日内到达的订单（8点之后释放）：在其到达的 slot 执行前触发快速重排
+        intraday_arrivals = {}
+        if getattr(self.config, "ENABLE_INTRADAY_REPAIR", False):
+            # 到达流中当天释放的订单仍只在其到达的 slot 触发重排
+            self._ingest_arrivals(day_end_slot)
+            for order in self.order_manager.get_eligible_orders(day_end_slot):
+                if order.release_slot > day_start_slot:
+                    intraday_arrivals.setdefault(order.release_slot, []).append(order)
+        
         # 执行当天所有slot的生产
         for slot in range(day_start_slot, day_end_slot + 1):
+            for order in intraday_arrivals.get(slot, []):
+                self.on_order_arrival(order, slot)
             slot_stats = self.execute_slot(slot)
             daily_revenue += slot_stats['revenue']
             daily_cost += slot_stats['cost']
@@ -341,9 +838,9 @@ class RollingScheduler:
         # 统计该slot有哪些产线在工作
         working_lines_set = set()
         
-        # 获取该 slot 的所有分配
-        for (order_id, line, s), qty in self.current_schedule.allocation.items():
-            if s == slot and qty > 0:
+        # 获取该 slot 的所有分配（基于方案的时间段索引）
+        for order_id, line, qty in self.current_schedule.get_slot_allocations(slot):
+            if qty > 0:
                 # 更新订单的remaining（减少剩余量）
                 order = self.order_manager.get_order(order_id)
                 if order:
@@ -361,6 +858,9 @@ class RollingScheduler:
                         # 记录完成时的时段
                         if order.completed_slot is None:
                             order.completed_slot = slot
+                        self.cumulative_stats['completed_orders'] += 1
+                        if order.completed_slot < order.due_slot:
+                            self.cumulative_stats['on_time_orders'] += 1
                     
                     # 记录该产线在工作
                     working_lines_set.add(line)
@@ -375,12 +875,263 @@ class RollingScheduler:
         if slot not in self.frozen_slots:
             self.frozen_slots.append(slot)
         
+        # 更新运行总计
+        self.cumulative_stats['total_revenue'] += slot_revenue
+        self.cumulative_stats['total_cost'] += slot_cost
+        self.cumulative_stats['total_profit'] += slot_revenue - slot_cost
+        
         return {
             'revenue': slot_revenue,
             'cost': slot_cost,
             'completed_orders': completed_orders
         }
     
+    def on_order_arrival(self, order, slot):
+        """
+        日内订单到达事件（事件驱动快速重排）
+        
+        8点之后到达的订单无需等待次日调度：在当天剩余未冻结的 slot 内，
+        将订单贪心插入同产品的空余产能、空闲产线或低价值格子，
+        随后在时延预算内执行一次短局部搜索。完整 GA 仍由每日 8 点调度承担。
+        
+        Args:
+            order: 新到达的订单 (Order)
+            slot: 订单到达时刻对应的 slot（1-based）
+            
+        Returns:
+            int: 本次插入到当天计划中的数量
+        """
+        start_time = time.perf_counter()
+        budget_ms = float(getattr(self.config, "INTRADAY_REPAIR_BUDGET_MS", 50.0))
+        deadline = start_time + budget_ms / 1000.0
+        
+        if self.order_manager.get_order(order.order_id) is None:
+            self.order_manager.add_order(order)
+        if self.current_schedule is None:
+            self.current_schedule = Schedule()
+        # 新订单先计入方案指标（未插入部分按罚款计）
+        self._apply_adjustments({})
+        
+        # 重排窗口：当天剩余、未冻结且位于订单时间窗口 [release_slot, due_slot) 内的 slot
+        slots_per_day = self.config.SLOTS_PER_DAY
+        day_end_slot = ((slot - 1) // slots_per_day + 1) * slots_per_day
+        window_start = max(slot, order.release_slot)
+        window_end = min(day_end_slot, order.due_slot - 1)
+        frozen = set(self.frozen_slots)
+        window = [s for s in range(window_start, window_end + 1) if s not in frozen]
+        
+        inserted = 0
+        if window and order.remaining > 0:
+            inserted = self._greedy_insert(order, window, deadline)
+            ls_iter = int(getattr(self.config, "INTRADAY_REPAIR_LS_ITER", 0))
+            if ls_iter > 0 and inserted > 0:
+                self._repair_local_search(window, ls_iter, deadline)
+        self._check_schedule_metrics("日内重排")
+        
+        latency_ms = (time.perf_counter() - start_time) * 1000.0
+        self.repair_latencies.append(latency_ms)
+        logger.info(
+            "⚡ 日内重排: 订单 %s 于 slot %d 到达，插入 %d/%d，耗时 %.2fms",
+            order.order_id, slot, inserted, order.remaining, latency_ms
+        )
+        
+        return inserted
+    
+    def _slot_labor_cost(self, slot):
+        """获取某个 slot 单条产线的人工成本（与 execute_slot 的取值方式一致）"""
+        if not self.config.LABOR_COSTS:
+            return 0.0
+        slot_index = (slot - 1) % self.config.SLOTS_PER_DAY
+        return self.config.LABOR_COSTS[slot_index]
+    
+    def _collect_cells(self, window):
+        """收集窗口内各 (line, slot) 的分配 {(line, slot): [(order_id, qty), ...]}"""
+        window_set = set(window)
+        cells = {}
+        for (order_id, line, s), qty in self.current_schedule.allocation.items():
+            if s in window_set and qty > 0:
+                cells.setdefault((line, s), []).append((order_id, qty))
+        return cells
+    
+    def _apply_adjustments(self, adjustments):
+        """
+        以补丁形式将分配增量应用到当前方案，同步订单完成量并按差量更新方案指标
+        
+        Args:
+            adjustments: {(order_id, line, slot): 数量增量}
+        """
+        schedule = self.current_schedule
+        patch = SchedulePatch()
+        for key, delta in adjustments.items():
+            if delta == 0:
+                continue
+            old_qty = schedule.allocation.get(key, 0)
+            new_qty = old_qty + delta
+            if old_qty <= 0:
+                if new_qty > 0:
+                    patch.added.append((key, new_qty))
+            elif new_qty <= 0:
+                patch.removed.append((key, old_qty))
+            else:
+                patch.changed.append((key, old_qty, new_qty))
+        schedule.apply(
+            patch,
+            orders=self.order_manager.orders,
+            labor_costs=self.config.LABOR_COSTS,
+            penalty_rate=self.config.PENALTY_RATE
+        )
+    
+    def _greedy_insert(self, order, window, deadline):
+        """
+        贪心插入：依次尝试同产品空余产能、空闲产线、低价值格子
+        
+        - 同产品空余产能：不增加人工成本，最优先，按时间升序；
+        - 空闲产线：收益需覆盖该 slot 的人工成本，按成本升序；
+        - 其他产品的格子：仅当新订单收益高于被挤出分配的收益时替换，按原价值升序。
+        
+        Returns:
+            int: 插入数量
+        """
+        cells = self._collect_cells(window)
+        capacity = self.config.CAPACITY.get(order.product, 0)
+        planned = sum(
+            qty for entries in cells.values()
+            for order_id, qty in entries if order_id == order.order_id
+        )
+        need = order.remaining - planned
+        if need <= 0 or capacity <= 0:
+            return 0
+        
+        def entries_value(entries):
+            value = 0.0
+            for order_id, qty in entries:
+                o = self.order_manager.get_order(order_id)
+                if o:
+                    value += qty * o.unit_price
+            return value
+        
+        def entries_product(entries):
+            o = self.order_manager.get_order(entries[0][0])
+            return o.product if o else 0
+        
+        candidates = []  # (类别, 排序键, slot, line)
+        for s in window:
+            for line in range(1, self.config.NUM_LINES + 1):
+                entries = cells.get((line, s))
+                if not entries:
+                    candidates.append((1, self._slot_labor_cost(s), s, line))
+                elif entries_product(entries) == order.product:
+                    if capacity - sum(q for _, q in entries) > 0:
+                        candidates.append((0, s, s, line))
+                else:
+                    candidates.append((2, entries_value(entries), s, line))
+        candidates.sort()
+        
+        inserted = 0
+        adjustments = defaultdict(int)
+        for kind, _, s, line in candidates:
+            if need <= 0 or time.perf_counter() > deadline:
+                break
+            entries = cells.get((line, s), [])
+            if kind == 0:
+                qty = min(capacity - sum(q for _, q in entries), need)
+                gain = qty * order.unit_price
+            elif kind == 1:
+                qty = min(capacity, need)
+                gain = qty * order.unit_price - self._slot_labor_cost(s)
+            else:
+                qty = min(capacity, need)
+                gain = qty * order.unit_price - entries_value(entries)
+            if qty <= 0 or gain <= 0:
+                continue
+            
+            if kind == 2:
+                # 挤出低价值分配，被挤出的数量留待次日 8 点调度重新安排
+                for order_id, q in entries:
+                    adjustments[(order_id, line, s)] -= q
+                entries = []
+            adjustments[(order.order_id, line, s)] += qty
+            cells[(line, s)] = entries + [(order.order_id, qty)]
+            need -= qty
+            inserted += qty
+        
+        self._apply_adjustments(adjustments)
+        return inserted
+    
+    def _repair_local_search(self, window, max_iter, deadline):
+        """
+        重排后的短局部搜索：合并格子
+        
+        尝试将某个工作格子的全部分配搬到同产品、有足够空余产能的其他格子，
+        收入不变而少开一条产线，节省该 slot 的人工成本。每轮只接受一次改进。
+        """
+        for _ in range(max_iter):
+            if time.perf_counter() > deadline:
+                break
+            cells = self._collect_cells(window)
+            products = {}
+            for key, entries in cells.items():
+                o = self.order_manager.get_order(entries[0][0])
+                products[key] = o.product if o else 0
+            
+            improved = False
+            # 优先清空人工成本高的格子
+            sources = sorted(cells, key=lambda k: self._slot_labor_cost(k[1]), reverse=True)
+            for src in sources:
+                entries = cells[src]
+                total = sum(q for _, q in entries)
+                capacity = self.config.CAPACITY.get(products[src], 0)
+                for dst, dst_entries in cells.items():
+                    if dst == src or products[dst] != products[src]:
+                        continue
+                    if capacity - sum(q for _, q in dst_entries) < total:
+                        continue
+                    dst_slot = dst[1]
+                    movable = True
+                    for order_id, _ in entries:
+                        o = self.order_manager.get_order(order_id)
+                        if o is None or not (o.release_slot <= dst_slot < o.due_slot):
+                            movable = False
+                            break
+                    if not movable:
+                        continue
+                    adjustments = defaultdict(int)
+                    for order_id, q in entries:
+                        adjustments[(order_id, src[0], src[1])] -= q
+                        adjustments[(order_id, dst[0], dst_slot)] += q
+                    self._apply_adjustments(adjustments)
+                    improved = True
+                    break
+                if improved:
+                    break
+            
+            if not improved:
+                break
+    
+    def get_repair_latency_stats(self):
+        """
+        获取日内重排耗时分位数
+        
+        Returns:
+            dict: {'count', 'p50', 'p90', 'p99', 'max'}（单位：毫秒）
+        """
+        latencies = sorted(self.repair_latencies)
+        if not latencies:
+            return {'count': 0, 'p50': 0.0, 'p90': 0.0, 'p99': 0.0, 'max': 0.0}
+        
+        def percentile(p):
+            # 最近秩法
+            rank = int(math.ceil(p / 100.0 * len(latencies)))
+            return latencies[min(len(latencies), max(1, rank)) - 1]
+        
+        return {
+            'count': len(latencies),
+            'p50': percentile(50),
+            'p90': percentile(90),
+            'p99': percentile(99),
+            'max': latencies[-1]
+        }
+    
     def get_statistics(self):
         """
         获取当前调度的统计信息
@@ -398,45 +1149,38 @@ class RollingScheduler:
         """
         获取累计统计信息（多日汇总）
         
+        直接读取运行总计，O(1) 返回，不再遍历每日结果与全部订单。
+        按期率以订单的实际完成时段判断（completed_slot < due_slot）；
+        数量不大于 0 的订单无需生产，计为按期完成。
+        
         Returns:
             dict: 累计统计信息
         """
-        if not self.cumulative_stats['daily_results']:
-            return {
-                'total_revenue': 0.0,
-                'total_cost': 0.0,
-                'total_penalty': 0.0,
-                'total_profit': 0.0
-            }
-        
-        # 累计所有天的收入、成本、罚款（都是增量，可累加）
-        total_revenue = sum(day['revenue'] for day in self.cumulative_stats['daily_results'])
-        total_cost = sum(day['cost'] for day in self.cumulative_stats['daily_results'])
-        total_penalty = sum(day['penalty'] for day in self.cumulative_stats['daily_results'])
-        
-        # 总利润 = 总收入 - 总成本 - 总罚款
-        total_profit = total_revenue - total_cost - total_penalty
-        
-        # 验证：总利润应该等于每日利润之和
-        profit_sum = sum(day['profit'] for day in self.cumulative_stats['daily_results'])
-        assert abs(total_profit - profit_sum) < 0.01, \
-            f"利润计算不一致: {total_profit} != {profit_sum}"
-        
-        # 获取最终订单完成情况
-        orders = self.order_manager.get_all_orders()
-        completed_orders = sum(1 for order in orders if order.remaining <= 0)
-        on_time_orders = sum(1 for order in orders if order.remaining <= 0)  # 简化版
-        
-        return {
-            'total_revenue': total_revenue,
-            'total_cost': total_cost,
-            'total_penalty': total_penalty,
-            'total_profit': total_profit,
-            'total_orders': len(orders),
+        stats = self.cumulative_stats
+        total_orders = self.order_manager.get_total_order_count()
+        completed_on_load = self.order_manager.get_completed_on_load_count()
+        completed_orders = stats['completed_orders'] + completed_on_load
+        on_time_orders = stats['on_time_orders'] + completed_on_load
+        
+        cumulative = {
+            'total_revenue': stats['total_revenue'],
+            'total_cost': stats['total_cost'],
+            'total_penalty': stats['total_penalty'],
+            'total_profit': stats['total_profit'],
+            'total_orders': total_orders,
             'completed_orders': completed_orders,
-            'on_time_rate': on_time_orders / len(orders) if orders else 0,
-            'daily_results': self.cumulative_stats['daily_results']
+            'on_time_orders': on_time_orders,
+            'penalized_orders': stats['penalized_orders'],
+            'on_time_rate': on_time_orders / total_orders if total_orders else 0,
+            'daily_results': stats['daily_results'],
+            'repair_latency': self.get_repair_latency_stats(),
+            'speculative': dict(self.speculative_stats),
+            'skipped_days': stats['skipped_days']
         }
+        metrics = get_metrics(self.config)
+        if metrics.enabled:
+            cumulative['metrics'] = metrics.snapshot()
+        return cumulative
     
     def calculate_daily_penalty(self, current_day):
         """
@@ -455,11 +1199,13 @@ class RollingScheduler:
             float: 当天新增罚款金额
         """
         daily_penalty = 0.0
-        orders = self.order_manager.get_all_orders()
         
         # 计算当天早上8点的slot（每天调度的起始时刻）
         current_slot = self.order_manager.time_to_slot(current_day, hour=8)
         
+        # 只检查已到期的未完成订单（订单索引查询）
+        orders = self.order_manager.get_orders_due_by(current_slot)
+        
         for order in orders:
             # 检查：订单截止时间 <= 当前时刻（当天早上8点）
             # 由于due_slot是截止日期当天早上8点，所以 current_slot >= due_slot 表示已超期
@@ -472,8 +1218,14 @@ class RollingScheduler:
                     
                     # 标记已罚款，避免重复
                     order.penalized = True
+                    self.cumulative_stats['penalized_orders'] += 1
                     
-                    print(f"  ⚠️  订单 {order.order_id} 到期未完成（due_slot={order.due_slot}），罚款 ¥{penalty:.2f}")
+                    logger.debug(
+                        "  ⚠️  订单 %s 到期未完成（due_slot=%d），罚款 ¥%.2f", order.order_id, order.due_slot, penalty
+                    )
+        
+        self.cumulative_stats['total_penalty'] += daily_penalty
+        self.cumulative_stats['total_profit'] -= daily_penalty
         
         return daily_penalty
     
@@ -5,7 +5,16 @@
 """
 import os
 import sys
-from typing import Tuple, Dict, Any
+import json
+import contextlib
+import time
+import shutil
+import hashlib
+import uuid
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, CancelledError, TimeoutError as FuturesTimeoutError
+from typing import Tuple, Dict, Any, Callable, Generator
 
 # 添加项目根目录到路径
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -13,6 +22,11 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from config import Config
 from scheduler.order_manager import OrderManager
 from scheduler.rolling_scheduler import RollingScheduler
+from scheduler.arrival_source import CsvReplaySource
+from scheduler.checkpoint import checkpoint_path, save_checkpoint, load_checkpoint, restore_checkpoint
+from logger import logging_scope
+from instrumentation import MetricsRegistry, get_metrics
+from profiling import RunProfiler
 from models.simulation_result import SimulationResult, DayResult
 
 
@@ -69,21 +83,94 @@ def load_orders(csv_path: str) -> OrderManager:
     return order_manager
 
 
-def run_schedule(
+def load_order_stream(csv_path: str, assume_sorted: bool = False) -> OrderManager:
+    """
+    以到达流方式接入CSV订单：每天8点只拉取截至当时已释放的订单，
+    已完成订单随后被淘汰，内存只与在途订单规模相关
+    
+    Args:
+        csv_path: CSV文件路径
+        assume_sorted: CSV是否已按release_slot排序（是则逐块流式回放）
+        
+    Returns:
+        OrderManager: 接入了到达流的订单管理器对象
+    """
+    order_manager = OrderManager()
+    order_manager.attach_arrival_source(CsvReplaySource(csv_path, assume_sorted=assume_sorted))
+    return order_manager
+
+
+def _order_progress(order, current_slot):
+    """
+    订单在 current_slot 时刻的进度（GUI 与结果文件使用的订单进度字典）
+    
+    Args:
+        order: 订单 (Order)
+        current_slot: 当天 8 点对应的 slot
+        
+    Returns:
+        dict: 订单进度
+    """
+    completed_qty = order.get_completed_quantity()
+    progress = completed_qty / order.quantity if order.quantity > 0 else 0.0
+    
+    # 判断是否按期
+    if order.is_completed():
+        # 已完成订单：使用实际完成时间判断
+        if order.completed_slot is not None:
+            is_on_time = order.completed_slot < order.due_slot
+        else:
+            # 如果没有记录完成时间（旧数据），使用当前时间判断
+            is_on_time = current_slot < order.due_slot
+    else:
+        # 未完成订单：如果当前时间已超过截止时间，标记为延期风险
+        is_on_time = current_slot < order.due_slot
+    
+    return {
+        'order_id': order.order_id,
+        'product': order.product,
+        'quantity': order.quantity,
+        'produced_today': 0,  # 需要从schedule中计算
+        'cumulative_produced': completed_qty,
+        'remaining': order.remaining,
+        'progress': progress,
+        'is_finished': order.is_completed(),
+        'is_on_time': is_on_time,
+        'due_slot': order.due_slot,
+        'unit_price': order.unit_price
+    }
+
+
+def iter_schedule(
     config: Config, 
     order_manager: OrderManager, 
-    num_days: int
-) -> Tuple[RollingScheduler, SimulationResult]:
+    num_days: int,
+    checkpoint_dir: str | None = None,
+    resume_from_day: int = 0,
+    result_dir: str | None = None
+) -> Generator[DayResult, None, Tuple[RollingScheduler, SimulationResult]]:
     """
-    运行完整调度周期，收集所有天的结果
+    逐天运行调度周期的生成器：每天优化与执行完成后立即产出当天结果
+    
+    调用方可在后续各天仍在计算时先展示已完成的天。生成器结束时的返回值
+    （StopIteration.value）为 (调度器, 完整模拟结果)；中途关闭生成器会丢弃
+    未使用的预优化任务，已产出的天仍保留在各自的 DayResult 中。
     
     Args:
         config: 配置对象
         order_manager: 订单管理器
         num_days: 模拟天数
+        checkpoint_dir: 快照目录（可选），设置后每天结束时保存一次状态快照
+        resume_from_day: 从第几天（0-based）继续模拟；>0 时从 checkpoint_dir
+                         读取前一天结束时的快照，前面各天的结果随快照一并恢复（不再产出）
+        result_dir: 结果目录（可选），设置后每天结束时将当天结果流式写入
+                    （见 models.result_io.load_simulation_result）；
+                    config.METRICS 已设置时结束后另写入 metrics.json；
+                    config.PROFILE 已设置时按天剖析所选阶段（见 profiling.RunProfiler），
+                    结果写入 config.PROFILE_DIR
         
-    Returns:
-        Tuple[RollingScheduler, SimulationResult]: 调度器对象和完整模拟结果
+    Yields:
+        DayResult: 当天结果（已记录到模拟结果中）
     """
     # 重置所有订单状态（重要：避免多次运行时状态累积）
     for order in order_manager.get_all_orders():
@@ -103,84 +190,794 @@ def run_schedule(
     # 创建滚动调度器
     scheduler = RollingScheduler(config, order_manager)
     
+    # 断点续跑：恢复前一天结束时的调度器、订单与随机数状态
+    if resume_from_day > 0:
+        if checkpoint_dir is None:
+            raise ValueError("resume_from_day > 0 时必须提供 checkpoint_dir")
+        if order_manager.has_arrival_source():
+            raise ValueError("接入订单到达流时不支持断点续跑")
+        checkpoint = load_checkpoint(checkpoint_path(checkpoint_dir, resume_from_day - 1))
+        restore_checkpoint(checkpoint, scheduler)
+        simulation_result = checkpoint['extra']['simulation_result']
+        simulation_result.num_days = num_days
+    
+    result_writer = None
+    if result_dir is not None:
+        # 结果文件格式依赖 NumPy，只在需要写出结果时导入
+        from models.result_io import SimulationResultWriter
+        result_writer = SimulationResultWriter(result_dir, num_days)
+    
+    # 性能剖析：调用方已设置 config.PROFILER 时直接使用（由调用方关闭）；
+    # 否则按 PROFILE 创建本次运行专用的剖析器，只在运行期间挂到配置上，结束时关闭并恢复
+    profiler = getattr(config, "PROFILER", None)
+    owned_profiler = None
+    if profiler is None and getattr(config, "PROFILE", None):
+        profiler = owned_profiler = RunProfiler.from_config(config)
+        config.PROFILER = owned_profiler
+    
     # 运行多天滚动调度，在每天执行后立即保存状态快照
-    for day in range(num_days):
-        # 执行当天调度
-        schedule = scheduler.run_daily_schedule(current_day=day)
-        
-        # 立即创建当天结果对象并保存状态快照
-        day_result = DayResult(day)
-        day_result.schedule = schedule
-        
-        # 从daily_results获取当天的财务数据
-        # 注意：run_daily_schedule执行后，daily_results已经添加了当天的数据
-        if day < len(scheduler.cumulative_stats['daily_results']):
-            daily_financial = scheduler.cumulative_stats['daily_results'][day]
-            day_result.set_financial(
-                revenue=daily_financial['revenue'],
-                cost=daily_financial['cost'],
-                penalty=daily_financial['penalty'],
-                profit=daily_financial['profit']
-            )
-        
-        # 收集当天结束时的订单进度快照
-        all_orders = order_manager.get_all_orders()
-        for order in all_orders:
-            # 计算订单进度
-            completed_qty = order.get_completed_quantity()
-            progress = completed_qty / order.quantity if order.quantity > 0 else 0.0
+    order_states = {}  # 最近一天结束时的订单进度 {order_id: order_progress}
+    previous_slot = None
+    try:
+        for day in range(resume_from_day, num_days):
+            # 执行当天调度
+            if profiler is not None:
+                with profiler.day(day):
+                    schedule = scheduler.run_daily_schedule(current_day=day)
+            else:
+                schedule = scheduler.run_daily_schedule(current_day=day)
+            
+            # 立即创建当天结果对象并保存状态快照
+            day_result = DayResult(day)
+            
+            # 从daily_results获取当天的财务数据
+            # 注意：run_daily_schedule执行后，daily_results已经添加了当天的数据
+            if day < len(scheduler.cumulative_stats['daily_results']):
+                daily_financial = scheduler.cumulative_stats['daily_results'][day]
+                day_result.set_financial(
+                    revenue=daily_financial['revenue'],
+                    cost=daily_financial['cost'],
+                    penalty=daily_financial['penalty'],
+                    profit=daily_financial['profit']
+                )
             
-            # 判断是否按期
+            # 当天结束时的订单进度：只为当天可能变化的订单重新生成进度
+            # （新增或被淘汰的订单、当天有生产的订单、截止时间在本次与上次记录之间的未完成订单），
+            # 首次记录时生成全部订单
             current_slot = order_manager.time_to_slot(day, hour=8)
-            if order.is_completed():
-                # 已完成订单：使用实际完成时间判断
-                if order.completed_slot is not None:
-                    is_on_time = order.completed_slot < order.due_slot
-                else:
-                    # 如果没有记录完成时间（旧数据），使用当前时间判断
-                    is_on_time = current_slot < order.due_slot
+            if previous_slot is None:
+                changed_ids = list(order_manager.orders)
             else:
-                # 未完成订单：如果当前时间已超过截止时间，标记为延期风险
-                is_on_time = current_slot < order.due_slot
+                changed_ids = set(order_manager.orders.keys() ^ order_states.keys())
+                current_schedule = scheduler.get_current_schedule()
+                if current_schedule is not None:
+                    for slot in range(day * config.SLOTS_PER_DAY + 1, (day + 1) * config.SLOTS_PER_DAY + 1):
+                        changed_ids.update(order_id for order_id, _, _ in current_schedule.get_slot_allocations(slot))
+                changed_ids.update(
+                    order.order_id for order in order_manager.get_orders_due_by(current_slot)
+                    if order.due_slot > previous_slot
+                )
+                changed_ids = sorted(changed_ids)
+            changed_states = {}
+            for order_id in changed_ids:
+                order = order_manager.get_order(order_id)
+                if order is None:
+                    order_states.pop(order_id, None)
+                    changed_states[order_id] = None
+                else:
+                    order_states[order_id] = changed_states[order_id] = _order_progress(order, current_slot)
+            previous_slot = current_slot
+            
+            # 以增量快照形式添加到模拟结果中（方案记录的是当天结束时的副本）
+            simulation_result.record_day_snapshot(
+                day_result, order_states, schedule, changed_states=changed_states
+            )
+            if result_writer is not None:
+                result_writer.write_day(day_result)
             
-            order_progress = {
-                'order_id': order.order_id,
-                'product': order.product,
-                'quantity': order.quantity,
-                'produced_today': 0,  # 需要从schedule中计算
-                'cumulative_produced': completed_qty,
-                'remaining': order.remaining,
-                'progress': progress,
-                'is_finished': order.is_completed(),
-                'is_on_time': is_on_time,
-                'due_slot': order.due_slot,
-                'unit_price': order.unit_price
-            }
+            # 保存当天结束时的快照
+            if checkpoint_dir is not None:
+                save_checkpoint(
+                    checkpoint_path(checkpoint_dir, day),
+                    scheduler,
+                    day,
+                    extra={'simulation_result': simulation_result}
+                )
             
-            day_result.add_order_progress(order.order_id, order_progress)
-        
-        # 添加到模拟结果中
-        simulation_result.add_day_result(day, day_result)
+            yield day_result
+    finally:
+        # 模拟结束或中途中止：丢弃不会再被使用的预优化任务
+        scheduler.cancel_speculative_planning()
+        if owned_profiler is not None:
+            owned_profiler.close()
+            config.PROFILER = None
     
     # 设置累计统计数据
     cumulative_stats = scheduler.get_cumulative_statistics()
     simulation_result.set_cumulative_stats(cumulative_stats)
+    if result_writer is not None:
+        result_writer.close(cumulative_stats)
+        metrics = get_metrics(config)
+        if metrics.enabled:
+            metrics.to_json(os.path.join(result_dir, 'metrics.json'))
     
     return scheduler, simulation_result
 
 
+def run_schedule(
+    config: Config, 
+    order_manager: OrderManager, 
+    num_days: int,
+    checkpoint_dir: str | None = None,
+    resume_from_day: int = 0,
+    result_dir: str | None = None,
+    on_day_complete: Callable[[DayResult], None] | None = None
+) -> Tuple[RollingScheduler, SimulationResult]:
+    """
+    运行完整调度周期，收集所有天的结果（iter_schedule 的阻塞版本）
+    
+    Args:
+        config: 配置对象
+        order_manager: 订单管理器
+        num_days: 模拟天数
+        checkpoint_dir: 快照目录（可选），设置后每天结束时保存一次状态快照
+        resume_from_day: 从第几天（0-based）继续模拟；>0 时从 checkpoint_dir
+                         读取前一天结束时的快照，前面各天的结果随快照一并恢复
+        result_dir: 结果目录（可选），设置后每天结束时将当天结果流式写入
+                    （见 models.result_io.load_simulation_result）
+        on_day_complete: 每天结果记录完成后的回调 on_day_complete(day_result)（可选），
+                         回调抛出的异常会中止模拟
+        
+    Returns:
+        Tuple[RollingScheduler, SimulationResult]: 调度器对象和完整模拟结果
+    """
+    days = iter_schedule(
+        config,
+        order_manager,
+        num_days,
+        checkpoint_dir=checkpoint_dir,
+        resume_from_day=resume_from_day,
+        result_dir=result_dir,
+    )
+    try:
+        while True:
+            try:
+                day_result = next(days)
+            except StopIteration as stop:
+                return stop.value
+            if on_day_complete is not None:
+                on_day_complete(day_result)
+    finally:
+        days.close()
+
+
+# ---------------------------------------------------------------------------
+# 结果缓存：按 CSV 内容、参数覆盖、天数与种子寻址，重复运行直接读取磁盘结果
+# ---------------------------------------------------------------------------
+
+RESULT_CACHE_VERSION = 1
+RESULT_CACHE_MAX_BYTES = 512 * 1024 * 1024  # 默认缓存总容量上限（512MB）
+
+
+def _file_digest(path: str, chunk_size: int = 1 << 20) -> str:
+    """计算文件内容的 SHA-256（分块读取）"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _normalize_overrides(config_overrides: Dict[str, Any] | None) -> Dict[str, Any]:
+    """
+    规范化参数覆盖：忽略配置中不存在的参数、回调等不可序列化的值，
+    以及与默认配置相同的取值，使等价的覆盖得到相同的缓存键
+    """
+    if not config_overrides:
+        return {}
+    defaults = load_default_config()
+    normalized = {}
+    for k, v in config_overrides.items():
+        if not hasattr(defaults, k) or callable(v):
+            continue
+        if getattr(defaults, k) == v:
+            continue
+        normalized[k] = v
+    return normalized
+
+
+class ResultCache:
+    """
+    模拟结果磁盘缓存
+    
+    每个缓存项是 cache_dir 下以键命名的目录：模拟结果以 models.result_io 格式保存，
+    调度器最终状态以快照（scheduler.pkl）保存，命中时据此重建调度器。
+    缓存项先写入临时目录再原子改名；总容量超过上限时按最近使用时间淘汰最旧的项。
+    """
+    
+    def __init__(self, cache_dir: str, max_bytes: int = RESULT_CACHE_MAX_BYTES):
+        """
+        Args:
+            cache_dir: 缓存目录
+            max_bytes: 缓存总容量上限（字节）
+        """
+        os.makedirs(cache_dir, exist_ok=True)
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+    
+    def make_key(self, csv_path: str, config_overrides: Dict[str, Any] | None,
+                 num_days: int, seed: int | None) -> str:
+        """
+        计算缓存键
+        
+        Args:
+            csv_path: 订单CSV文件路径（按内容而非路径寻址）
+            config_overrides: 配置参数覆盖
+            num_days: 模拟天数
+            seed: 随机种子（None 表示未设种子的运行）
+            
+        Returns:
+            str: 缓存键（十六进制摘要）
+        """
+        from models.result_io import RESULT_FORMAT_VERSION
+        payload = {
+            'version': RESULT_CACHE_VERSION,
+            'result_format': RESULT_FORMAT_VERSION,
+            'csv': _file_digest(csv_path),
+            'overrides': _normalize_overrides(config_overrides),
+            'num_days': num_days,
+            'seed': seed,
+        }
+        text = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=repr)
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+    
+    def _entry_dir(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key)
+    
+    def get(self, key: str, config: Config, csv_path: str) -> Tuple[RollingScheduler, SimulationResult] | None:
+        """
+        读取缓存项
+        
+        Args:
+            key: 缓存键
+            config: 配置对象（用于重建调度器）
+            csv_path: 订单CSV文件路径（用于重建订单管理器）
+            
+        Returns:
+            Tuple[RollingScheduler, SimulationResult] | None: 命中时返回调度器与模拟结果，否则 None
+        """
+        entry_dir = self._entry_dir(key)
+        if not os.path.isdir(entry_dir):
+            return None
+        from models.result_io import load_simulation_result
+        try:
+            simulation_result = load_simulation_result(entry_dir)
+            checkpoint = load_checkpoint(os.path.join(entry_dir, 'scheduler.pkl'))
+        except (OSError, ValueError, KeyError):
+            # 损坏或版本不兼容的缓存项直接丢弃
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            return None
+        scheduler = RollingScheduler(config, load_orders(csv_path))
+        restore_checkpoint(checkpoint, scheduler)
+        # 更新最近使用时间，供淘汰使用
+        os.utime(entry_dir)
+        return scheduler, simulation_result
+    
+    def put(self, key: str, scheduler: RollingScheduler, simulation_result: SimulationResult):
+        """
+        写入缓存项，并在超过容量上限时淘汰最久未使用的项
+        
+        Args:
+            key: 缓存键
+            scheduler: 运行结束后的调度器
+            simulation_result: 模拟结果
+        """
+        from models.result_io import save_simulation_result
+        entry_dir = self._entry_dir(key)
+        tmp_dir = f"{entry_dir}.tmp-{uuid.uuid4().hex}"
+        try:
+            save_simulation_result(simulation_result, tmp_dir)
+            save_checkpoint(
+                os.path.join(tmp_dir, 'scheduler.pkl'),
+                scheduler,
+                simulation_result.num_days - 1
+            )
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            os.replace(tmp_dir, entry_dir)
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        self.evict()
+    
+    def evict(self):
+        """按最近使用时间淘汰缓存项，直到总容量不超过上限"""
+        entries = []
+        total = 0
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            if not os.path.isdir(path) or '.tmp-' in name:
+                continue
+            size = sum(
+                os.path.getsize(os.path.join(root, filename))
+                for root, _, filenames in os.walk(path)
+                for filename in filenames
+            )
+            entries.append((os.path.getmtime(path), size, path))
+            total += size
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+    
+    def clear(self):
+        """清空缓存"""
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            if os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+
+
 def run_full_cycle(
     num_days: int,
     csv_path: str,
     config_overrides: Dict[str, Any] | None = None,
+    checkpoint_dir: str | None = None,
+    resume_from_day: int = 0,
+    stream_orders: bool = False,
+    result_dir: str | None = None,
+    on_day_complete: Callable[[DayResult], None] | None = None,
+    seed: int | None = None,
+    cache_dir: str | None = None,
+    cache_max_bytes: int = RESULT_CACHE_MAX_BYTES,
+    collect_metrics: bool = False,
+    profile: bool | str | None = None,
+    profile_dir: str | None = None,
 ) -> Tuple[RollingScheduler, SimulationResult]:
     """
     一次性运行完整周期（新方案接口），支持参数覆盖并返回 SimulationResult
+
+    checkpoint_dir / resume_from_day 含义同 run_schedule，用于按天断点续跑。
+    stream_orders=True 时以到达流方式逐日接入订单（见 load_order_stream）。
+    result_dir 设置后逐日将结果写入该目录；on_day_complete 含义同 run_schedule。
+    seed 设置后在运行前重置随机数种子，结果可复现。
+    cache_dir 设置后启用结果缓存（见 ResultCache）：CSV 内容、参数覆盖、天数与种子均相同时
+    直接返回缓存结果而不重新优化；断点续跑与到达流模式不使用缓存。
+    collect_metrics=True 时采集性能指标（见 instrumentation.MetricsRegistry），
+    结果附在累计统计的 'metrics' 字段中；需要实际运行优化，因此不使用缓存。
+    profile 设置后按天剖析所选阶段（True / "all" 或阶段列表，见 profiling.parse_phases），
+    .prof 与摘要写入 profile_dir（默认 config.PROFILE_DIR）；同样不使用缓存。
     """
     config = load_default_config()
     if config_overrides:
         for k, v in config_overrides.items():
             if hasattr(config, k):
                 setattr(config, k, v)
-    order_manager = load_orders(csv_path)
-    return run_schedule(config, order_manager, num_days)
+    if collect_metrics:
+        config.METRICS = MetricsRegistry()
+    if profile:
+        config.PROFILE = profile
+    if profile_dir is not None:
+        config.PROFILE_DIR = profile_dir
+    
+    cache = None
+    if (cache_dir is not None and resume_from_day == 0 and not stream_orders
+            and not collect_metrics and not getattr(config, "PROFILE", None)):
+        cache = ResultCache(cache_dir, cache_max_bytes)
+        key = cache.make_key(csv_path, config_overrides, num_days, seed)
+        cached = cache.get(key, config, csv_path)
+        if cached is not None:
+            scheduler, simulation_result = cached
+            if result_dir is not None:
+                from models.result_io import save_simulation_result
+                save_simulation_result(simulation_result, result_dir)
+            if on_day_complete is not None:
+                for day_index in sorted(simulation_result.days):
+                    on_day_complete(simulation_result.days[day_index])
+            return scheduler, simulation_result
+    
+    if seed is not None:
+        random.seed(seed)
+    order_manager = load_order_stream(csv_path) if stream_orders else load_orders(csv_path)
+    scheduler, simulation_result = run_schedule(
+        config,
+        order_manager,
+        num_days,
+        checkpoint_dir=checkpoint_dir,
+        resume_from_day=resume_from_day,
+        result_dir=result_dir,
+        on_day_complete=on_day_complete,
+    )
+    if cache is not None:
+        cache.put(key, scheduler, simulation_result)
+    return scheduler, simulation_result
+
+
+# ---------------------------------------------------------------------------
+# 后台任务接口：GUI 提交完整周期后立即返回，通过 poll 查询进度，可随时取消
+# ---------------------------------------------------------------------------
+
+class JobCancelled(Exception):
+    """后台调度任务已被取消"""
+
+
+class _CycleJob:
+    """后台调度任务的状态（由工作线程写入，poll 读取）"""
+    
+    def __init__(self, job_id: str, num_days: int):
+        self.job_id = job_id
+        self.num_days = num_days
+        self.future = None
+        self.finished_at = None  # 任务结束（完成、失败或取消）的时刻（time.monotonic）
+        self.cancel_event = threading.Event()
+        self.lock = threading.Lock()
+        self.progress = {
+            'completed_days': 0,
+            'current_day': None,
+            'generation': 0,
+            'best_fitness': None,
+        }
+
+
+# 已结束但未被 result() 取回的任务记录保留的时长（秒），超时后在下一次访问任务表时淘汰
+JOB_TTL_SECONDS = 600.0
+
+_jobs: Dict[str, _CycleJob] = {}
+_jobs_lock = threading.Lock()
+_job_executor = None
+_job_executor_lock = threading.Lock()
+
+
+def _evict_expired_jobs():
+    """淘汰结束时间超过 JOB_TTL_SECONDS 的任务记录（调用方需持有 _jobs_lock）"""
+    now = time.monotonic()
+    expired = [
+        job_id for job_id, job in _jobs.items()
+        if job.finished_at is not None and now - job.finished_at > JOB_TTL_SECONDS
+    ]
+    for job_id in expired:
+        del _jobs[job_id]
+
+
+def _mark_job_finished(job: _CycleJob):
+    def on_done(future):
+        job.finished_at = time.monotonic()
+    return on_done
+
+
+def _get_job_executor():
+    """任务执行器：单工作线程，任务按提交顺序依次运行（GA 使用全局随机数，避免并发干扰）"""
+    global _job_executor
+    with _job_executor_lock:
+        if _job_executor is None:
+            _job_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="schedule-job")
+        return _job_executor
+
+
+def _run_cycle_job(job: _CycleJob, num_days: int, csv_path: str,
+                   config_overrides: Dict[str, Any] | None, seed: int | None, **kwargs):
+    """工作线程：运行完整周期，并通过回调上报进度、检查取消"""
+    def check_cancel():
+        if job.cancel_event.is_set():
+            raise JobCancelled(job.job_id)
+    
+    def on_generation(generation, best_fitness):
+        check_cancel()
+        with job.lock:
+            job.progress['generation'] = generation
+            job.progress['best_fitness'] = best_fitness
+    
+    def on_day_complete(day_result):
+        with job.lock:
+            completed_days = day_result.day_index + 1
+            job.progress['completed_days'] = completed_days
+            job.progress['current_day'] = completed_days + 1 if completed_days < num_days else None
+            job.progress['generation'] = 0
+        if job.cancel_event.is_set():
+            raise JobCancelled(job.job_id)
+    
+    if job.cancel_event.is_set():
+        raise JobCancelled(job.job_id)
+    with job.lock:
+        job.progress['current_day'] = 1
+    overrides = dict(config_overrides or {})
+    overrides['GENERATION_CALLBACK'] = on_generation
+    overrides['CANCEL_CHECK'] = check_cancel
+    return run_full_cycle(
+        num_days, csv_path, config_overrides=overrides, on_day_complete=on_day_complete,
+        seed=seed, **kwargs
+    )
+
+
+def submit_cycle(
+    num_days: int,
+    csv_path: str,
+    config_overrides: Dict[str, Any] | None = None,
+    seed: int | None = None,
+    **kwargs
+) -> str:
+    """
+    在后台提交一次完整周期运行（参数同 run_full_cycle），立即返回任务ID
+    
+    Args:
+        num_days: 模拟天数
+        csv_path: 订单CSV文件路径
+        config_overrides: 配置参数覆盖
+        seed: 随机种子（可选），设置后结果可复现
+        **kwargs: 传给 run_full_cycle 的其余参数（checkpoint_dir、result_dir 等）
+        
+    Returns:
+        str: 任务ID
+    """
+    job = _CycleJob(uuid.uuid4().hex, num_days)
+    job.future = _get_job_executor().submit(
+        _run_cycle_job, job, num_days, csv_path, config_overrides, seed, **kwargs
+    )
+    job.future.add_done_callback(_mark_job_finished(job))
+    with _jobs_lock:
+        _evict_expired_jobs()
+        _jobs[job.job_id] = job
+    return job.job_id
+
+
+def _get_job(job_id: str) -> _CycleJob:
+    with _jobs_lock:
+        _evict_expired_jobs()
+        job = _jobs.get(job_id)
+    if job is None:
+        raise KeyError(f"未知的任务ID: {job_id}")
+    return job
+
+
+def _remove_job(job_id: str):
+    with _jobs_lock:
+        _jobs.pop(job_id, None)
+
+
+def poll(job_id: str) -> Dict[str, Any]:
+    """
+    查询任务进度
+    
+    Args:
+        job_id: 任务ID
+        
+    Returns:
+        dict: status（pending/running/cancelling/cancelled/failed/done）、num_days、
+              completed_days、current_day（1-based，正在计算的天）、generation（当天 GA 当前代数）、
+              best_fitness（当天 GA 当前最优适应度）、error（失败原因）
+    """
+    job = _get_job(job_id)
+    with job.lock:
+        info = dict(job.progress)
+    info['job_id'] = job_id
+    info['num_days'] = job.num_days
+    info['error'] = None
+    
+    future = job.future
+    if future.cancelled():
+        info['status'] = 'cancelled'
+    elif future.done():
+        error = future.exception()
+        if isinstance(error, JobCancelled):
+            info['status'] = 'cancelled'
+        elif error is not None:
+            info['status'] = 'failed'
+            info['error'] = str(error)
+        else:
+            info['status'] = 'done'
+    elif job.cancel_event.is_set():
+        info['status'] = 'cancelling'
+    elif future.running():
+        info['status'] = 'running'
+    else:
+        info['status'] = 'pending'
+    return info
+
+
+def cancel(job_id: str) -> bool:
+    """
+    取消任务：排队中的任务直接移除；运行中的任务在当前 GA 代或当天结束时中止
+    
+    Args:
+        job_id: 任务ID
+        
+    Returns:
+        bool: 任务是否尚未结束（即取消请求有效）
+    """
+    job = _get_job(job_id)
+    if job.future.done():
+        return False
+    job.cancel_event.set()
+    job.future.cancel()
+    return True
+
+
+def result(job_id: str, timeout: float | None = None) -> Tuple[RollingScheduler, SimulationResult]:
+    """
+    获取任务结果（任务未结束时等待），取回后任务记录被移除
+    
+    未被取回的已结束任务（包括已取消的任务）在结束 JOB_TTL_SECONDS 秒后自动淘汰。
+    
+    Args:
+        job_id: 任务ID
+        timeout: 最长等待秒数，None 表示一直等待
+        
+    Returns:
+        Tuple[RollingScheduler, SimulationResult]: 同 run_full_cycle
+        
+    Raises:
+        JobCancelled: 任务已被取消
+        concurrent.futures.TimeoutError: 等待超时
+    """
+    job = _get_job(job_id)
+    try:
+        outcome = job.future.result(timeout=timeout)
+    except CancelledError:
+        _remove_job(job_id)
+        raise JobCancelled(job_id)
+    except FuturesTimeoutError:
+        raise
+    except BaseException:
+        _remove_job(job_id)
+        raise
+    _remove_job(job_id)
+    return outcome
+
+
+# ---------------------------------------------------------------------------
+# 批量多场景运行：将场景分发到进程池，每个工作进程对同一 CSV 只加载一次
+# ---------------------------------------------------------------------------
+
+# 工作进程内的订单缓存 {csv_path: OrderManager}，run_schedule 开始时会重置订单进度，可跨场景复用
+_worker_order_managers: Dict[str, OrderManager] = {}
+
+
+def _init_batch_worker(csv_paths=()):
+    """工作进程初始化：预先加载常用 CSV，使首个场景不再承担解析开销"""
+    for csv_path in csv_paths:
+        csv_path = os.path.abspath(csv_path)
+        if csv_path not in _worker_order_managers:
+            _worker_order_managers[csv_path] = load_orders(csv_path)
+
+
+def create_batch_pool(max_workers: int | None = None, preload_csv_paths=()) -> ProcessPoolExecutor:
+    """
+    创建可复用的批量运行进程池（常驻服务用），并立即启动全部工作进程
+    
+    Args:
+        max_workers: 工作进程数，默认为 CPU 核数
+        preload_csv_paths: 各工作进程启动时预先加载的 CSV 路径
+        
+    Returns:
+        ProcessPoolExecutor: 进程池，可传给 run_batch(executor=...)
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    pool = ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=_init_batch_worker,
+        initargs=(tuple(preload_csv_paths),)
+    )
+    # 提交空任务触发工作进程启动（含模块导入与 CSV 预加载）
+    for future in [pool.submit(os.getpid) for _ in range(max_workers)]:
+        future.result()
+    return pool
+
+
+def _normalize_scenario(scenario) -> Dict[str, Any]:
+    """场景 (csv_path, config_overrides, num_days, seed) 或同名键的字典 -> 字典"""
+    if isinstance(scenario, dict):
+        normalized = {
+            'name': scenario.get('name'),
+            'csv_path': scenario['csv_path'],
+            'config_overrides': scenario.get('config_overrides'),
+            'num_days': scenario['num_days'],
+            'seed': scenario.get('seed'),
+        }
+    else:
+        csv_path, config_overrides, num_days, seed = scenario
+        normalized = {
+            'name': None,
+            'csv_path': csv_path,
+            'config_overrides': config_overrides,
+            'num_days': num_days,
+            'seed': seed,
+        }
+    normalized['csv_path'] = os.path.abspath(normalized['csv_path'])
+    return normalized
+
+
+def _run_batch_scenario(index: int, scenario: Dict[str, Any], quiet: bool) -> Dict[str, Any]:
+    """工作进程：运行单个场景并返回结果表中的一行"""
+    row = {
+        'scenario': index,
+        'name': scenario['name'],
+        'csv_path': scenario['csv_path'],
+        'num_days': scenario['num_days'],
+        'seed': scenario['seed'],
+        'overrides': json.dumps(
+            _normalize_overrides(scenario['config_overrides']),
+            sort_keys=True, ensure_ascii=False, default=repr
+        ),
+        'worker_pid': os.getpid(),
+        'load_seconds': 0.0,
+        'run_seconds': 0.0,
+        'error': None,
+    }
+    try:
+        # 串行回退时场景在调用方进程内运行：通过日志级别静默，不替换进程的 sys.stdout
+        with logging_scope(quiet=True) if quiet else contextlib.nullcontext():
+            start = time.perf_counter()
+            order_manager = _worker_order_managers.get(scenario['csv_path'])
+            if order_manager is None:
+                order_manager = load_orders(scenario['csv_path'])
+                _worker_order_managers[scenario['csv_path']] = order_manager
+            row['load_seconds'] = time.perf_counter() - start
+            
+            config = load_default_config()
+            for k, v in (scenario['config_overrides'] or {}).items():
+                if hasattr(config, k):
+                    setattr(config, k, v)
+            if scenario['seed'] is not None:
+                random.seed(scenario['seed'])
+            
+            start = time.perf_counter()
+            scheduler, _ = run_schedule(config, order_manager, scenario['num_days'])
+            row['run_seconds'] = time.perf_counter() - start
+        
+        # 只保留标量统计，逐日明细等嵌套数据不进入结果表
+        for k, v in scheduler.get_cumulative_statistics().items():
+            if isinstance(v, (int, float, str, bool)) or v is None:
+                row[k] = v
+    except Exception as e:
+        row['error'] = f"{type(e).__name__}: {e}"
+    return row
+
+
+def run_batch(
+    scenarios,
+    max_workers: int | None = None,
+    quiet: bool = True,
+    executor: ProcessPoolExecutor | None = None
+) -> list:
+    """
+    批量运行多个场景（对比实验、参数扫描等），场景之间互不影响
+    
+    每个场景可以是元组 (csv_path, config_overrides, num_days, seed)，
+    或包含这些键（及可选的 name）的字典。场景被分发到进程池中并行运行，
+    每个工作进程对同一 CSV 只解析一次；设置 seed 的场景结果与单独运行一致。
+    
+    Args:
+        scenarios: 场景列表
+        max_workers: 工作进程数，默认为 CPU 核数；=1 时在当前进程内顺序运行
+        quiet: 是否屏蔽场景运行过程中的控制台输出
+        executor: 复用已有的进程池（见 create_batch_pool），此时忽略 max_workers
+        
+    Returns:
+        list: 结果表，每个场景一行（字典，顺序与 scenarios 一致），可直接转为 pandas.DataFrame。
+              包含场景参数（scenario、name、csv_path、num_days、seed、overrides）、
+              累计统计（total_profit、on_time_rate 等）、耗时（load_seconds、run_seconds、
+              wall_seconds）、worker_pid 以及 error（场景失败时的异常信息，其余统计缺省）
+    """
+    normalized = [_normalize_scenario(scenario) for scenario in scenarios]
+    if max_workers is None:
+        max_workers = min(len(normalized), os.cpu_count() or 1)
+    
+    start = time.perf_counter()
+    if executor is not None:
+        futures = [
+            executor.submit(_run_batch_scenario, i, scenario, quiet)
+            for i, scenario in enumerate(normalized)
+        ]
+        rows = [future.result() for future in futures]
+    elif max_workers <= 1:
+        rows = [_run_batch_scenario(i, scenario, quiet) for i, scenario in enumerate(normalized)]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futures = [
+                pool.submit(_run_batch_scenario, i, scenario, quiet)
+                for i, scenario in enumerate(normalized)
+            ]
+            rows = [future.result() for future in futures]
+    wall_seconds = time.perf_counter() - start
+    for row in rows:
+        row['wall_seconds'] = wall_seconds
+    return rows
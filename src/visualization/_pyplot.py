@@ -0,0 +1,26 @@
+"""
+matplotlib 延迟导入
+
+matplotlib 的导入与字体配置耗时较长，且优化核心与无界面运行并不需要，
+因此推迟到第一次绘图时才导入。
+"""
+
+_pyplot = None
+
+
+def get_pyplot():
+    """
+    获取已配置中文字体的 matplotlib.pyplot（首次调用时导入）
+
+    Returns:
+        module: matplotlib.pyplot
+    """
+    global _pyplot
+    if _pyplot is None:
+        import matplotlib.pyplot as plt
+
+        # 配置中文字体，避免乱码
+        plt.rcParams['font.sans-serif'] = ['SimHei']  # 设置中文字体为黑体
+        plt.rcParams['axes.unicode_minus'] = False  # 正常显示负号
+        _pyplot = plt
+    return _pyplot
@@ -3,16 +3,12 @@
 
 生成生产调度的甘特图。
 """
-import matplotlib.pyplot as plt
-import matplotlib.patches as mpatches
 import numpy as np
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-# 配置中文字体，避免乱码
-plt.rcParams['font.sans-serif'] = ['SimHei']  # 设置中文字体为黑体
-plt.rcParams['axes.unicode_minus'] = False  # 正常显示负号
+from ._pyplot import get_pyplot
 
 
 class GanttChart:
@@ -58,11 +54,8 @@ class GanttChart:
         # 创建订单字典
         order_dict = {order.order_id: order for order in orders}
         
-        # 获取所有slot
-        all_slots = set()
-        for (order_id, line, slot), qty in schedule.allocation.items():
-            if qty > 0:
-                all_slots.add(slot)
+        # 获取所有slot（基于调度方案的时间段索引）
+        all_slots = schedule.get_scheduled_slots()
         
         if not all_slots:
             print("没有分配可绘制")
@@ -73,6 +66,8 @@ class GanttChart:
         slots_to_plot = range(min_slot, max_slot + 1)
         
         # 创建图形
+        plt = get_pyplot()
+        import matplotlib.patches as mpatches
         fig, ax = plt.subplots(figsize=(16, 6))
         
         # 为每条产线绘制甘特图
@@ -156,6 +151,8 @@ class GanttChart:
             return
         
         # 创建图形
+        plt = get_pyplot()
+        import matplotlib.patches as mpatches
         fig, ax = plt.subplots(figsize=(14, 4))
         
         # 绘制每个slot
@@ -3,15 +3,12 @@
 
 展示调度方案的关键性能指标。
 """
-import matplotlib.pyplot as plt
 import numpy as np
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-# 配置中文字体，避免乱码
-plt.rcParams['font.sans-serif'] = ['SimHei']  # 设置中文字体为黑体
-plt.rcParams['axes.unicode_minus'] = False  # 正常显示负号
+from ._pyplot import get_pyplot
 
 
 class MetricsVisualizer:
@@ -64,6 +61,7 @@ class MetricsVisualizer:
                  self.colors['penalty'], self.colors['profit']]
         
         # 创建图形
+        plt = get_pyplot()
         fig, ax = plt.subplots(figsize=(10, 6))
         bars = ax.bar(categories, values, color=colors, alpha=0.8, edgecolor='black')
         
@@ -115,6 +113,7 @@ class MetricsVisualizer:
                 not_started_count += 1
         
         # 创建饼图
+        plt = get_pyplot()
         fig, ax = plt.subplots(figsize=(8, 8))
         
         sizes = [completed_count, partial_count, not_started_count]
@@ -151,13 +150,11 @@ class MetricsVisualizer:
             return
         
         # 统计每条产线的工作slot数
-        line_working_slots = {line: set() for line in range(1, num_lines + 1)}
-        total_slots = 0
-        
-        for (order_id, line, slot), qty in schedule.allocation.items():
-            if qty > 0:
-                line_working_slots[line].add(slot)
-                total_slots = max(total_slots, slot)
+        line_working_slots = {
+            line: set(schedule.get_line_schedule(line)) for line in range(1, num_lines + 1)
+        }
+        scheduled_slots = schedule.get_scheduled_slots()
+        total_slots = scheduled_slots[-1] if scheduled_slots else 0
         
         # 计算利用率
         utilization = []
@@ -169,6 +166,7 @@ class MetricsVisualizer:
             utilization.append(util)
         
         # 创建柱状图
+        plt = get_pyplot()
         fig, ax = plt.subplots(figsize=(10, 6))
         
         lines = [f'产线{i}' for i in range(1, num_lines + 1)]